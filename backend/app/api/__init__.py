@@ -1,10 +1,14 @@
 # backend/app/api/__init__.py
 from fastapi import APIRouter
+from .audit import router as audit_router
 from .auth import router as auth_router
 from .contacts import router as contacts_router
+from .tags import router as tags_router
 
 router = APIRouter()
 router.include_router(auth_router, prefix="/auth", tags=["auth"])
 router.include_router(contacts_router, prefix="/contacts", tags=["contacts"])
+router.include_router(tags_router, prefix="/tags", tags=["tags"])
+router.include_router(audit_router, prefix="/audit", tags=["audit"])
 
 __all__ = ["router"]
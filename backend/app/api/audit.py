@@ -0,0 +1,67 @@
+# backend/app/api/audit.py
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+
+from ..core.dependencies import get_current_admin_principal
+from ..core.pagination import decode_cursor, encode_cursor
+from ..core.principal_cache import Principal
+from ..schemas.audit import AuditLogPage
+from ..services.audit import audit_writer
+
+router = APIRouter()
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Audit timestamps are stored as naive UTC
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+@router.get("/logs", response_model=AuditLogPage)
+async def list_audit_logs(
+    user_id: Optional[int] = None,
+    action: Optional[str] = None,
+    ip_address: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    current_user: Principal = Depends(get_current_admin_principal)
+):
+    """
+    List audit log entries, newest first.
+
+    Pages are keyed on (timestamp, id): pass the returned `next_cursor` to
+    get the following page, so deep pages cost the same as the first one.
+    """
+    after = None
+    if cursor is not None:
+        timestamp, entry_id = decode_cursor(cursor, 2, (str, int))
+        try:
+            after = (datetime.fromisoformat(timestamp), int(entry_id))
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+
+    entries = await run_in_threadpool(
+        audit_writer.storage.query,
+        user_id=user_id,
+        action=action,
+        ip_address=ip_address,
+        start=_naive_utc(start),
+        end=_naive_utc(end),
+        after=after,
+        descending=True,
+        limit=limit + 1
+    )
+
+    next_cursor = None
+    if len(entries) > limit:
+        entries = entries[:limit]
+        last = entries[-1]
+        next_cursor = encode_cursor([last["timestamp"].isoformat(), last["id"]])
+
+    return {"items": entries, "next_cursor": next_cursor}
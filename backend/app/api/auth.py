@@ -3,34 +3,39 @@ from datetime import timedelta
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.security import (
-    verify_password,
     create_access_token,
-    get_password_hash,
     validate_password,
     create_token_response
 )
 from ..core.config import settings
+from ..core.password_hasher import password_hasher
 from ..core.dependencies import get_current_user, get_current_active_user
-from ..db.session import get_db
-from ..models.user import User
+from ..db.session import get_async_db
+from ..models.models import User
 from ..schemas.token import Token
 from ..schemas.user import UserCreate, User as UserSchema
 
 router = APIRouter()
 
 @router.post("/login", response_model=Token)
-def login(
-    db: Session = Depends(get_db),
+async def login(
+    db: AsyncSession = Depends(get_async_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
     OAuth2 compatible token login.
     """
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = (
+        await db.execute(select(User).where(User.email == form_data.username))
+    ).scalars().first()
+    # Return the connection to the pool while the password is verified;
+    # the session does not expire the user on commit
+    await db.commit()
+    if not user or not await password_hasher.verify(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -41,6 +46,7 @@ def login(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Inactive user"
         )
+    password_hasher.rehash_in_background(user.id, form_data.password, user.hashed_password)
 
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -50,9 +56,9 @@ def login(
     return create_token_response(access_token)
 
 @router.post("/register", response_model=Token)
-def register(
+async def register(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_in: UserCreate,
 ) -> Any:
     """
@@ -66,23 +72,27 @@ def register(
         )
 
     # Check if user exists
-    user = db.query(User).filter(User.email == user_in.email).first()
+    user = (
+        await db.execute(select(User).where(User.email == user_in.email))
+    ).scalars().first()
     if user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
+    # Do not hold a connection while the password is hashed
+    await db.commit()
     
     # Create new user
     user = User(
         email=user_in.email,
         username=user_in.username,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await password_hasher.hash(user_in.password),
         is_active=True,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
 
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
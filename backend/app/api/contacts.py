@@ -1,62 +1,307 @@
 # backend/app/api/contacts.py
+from datetime import timezone
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from ..core.dependencies import get_current_active_user
-from ..db.session import get_db
-from ..models.models import Contact, User, AuditLogEntry, Tag
-from ..schemas.contact import ContactCreate, ContactUpdate, ContactResponse
+from ..core.dependencies import get_current_active_principal, get_read_db
+from ..core.http_cache import if_none_match, not_modified, set_etag, weak_etag
+from ..core.principal_cache import Principal
+from ..core.pagination import decode_cursor, encode_cursor
+from ..db.replicas import set_last_write_cookie
+from ..db.session import SessionLocal, get_async_db
+from ..models.models import Contact, Tag
+from ..schemas.contact import (
+    ContactCreate,
+    ContactUpdate,
+    ContactResponse,
+    ContactSuggestion,
+    ImportJobResponse
+)
+from ..services.audit import audit_writer, client_host
+from ..services.contact_search import search_contact_ids
+from ..services.contact_versions import get_contact_version
+from ..services.import_jobs import import_jobs
+from ..services.typeahead import typeahead_index
+from ..services.vcard_handler import VCardHandler
 
 router = APIRouter()
 
+async def _load_contacts(db: AsyncSession, *criteria) -> List[Contact]:
+    # Tags and server defaults cannot be lazy loaded once serialization
+    # starts, so load them up front, also for contacts the session holds
+    result = await db.execute(
+        select(Contact)
+        .options(selectinload(Contact.tags))
+        .where(*criteria)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().all()
+
 @router.get("/", response_model=List[ContactResponse])
 async def list_contacts(
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_active_principal),
     skip: int = 0,
     limit: int = 100,
-    tag: Optional[str] = None
+    tag: Optional[str] = None,
+    cursor: Optional[str] = None
 ):
-    query = db.query(Contact).filter(Contact.owner_id == current_user.id)
+    """
+    List the current user's contacts ordered by last name, first name and id.
+
+    When a page is full, the X-Next-Cursor header holds a cursor for the
+    next one. Passing it back as `cursor` continues after the last contact
+    returned instead of skipping rows, so deep pages are as cheap as the
+    first; `skip` is ignored in that case.
+
+    The weak ETag changes with any change to the user's contacts or their
+    tags; a matching If-None-Match gets 304 Not Modified before the list
+    is queried.
+    """
+    version = await db.run_sync(get_contact_version, current_user.id)
+    etag = weak_etag(current_user.id, version, request.url.query)
+    if if_none_match(request, etag):
+        return not_modified(etag)
+    
+    # Load the tags of the whole page in one extra query instead of one per contact
+    query = (
+        select(Contact)
+        .options(selectinload(Contact.tags))
+        .where(Contact.owner_id == current_user.id)
+    )
     
     if tag:
-        query = query.join(Contact.tags).filter(Tag.name == tag)
+        query = query.join(Contact.tags).where(Tag.name == tag)
+    
+    sort_key = (Contact.last_name, Contact.first_name, Contact.id)
+    query = query.order_by(*sort_key)
     
-    contacts = query.offset(skip).limit(limit).all()
+    if cursor is not None:
+        last_name, first_name, contact_id = decode_cursor(cursor, 3, (str, str, int))
+        query = query.where(tuple_(*sort_key) > (last_name, first_name, contact_id))
+    else:
+        query = query.offset(skip)
+    
+    contacts = (await db.execute(query.limit(limit))).scalars().all()
+    
+    if contacts and len(contacts) == limit:
+        last = contacts[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(
+            [last.last_name, last.first_name, last.id]
+        )
     
     # Log action
-    audit_log = AuditLogEntry(
+    await audit_writer.record_async(
+        db,
         user_id=current_user.id,
         action="list_contacts",
         details=f"Listed contacts with filters: skip={skip}, limit={limit}, tag={tag}",
-        ip_address=request.client.host
+        ip_address=client_host(request)
     )
-    db.add(audit_log)
-    db.commit()
     
+    set_etag(response, etag)
     return contacts
 
 @router.post("/", response_model=ContactResponse)
 async def create_contact(
     request: Request,
     contact_in: ContactCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_principal)
 ):
     contact = Contact(**contact_in.dict(), owner_id=current_user.id)
     db.add(contact)
+    await db.commit()
+    contact, = await _load_contacts(db, Contact.id == contact.id)
     
     # Log action
-    audit_log = AuditLogEntry(
+    await audit_writer.record_async(
+        db,
         user_id=current_user.id,
         action="create_contact",
         details=f"Created contact: {contact_in.first_name} {contact_in.last_name}",
-        ip_address=request.client.host
+        ip_address=client_host(request)
     )
-    db.add(audit_log)
     
-    db.commit()
-    db.refresh(contact)
     return contact
+
+@router.post(
+    "/import/jobs",
+    response_model=ImportJobResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def create_import_job(
+    request: Request,
+    file: UploadFile = File(...),
+    bulk: bool = True,
+    parallel: bool = False,
+    tolerant: bool = True,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_principal)
+):
+    """
+    Queue a vCard file for import in the background.
+
+    Jobs are tolerant by default: invalid cards are reported in the job's
+    errors with their line numbers while the rest of the file is imported.
+    """
+    job = await import_jobs.submit(
+        file,
+        current_user.id,
+        bulk=bulk,
+        parallel=parallel,
+        tolerant=tolerant
+    )
+    
+    # Log action
+    await audit_writer.record_async(
+        db,
+        user_id=current_user.id,
+        action="import_contacts",
+        details=f"Queued import job {job.id} for file: {file.filename}",
+        ip_address=client_host(request)
+    )
+    
+    return job
+
+@router.get("/import/jobs/{job_id}", response_model=ImportJobResponse)
+async def get_import_job(
+    job_id: str,
+    response: Response,
+    current_user: Principal = Depends(get_current_active_principal)
+):
+    """Get progress and the final summary of a background import."""
+    job = await run_in_threadpool(import_jobs.get, job_id)
+    if job is None or job.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found"
+        )
+    if job.status == "completed":
+        # Read the imported contacts from the primary until replicas have them
+        finished_at = job.finished_at.replace(tzinfo=timezone.utc).timestamp()
+        set_last_write_cookie(response, finished_at)
+    return job
+
+@router.get("/export")
+async def export_contacts(
+    request: Request,
+    tag: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_principal)
+):
+    """Stream the current user's contacts as a vCard file."""
+    # Log action
+    await audit_writer.record_async(
+        db,
+        user_id=current_user.id,
+        action="export_contacts",
+        details=f"Exported contacts with filters: tag={tag}",
+        ip_address=client_host(request)
+    )
+    
+    owner_id = current_user.id
+    
+    def stream():
+        # The request session is closed before the body is sent, so the
+        # export reads through a session of its own.
+        export_db = SessionLocal()
+        try:
+            yield from VCardHandler.iter_export(export_db, owner_id, tag=tag)
+        finally:
+            export_db.close()
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/vcard",
+        headers={"Content-Disposition": 'attachment; filename="contacts.vcf"'}
+    )
+
+@router.get("/search", response_model=List[ContactResponse])
+async def search_contacts(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_active_principal)
+):
+    """
+    Search the current user's contacts by name, email, phone, address and
+    notes. Every word must match the start of a word in one of those
+    fields; results are ranked best match first.
+    """
+    contact_ids = await db.run_sync(search_contact_ids, current_user.id, q, limit=limit)
+    contacts = await _load_contacts(db, Contact.id.in_(contact_ids)) if contact_ids else []
+    
+    # Log action
+    await audit_writer.record_async(
+        db,
+        user_id=current_user.id,
+        action="search_contacts",
+        details=f"Searched contacts: {q}",
+        ip_address=client_host(request)
+    )
+    
+    rank = {contact_id: n for n, contact_id in enumerate(contact_ids)}
+    return sorted(contacts, key=lambda contact: rank[contact.id])
+
+@router.get("/autocomplete", response_model=List[ContactSuggestion])
+async def autocomplete_contacts(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_principal)
+):
+    """
+    Suggest contacts whose name words or email start with every word of `q`.
+
+    Served from an in-memory prefix index for search-as-you-type; it is
+    called on every keystroke, so it is not written to the audit log.
+    """
+    matches = await db.run_sync(typeahead_index.lookup, current_user.id, q, limit=limit)
+    return [
+        {"id": contact_id, "display_name": name}
+        for contact_id, name in matches
+    ]
+
+@router.get("/{contact_id}", response_model=ContactResponse)
+async def get_contact(
+    request: Request,
+    response: Response,
+    contact_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_active_principal)
+):
+    """Get one of the current user's contacts; supports If-None-Match like the list."""
+    version = await db.run_sync(get_contact_version, current_user.id)
+    etag = weak_etag(current_user.id, version, contact_id)
+    if if_none_match(request, etag):
+        return not_modified(etag)
+    
+    contacts = await _load_contacts(
+        db, Contact.id == contact_id, Contact.owner_id == current_user.id
+    )
+    if not contacts:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Contact not found"
+        )
+    
+    # Log action
+    await audit_writer.record_async(
+        db,
+        user_id=current_user.id,
+        action="view_contact",
+        details=f"Viewed contact {contact_id}",
+        ip_address=client_host(request)
+    )
+    
+    set_etag(response, etag)
+    return contacts[0]
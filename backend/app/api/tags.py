@@ -1,66 +1,86 @@
 # backend/app/api/tags.py
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import exists, select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..core.dependencies import get_current_user, get_current_admin_user
-from ..db.session import get_db
-from ..models.models import Tag, User, AuditLogEntry
+from ..core.dependencies import get_current_principal, get_current_admin_principal, get_read_db
+from ..core.http_cache import if_none_match, not_modified, set_etag
+from ..core.principal_cache import Principal
+from ..db.session import get_async_db
+from ..models.models import Tag, contact_tags
 from ..schemas.contact import TagCreate, Tag as TagSchema
+from ..services.audit import audit_writer, client_host
+from ..services.tag_cache import tag_cache
 
 router = APIRouter()
 
 @router.get("/", response_model=List[TagSchema])
 async def list_tags(
     request: Request,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    response: Response,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """List all available tags."""
-    tags = db.query(Tag).all()
+    """
+    List all available tags.
+
+    Served from the tag cache. Send the returned ETag back in If-None-Match
+    to get 304 Not Modified while the tags are unchanged.
+    """
+    # Loaded from the primary: a lagging replica could leave stale tags
+    # cached until the next write
+    async def load():
+        tags = (await db.execute(select(Tag).order_by(Tag.id))).scalars().all()
+        return [TagSchema.model_validate(tag).model_dump(mode="json") for tag in tags]
+
+    etag, tags = await tag_cache.get(load)
     
     # Log action
-    audit_log = AuditLogEntry(
+    await audit_writer.record_async(
+        db,
         user_id=current_user.id,
         action="list_tags",
         details="Listed all tags",
-        ip_address=request.client.host,
+        ip_address=client_host(request),
         user_agent=request.headers.get("user-agent")
     )
-    db.add(audit_log)
-    db.commit()
     
+    if if_none_match(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return tags
 
 @router.post("/", response_model=TagSchema)
 async def create_tag(
     request: Request,
     tag: TagCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new tag."""
     try:
         db_tag = Tag(name=tag.name)
         db.add(db_tag)
+        await db.commit()
+        await tag_cache.invalidate()
+        await db.refresh(db_tag)
         
         # Log action
-        audit_log = AuditLogEntry(
+        await audit_writer.record_async(
+            db,
             user_id=current_user.id,
             action="create_tag",
             details=f"Created tag: {tag.name}",
-            ip_address=request.client.host,
+            ip_address=client_host(request),
             user_agent=request.headers.get("user-agent")
         )
-        db.add(audit_log)
         
-        db.commit()
-        db.refresh(db_tag)
         return db_tag
         
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Tag already exists"
@@ -70,11 +90,11 @@ async def create_tag(
 async def get_tag(
     request: Request,
     tag_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a specific tag by ID."""
-    tag = db.query(Tag).filter(Tag.id == tag_id).first()
+    tag = await db.get(Tag, tag_id)
     if not tag:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -82,15 +102,14 @@ async def get_tag(
         )
     
     # Log action
-    audit_log = AuditLogEntry(
+    await audit_writer.record_async(
+        db,
         user_id=current_user.id,
         action="view_tag",
         details=f"Viewed tag: {tag.name}",
-        ip_address=request.client.host,
+        ip_address=client_host(request),
         user_agent=request.headers.get("user-agent")
     )
-    db.add(audit_log)
-    db.commit()
     
     return tag
 
@@ -99,11 +118,11 @@ async def update_tag(
     request: Request,
     tag_id: int,
     tag_update: TagCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a tag."""
-    db_tag = db.query(Tag).filter(Tag.id == tag_id).first()
+    db_tag = await db.get(Tag, tag_id)
     if not db_tag:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -112,23 +131,24 @@ async def update_tag(
     
     try:
         db_tag.name = tag_update.name
+        await db.commit()
+        await tag_cache.invalidate()
+        await db.refresh(db_tag)
         
         # Log action
-        audit_log = AuditLogEntry(
+        await audit_writer.record_async(
+            db,
             user_id=current_user.id,
             action="update_tag",
             details=f"Updated tag {tag_id}: {tag_update.name}",
-            ip_address=request.client.host,
+            ip_address=client_host(request),
             user_agent=request.headers.get("user-agent")
         )
-        db.add(audit_log)
         
-        db.commit()
-        db.refresh(db_tag)
         return db_tag
         
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Tag name already exists"
@@ -138,11 +158,11 @@ async def update_tag(
 async def delete_tag(
     request: Request,
     tag_id: int,
-    current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_admin_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a tag. Only accessible by admin users."""
-    tag = db.query(Tag).filter(Tag.id == tag_id).first()
+    tag = await db.get(Tag, tag_id)
     if not tag:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -150,23 +170,28 @@ async def delete_tag(
         )
     
     # Check if tag is in use
-    if len(tag.contacts) > 0:
+    in_use = await db.scalar(
+        select(exists().where(contact_tags.c.tag_id == tag_id))
+    )
+    if in_use:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot delete tag while it is in use"
         )
     
+    tag_name = tag.name
+    await db.delete(tag)
+    await db.commit()
+    await tag_cache.invalidate()
+    
     # Log action
-    audit_log = AuditLogEntry(
+    await audit_writer.record_async(
+        db,
         user_id=current_user.id,
         action="delete_tag",
-        details=f"Deleted tag: {tag.name}",
-        ip_address=request.client.host,
+        details=f"Deleted tag: {tag_name}",
+        ip_address=client_host(request),
         user_agent=request.headers.get("user-agent")
     )
-    db.add(audit_log)
-    
-    db.delete(tag)
-    db.commit()
     
     return {"message": "Tag deleted successfully"}
@@ -1,11 +1,12 @@
 # backend/app/api/users.py
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..core.security import SecurityUtils
-from ..core.dependencies import get_current_user, get_current_admin_user
-from ..db.session import get_db
+from ..core.password_hasher import password_hasher
+from ..core.dependencies import get_current_user, get_current_admin_user, get_read_db
+from ..db.session import get_async_db
 from ..models.models import User, AuditLogEntry
 from ..schemas.auth import (
     UserCreate, 
@@ -21,10 +22,10 @@ async def list_users(
     skip: int = 0,
     limit: int = 100,
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List all users. Only accessible by admin users."""
-    users = db.query(User).offset(skip).limit(limit).all()
+    users = (await db.execute(select(User).offset(skip).limit(limit))).scalars().all()
     return users
 
 @router.get("/me", response_model=UserResponse)
@@ -38,30 +39,31 @@ async def get_current_user_info(
 async def update_current_user(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update current user information."""
     for field, value in user_update.dict(exclude_unset=True).items():
         setattr(current_user, field, value)
     
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(current_user)
     return current_user
 
 @router.post("/", response_model=UserResponse)
 async def create_user(
     user_data: UserCreate,
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create new user. Only accessible by admin users."""
-    if db.query(User).filter(User.email == user_data.email).first():
+    existing = await db.execute(select(User.id).where(User.email == user_data.email))
+    if existing.first():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    hashed_password = SecurityUtils.get_password_hash(user_data.password)
+    hashed_password = await password_hasher.hash(user_data.password)
     db_user = User(
         email=user_data.email,
         username=user_data.username,
@@ -70,8 +72,8 @@ async def create_user(
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
 
@@ -79,10 +81,10 @@ async def create_user(
 async def get_user(
     user_id: int,
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get user by ID. Only accessible by admin users."""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -92,43 +94,43 @@ async def update_user(
     user_id: int,
     user_update: UserUpdate,
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update user information. Only accessible by admin users."""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
     for field, value in user_update.dict(exclude_unset=True).items():
         setattr(user, field, value)
 
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 @router.delete("/{user_id}")
 async def delete_user(
     user_id: int,
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete user. Only accessible by admin users."""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    db.delete(user)
-    db.commit()
+    await db.delete(user)
+    await db.commit()
     return {"message": "User deleted"}
 
 @router.post("/change-password")
 async def change_password(
     password_data: PasswordChange,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Change user password."""
-    if not SecurityUtils.verify_password(
+    if not await password_hasher.verify(
         password_data.current_password, 
         current_user.hashed_password
     ):
@@ -137,9 +139,9 @@ async def change_password(
             detail="Incorrect password"
         )
 
-    current_user.hashed_password = SecurityUtils.get_password_hash(
+    current_user.hashed_password = await password_hasher.hash(
         password_data.new_password
     )
-    db.commit()
+    await db.commit()
 
     return {"message": "Password updated successfully"}
@@ -7,9 +7,15 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     SECRET_KEY: str = "your-secret-key-here"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    AUTH_CACHE_TTL: int = 60  # Seconds a verified token is trusted without a user lookup, 0 = off
+    AUTH_CACHE_SIZE: int = 10000  # Verified tokens kept in memory
     
     # Database
     DATABASE_URL: str = "sqlite:///./data/secure_cms.db"
+    DATABASE_REPLICA_URLS: List[str] = []  # Read replicas for read-only endpoints
+    REPLICA_MAX_LAG: float = 5.0  # Seconds behind the primary before a replica is skipped
+    REPLICA_HEALTH_INTERVAL: float = 5.0  # Seconds between replica lag checks
+    REPLICA_STICKY_SECONDS: float = 10.0  # Reads stay on the primary after a user's write
     
     # CORS - Simplified to avoid parsing issues
     BACKEND_CORS_ORIGINS: List[str] = [
@@ -18,7 +24,16 @@ class Settings(BaseSettings):
     ]
     
     # Security
-    PASSWORD_HASH_ALGORITHM: str = "bcrypt"
+    PASSWORD_HASH_ALGORITHM: str = "argon2"  # "argon2" or "bcrypt" for new hashes
+    PASSWORD_HASH_CALIBRATE: bool = True  # Tune hash cost to the host at startup
+    PASSWORD_HASH_TARGET_MS: int = 250  # Target hash/verify time for calibration
+    PASSWORD_HASH_CALIBRATION_FILE: str = "./data/password_hash_calibration.json"  # Shared by worker processes
+    # Per argon2 hash; peak use is this x PASSWORD_HASH_WORKERS x worker
+    # processes, e.g. 19 MiB x 4 x 4 = 304 MiB
+    PASSWORD_HASH_ARGON2_MEMORY_KIB: int = 19 * 1024
+    PASSWORD_HASH_ARGON2_PARALLELISM: int = 2
+    PASSWORD_HASH_WORKERS: int = 4  # Threads hashing and verifying passwords
+    PASSWORD_HASH_MAX_PENDING: int = 64  # Running plus queued hash calls before 503
     MINIMUM_PASSWORD_LENGTH: int = 12
     
     # Email
@@ -33,6 +48,36 @@ class Settings(BaseSettings):
     # File Upload
     MAX_UPLOAD_SIZE: int = 5 * 1024 * 1024  # 5MB
     UPLOAD_DIR: str = "./uploads"
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024  # 64KB read size for streamed uploads
+    IMPORT_BATCH_SIZE: int = 1000  # Contacts per INSERT/commit in bulk imports
+    IMPORT_MAX_UPLOAD_SIZE: int = 512 * 1024 * 1024  # 512MB for background imports
+    IMPORT_WORKERS: int = 2  # Threads processing background import jobs
+    IMPORT_JOB_HISTORY: int = 100  # Finished jobs kept for progress polling
+    IMPORT_JOB_MAX_ERRORS: int = 100  # Card errors stored per import job, the rest are only counted
+    IMPORT_PARSE_WORKERS: int = 0  # Process pool size for parallel parsing, 0 = all cores
+    IMPORT_PARSE_BATCH_SIZE: int = 200  # Cards sent to a parser process at a time
+    EXPORT_BATCH_SIZE: int = 500  # Rows fetched per round trip in streaming exports
+
+    # Duplicate detection
+    DEDUPE_WORKERS: int = 0  # Process pool size for parallel scoring, 0 = all cores
+
+    # Autocomplete
+    TYPEAHEAD_MAX_OWNERS: int = 1000  # Owners whose prefix index is kept in memory
+    TYPEAHEAD_TTL: int = 300  # Seconds before an owner's index is reloaded
+
+    # Tag listing cache
+    TAG_CACHE_REDIS_URL: str = ""  # Share invalidations across workers, e.g. redis://localhost:6379/0
+    TAG_CACHE_TTL: float = 30.0  # Seconds a cached tag list is served without TAG_CACHE_REDIS_URL
+
+    # Audit log
+    AUDIT_SYNC: bool = False  # Write entries in the request instead of in the background
+    AUDIT_QUEUE_SIZE: int = 10000  # Pending entries kept in memory before callers write them
+    AUDIT_BATCH_SIZE: int = 500  # Entries per INSERT/commit
+    AUDIT_FLUSH_INTERVAL: float = 1.0  # Seconds before a partial batch is written
+    AUDIT_WRITE_RETRIES: int = 3  # Retries of a failed batch before it is discarded
+    AUDIT_RETRY_DELAY: float = 0.5  # Seconds before the first retry, doubled for each one after
+    AUDIT_STORAGE: str = "database"  # "database" (audit_logs table) or "segments"
+    AUDIT_SEGMENT_DIR: str = "./data/audit"  # Day-rotated segment files for "segments"
 
     model_config = SettingsConfigDict(
         env_file='.env',
@@ -1,21 +1,33 @@
 # backend/app/core/dependencies.py
-from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+from typing import AsyncGenerator, Generator, Optional
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from .config import settings
+from .principal_cache import Principal, principal_cache
 from .security import ALGORITHM
-from ..db.session import get_db
+from ..db.replicas import SESSION_USER_KEY, last_write_from, replica_router
+from ..db.session import get_async_db
 from ..models.models import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
-def get_current_user(
-    db: Session = Depends(get_db),
+async def get_current_principal(
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(oauth2_scheme)
-) -> User:
+) -> Principal:
+    """
+    Resolve the bearer token to a Principal, from the principal cache when
+    the token was verified recently, so most requests skip the user query.
+    """
+    principal = principal_cache.get(token)
+    if principal is not None:
+        db.info[SESSION_USER_KEY] = principal.id
+        return principal
+    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -29,9 +41,55 @@ def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.email == email).first()
+    user = (await db.execute(select(User).where(User.email == email))).scalars().first()
     if user is None:
         raise credentials_exception
+    
+    principal = Principal.from_user(user)
+    principal_cache.put(token, principal, token_expires_at=payload.get("exp"))
+    db.info[SESSION_USER_KEY] = principal.id
+    return principal
+
+async def get_read_db(
+    request: Request,
+    principal: Principal = Depends(get_current_principal)
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for read-only handlers: reads go to a healthy replica unless the
+    client changed something recently. Writes still go to the primary.
+    """
+    async with replica_router.read_session(principal.id, last_write_from(request)) as db:
+        yield db
+
+def get_current_active_principal(
+    principal: Principal = Depends(get_current_principal),
+) -> Principal:
+    if not principal.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return principal
+
+def get_current_admin_principal(
+    principal: Principal = Depends(get_current_active_principal),
+) -> Principal:
+    if not principal.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    return principal
+
+async def get_current_user(
+    db: AsyncSession = Depends(get_async_db),
+    principal: Principal = Depends(get_current_principal)
+) -> User:
+    """The full User row, for endpoints that read or change the user itself."""
+    user = await db.get(User, principal.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 def get_current_active_user(
@@ -40,3 +98,13 @@ def get_current_active_user(
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
+
+def get_current_admin_user(
+    current_user: User = Depends(get_current_active_user),
+) -> User:
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    return current_user
@@ -0,0 +1,40 @@
+# backend/app/core/http_cache.py
+"""Conditional GET support: ETags and If-None-Match."""
+import hashlib
+import json
+from typing import Any
+
+from fastapi import Request, Response, status
+
+# Clients may cache but must revalidate, which is what makes 304s useful
+CACHE_CONTROL = "private, no-cache"
+
+def content_etag(content: Any) -> str:
+    """Strong ETag for a JSON-serializable value."""
+    encoded = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+    return '"' + hashlib.sha256(encoded.encode()).hexdigest()[:32] + '"'
+
+def weak_etag(*parts: Any) -> str:
+    """Weak ETag identifying a representation by version and request parts."""
+    key = ":".join(str(part) for part in parts)
+    return 'W/"' + hashlib.sha256(key.encode()).hexdigest()[:32] + '"'
+
+def if_none_match(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header matches `etag`."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_etag(response, etag)
+    return response
@@ -0,0 +1,42 @@
+# backend/app/core/pagination.py
+import base64
+import json
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor."""
+    raw = json.dumps(values, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def _has_type(value: Any, expected: type) -> bool:
+    # JSON true/false decode to bool, which isinstance() also counts as int
+    if isinstance(value, bool) and expected is not bool:
+        return False
+    return isinstance(value, expected)
+
+def decode_cursor(
+    cursor: str,
+    length: int,
+    types: Optional[Sequence[type]] = None
+) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor, expecting `length` values,
+    of the given `types` when those are passed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except ValueError:
+        values = None
+    if (
+        not isinstance(values, list)
+        or len(values) != length
+        or (types is not None and not all(map(_has_type, values, types)))
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return values
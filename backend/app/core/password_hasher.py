@@ -0,0 +1,155 @@
+# backend/app/core/password_hasher.py
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, TypeVar
+import asyncio
+import logging
+import threading
+
+from fastapi import HTTPException, status
+from sqlalchemy import update
+
+from .config import settings
+from .security import get_password_hash, needs_rehash, verify_password
+from ..db.session import SessionLocal
+from ..models.models import User
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class PasswordHasher:
+    """
+    Runs password hashing and verification off the event loop.
+
+    Calls go to a dedicated pool of settings.PASSWORD_HASH_WORKERS threads,
+    so a burst of logins cannot take over the shared threadpool or block
+    other requests. At most settings.PASSWORD_HASH_MAX_PENDING calls may be
+    running or queued; beyond that requests fail fast with 503 and a
+    Retry-After header rather than waiting behind an ever longer queue.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._active = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    thread_name_prefix="password-hash"
+                )
+            return self._executor
+
+    def stats(self) -> Dict[str, int]:
+        """Queue-depth metrics for monitoring."""
+        with self._lock:
+            return {
+                "workers": settings.PASSWORD_HASH_WORKERS,
+                "max_pending": settings.PASSWORD_HASH_MAX_PENDING,
+                "active": self._active,
+                "queued": self._pending - self._active,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "rehashed": self.rehashed,
+            }
+
+    def _track(self, func: Callable[..., T], *args) -> T:
+        with self._lock:
+            self._active += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._pending -= 1
+                self.completed += 1
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self._pending >= settings.PASSWORD_HASH_MAX_PENDING:
+                self.rejected += 1
+                rejected = self.rejected
+            else:
+                self._pending += 1
+                rejected = 0
+        if rejected:
+            if rejected == 1 or rejected % 100 == 0:
+                logger.warning("Password hashing queue full, %d requests rejected so far", rejected)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server busy, please try again",
+                headers={"Retry-After": "1"},
+            )
+
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._get_executor(), self._track, func, *args)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        return await future
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    def rehash_in_background(self, user_id: int, plain_password: str, hashed_password: str) -> bool:
+        """
+        After a successful login, upgrade a hash made with an older scheme or
+        lower cost. Runs on the pool without delaying the response, and only
+        when the queue has room; otherwise the next login tries again.
+        """
+        if not needs_rehash(hashed_password):
+            return False
+        with self._lock:
+            if self._pending >= settings.PASSWORD_HASH_MAX_PENDING // 2:
+                return False
+            self._pending += 1
+        try:
+            self._get_executor().submit(
+                self._track, self._rehash, user_id, plain_password, hashed_password
+            )
+        except RuntimeError:
+            # Shutting down
+            with self._lock:
+                self._pending -= 1
+            return False
+        return True
+
+    def _rehash(self, user_id: int, plain_password: str, hashed_password: str) -> None:
+        try:
+            new_hash = get_password_hash(plain_password)
+            table = User.__table__
+            db = SessionLocal()
+            try:
+                # Skip if the password was changed in the meantime
+                result = db.execute(
+                    update(table)
+                    .where(table.c.id == user_id, table.c.hashed_password == hashed_password)
+                    .values(hashed_password=new_hash)
+                )
+                db.commit()
+            finally:
+                db.close()
+            if result.rowcount:
+                with self._lock:
+                    self.rehashed += 1
+        except Exception:
+            logger.exception("Failed to rehash password for user %s", user_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,101 @@
+# backend/app/core/principal_cache.py
+"""
+Cache of verified access tokens.
+
+Resolving a bearer token to a user costs a JWT verification and a query on
+every request. The cache keeps a small snapshot of the user per token for
+settings.AUTH_CACHE_TTL seconds (never past the token's own expiry), evicting
+the least recently used tokens beyond settings.AUTH_CACHE_SIZE. Committed
+changes to a user drop that user's tokens, so deactivation and role changes
+apply on the next request handled by this process; other processes pick them
+up once their entries expire.
+"""
+from collections import OrderedDict
+from typing import Optional, Tuple
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .config import settings
+from ..models.models import User
+
+class Principal:
+    """The authenticated user, as needed for authorization checks."""
+
+    __slots__ = ("id", "email", "is_active", "is_admin")
+
+    def __init__(self, id: int, email: str, is_active: bool, is_admin: bool):
+        self.id = id
+        self.email = email
+        self.is_active = is_active
+        self.is_admin = is_admin
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(user.id, user.email, bool(user.is_active), bool(user.is_admin))
+
+class PrincipalCache:
+    def __init__(self):
+        self._entries: "OrderedDict[str, Tuple[float, Principal]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            expires_at, principal = entry
+            if expires_at <= time.time():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return principal
+
+    def put(self, token: str, principal: Principal, token_expires_at: Optional[float] = None) -> None:
+        if settings.AUTH_CACHE_TTL <= 0:
+            return
+        expires_at = time.time() + settings.AUTH_CACHE_TTL
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+        with self._lock:
+            self._entries[token] = (expires_at, principal)
+            self._entries.move_to_end(token)
+            while len(self._entries) > settings.AUTH_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            stale = [
+                token for token, (_, principal) in self._entries.items()
+                if principal.id == user_id
+            ]
+            for token in stale:
+                del self._entries[token]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+principal_cache = PrincipalCache()
+
+# Users changed in a session are invalidated once it commits
+
+_PENDING_KEY = "principal_cache_users"
+
+@event.listens_for(Session, "after_flush")
+def _collect_user_changes(session: Session, flush_context) -> None:
+    changed = session.info.setdefault(_PENDING_KEY, set())
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            changed.add(obj.id)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        principal_cache.invalidate_user(user_id)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_user_changes(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING_KEY, None)
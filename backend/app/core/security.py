@@ -1,13 +1,30 @@
 # backend/app/core/security.py
 from datetime import datetime, timedelta
-from typing import Any, Union, Optional
+from typing import Any, Dict, Union, Optional
+import fcntl
+import json
+import logging
+import os
+import time
 from passlib.context import CryptContext
+from passlib.hash import argon2, bcrypt
 import jwt
 from ..core.config import settings
 
+logger = logging.getLogger(__name__)
+
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Lower bounds that calibration never goes below, however slow the host
+BCRYPT_MIN_ROUNDS = 10
+BCRYPT_MAX_ROUNDS = 16
+ARGON2_MIN_TIME_COST = 2
+ARGON2_MAX_TIME_COST = 10
+
+# Parameters of newly created hashes, set by configure_password_hashing()
+password_hash_params: Dict[str, Any] = {"scheme": "bcrypt", "rounds": 12}
+
 # JWT settings
 ALGORITHM = "HS256"
 
@@ -19,6 +36,149 @@ def get_password_hash(password: str) -> str:
     """Generate password hash."""
     return pwd_context.hash(password)
 
+def configure_password_hashing(scheme: str, **params: Any) -> None:
+    """
+    Hash new passwords with `scheme` ("argon2" or "bcrypt") and `params`
+    (bcrypt: rounds; argon2: time_cost, memory_cost, parallelism). Hashes
+    using the other scheme still verify and are reported by needs_rehash().
+    """
+    if scheme == "argon2":
+        pwd_context.update(
+            schemes=["argon2", "bcrypt"],
+            default="argon2",
+            deprecated=["bcrypt"],
+            argon2__time_cost=params["time_cost"],
+            argon2__memory_cost=params["memory_cost"],
+            argon2__parallelism=params["parallelism"],
+        )
+    elif scheme == "bcrypt":
+        pwd_context.update(
+            schemes=["bcrypt", "argon2"],
+            default="bcrypt",
+            deprecated=["argon2"],
+            bcrypt__rounds=params["rounds"],
+        )
+    else:
+        raise ValueError(f"Unsupported password hash scheme: {scheme}")
+    password_hash_params.clear()
+    password_hash_params.update(scheme=scheme, **params)
+
+def _time_hash(context: CryptContext) -> float:
+    start = time.perf_counter()
+    context.hash("calibration-password")
+    return time.perf_counter() - start
+
+def calibrate_password_hashing(scheme: str, target_ms: int) -> Dict[str, Any]:
+    """
+    Find the highest cost whose hash time on this host stays within
+    `target_ms`, never going below the minimum cost for the scheme.
+    Verifying costs the same as hashing, so this bounds login CPU time.
+    """
+    target = target_ms / 1000
+    if scheme == "argon2":
+        fixed = {
+            "memory_cost": settings.PASSWORD_HASH_ARGON2_MEMORY_KIB,
+            "parallelism": settings.PASSWORD_HASH_ARGON2_PARALLELISM,
+        }
+        cost_name, cost, max_cost = "time_cost", ARGON2_MIN_TIME_COST, ARGON2_MAX_TIME_COST
+        def context_for(value):
+            return CryptContext(schemes=["argon2"], **{
+                "argon2__time_cost": value,
+                "argon2__memory_cost": fixed["memory_cost"],
+                "argon2__parallelism": fixed["parallelism"],
+            })
+    elif scheme == "bcrypt":
+        fixed = {}
+        cost_name, cost, max_cost = "rounds", BCRYPT_MIN_ROUNDS, BCRYPT_MAX_ROUNDS
+        def context_for(value):
+            return CryptContext(schemes=["bcrypt"], bcrypt__rounds=value)
+    else:
+        raise ValueError(f"Unsupported password hash scheme: {scheme}")
+
+    # Each step costs more than the last, so stop at the first one over target
+    while cost < max_cost and _time_hash(context_for(cost + 1)) <= target:
+        cost += 1
+    return {cost_name: cost, **fixed}
+
+def _load_or_calibrate(scheme: str, target_ms: int) -> Dict[str, Any]:
+    """
+    Calibrate once per host and share the result through
+    settings.PASSWORD_HASH_CALIBRATION_FILE.
+
+    The first worker process to start holds an exclusive lock on the file
+    while it measures, and the others wait and then read its result, so
+    they do not compete for CPU and skew each other's timings. The result
+    is reused until the scheme, target or argon2 settings change.
+    """
+    key = {
+        "scheme": scheme,
+        "target_ms": target_ms,
+        "argon2_memory_kib": settings.PASSWORD_HASH_ARGON2_MEMORY_KIB,
+        "argon2_parallelism": settings.PASSWORD_HASH_ARGON2_PARALLELISM,
+        "cpus": os.cpu_count(),
+    }
+    path = settings.PASSWORD_HASH_CALIBRATION_FILE
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        cache = open(path, "a+", encoding="utf-8")
+    except OSError:
+        logger.warning("Cannot open %s, calibrating without it", path, exc_info=True)
+        return calibrate_password_hashing(scheme, target_ms)
+
+    with cache:
+        fcntl.flock(cache.fileno(), fcntl.LOCK_EX)
+        try:
+            cache.seek(0)
+            try:
+                cached = json.load(cache)
+            except ValueError:
+                cached = None
+            if isinstance(cached, dict) and cached.get("key") == key:
+                return cached["params"]
+
+            params = calibrate_password_hashing(scheme, target_ms)
+            cache.truncate(0)
+            json.dump({"key": key, "params": params}, cache)
+            cache.flush()
+            return params
+        finally:
+            fcntl.flock(cache.fileno(), fcntl.LOCK_UN)
+
+def setup_password_hashing() -> Dict[str, Any]:
+    """
+    Configure hashing from settings, calibrating the cost if enabled.
+    Blocks for as long as calibration takes, so run it off the event loop.
+    """
+    scheme = settings.PASSWORD_HASH_ALGORITHM
+    if settings.PASSWORD_HASH_CALIBRATE:
+        params = _load_or_calibrate(scheme, settings.PASSWORD_HASH_TARGET_MS)
+    elif scheme == "argon2":
+        params = {
+            "time_cost": ARGON2_MIN_TIME_COST,
+            "memory_cost": settings.PASSWORD_HASH_ARGON2_MEMORY_KIB,
+            "parallelism": settings.PASSWORD_HASH_ARGON2_PARALLELISM,
+        }
+    else:
+        params = {"rounds": 12}
+    configure_password_hashing(scheme, **params)
+    logger.info("Password hashing: %s %s", scheme, params)
+    return params
+
+def needs_rehash(hashed_password: str) -> bool:
+    """
+    Whether a hash uses another scheme or less work than the configured
+    parameters. Stronger hashes, e.g. from a faster host, are left alone so
+    instances with different calibrations do not rehash back and forth.
+    """
+    params = password_hash_params
+    scheme = pwd_context.identify(hashed_password)
+    if scheme != params["scheme"]:
+        return True
+    if scheme == "bcrypt":
+        return bcrypt.from_string(hashed_password).rounds < params["rounds"]
+    parsed = argon2.from_string(hashed_password)
+    return parsed.rounds * parsed.memory_cost < params["time_cost"] * params["memory_cost"]
+
 def create_access_token(
     data: dict,
     expires_delta: Optional[timedelta] = None
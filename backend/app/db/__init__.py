@@ -1,5 +1,8 @@
 # backend/app/db/__init__.py
 from .base import Base
-from .session import engine, SessionLocal, get_db
+from .session import engine, SessionLocal, get_db, async_engine, AsyncSessionLocal, get_async_db
 
-__all__ = ["Base", "engine", "SessionLocal", "get_db"]
+__all__ = [
+    "Base", "engine", "SessionLocal", "get_db",
+    "async_engine", "AsyncSessionLocal", "get_async_db",
+]
@@ -0,0 +1,237 @@
+# backend/app/db/replicas.py
+"""
+Read replica routing.
+
+Read-only endpoints take their session from get_read_db, which binds reads
+to one of settings.DATABASE_REPLICA_URLS while INSERT/UPDATE/DELETE and
+flushes still go to the primary (see RoutingSession). A background task
+measures each replica's replication lag every
+settings.REPLICA_HEALTH_INTERVAL seconds; replicas that are unreachable or
+more than settings.REPLICA_MAX_LAG seconds behind get no reads until they
+catch up, and with no healthy replica reads fall back to the primary.
+
+A user who committed a change is kept on the primary for
+settings.REPLICA_STICKY_SECONDS so they read their own writes. The time of
+the write travels with the client in the last_write cookie, set by
+ReadYourWritesMiddleware, so whichever worker process serves the next
+request routes it the same way.
+"""
+from contextvars import ContextVar
+from itertools import count
+from typing import Dict, List, Optional
+import asyncio
+import logging
+import math
+import time
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from ..core.config import settings
+from .session import AsyncSessionLocal, SessionLocal, create_engines
+
+logger = logging.getLogger(__name__)
+
+# Seconds the replica's replay is behind the primary; 0 when it has
+# replayed everything it received, so an idle primary does not look like lag.
+# NULL when the WAL receiver is not streaming: a replica cut off from the
+# primary has nothing left to replay and would otherwise report no lag.
+# Reading pg_stat_wal_receiver needs the pg_monitor role.
+POSTGRES_LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+# Session.info key holding the id of the user the request acts for
+SESSION_USER_KEY = "replica_router_user"
+
+# Cookie holding the Unix time of the client's last committed write
+LAST_WRITE_COOKIE = "last_write"
+
+class Replica:
+    def __init__(self, url: str):
+        self.url = url
+        self.engine: AsyncEngine = create_engines(url, asynchronous=True)[0]
+        self._sync_engine: Optional[Engine] = None
+        self.lag: Optional[float] = None
+        self.healthy = False
+
+    @property
+    def sync_engine(self) -> Engine:
+        # Only the audit log reads synchronously, so create this pool on demand
+        if self._sync_engine is None:
+            self._sync_engine = create_engines(self.url)[0]
+        return self._sync_engine
+
+    async def measure_lag(self) -> Optional[float]:
+        """Replication lag in seconds, or None if not replicating."""
+        async with self.engine.connect() as conn:
+            if conn.dialect.name != "postgresql":
+                await conn.execute(text("SELECT 1"))
+                return 0.0
+            lag = await conn.scalar(POSTGRES_LAG_QUERY)
+            return float(lag) if lag is not None else None
+
+class ReplicaRouter:
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(url) for url in urls]
+        self._next = count()
+        self._task: Optional[asyncio.Task] = None
+
+    def choose(self) -> Optional[Replica]:
+        """A healthy replica, round robin, or None to read from the primary."""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._next) % len(healthy)]
+
+    @staticmethod
+    def wrote_recently(last_write: Optional[float]) -> bool:
+        """Whether a write at Unix time `last_write` may not be on replicas yet."""
+        return last_write is not None and time.time() - last_write < settings.REPLICA_STICKY_SECONDS
+
+    def _replica_for(self, last_write: Optional[float]) -> Optional[Replica]:
+        if not self.replicas or self.wrote_recently(last_write):
+            return None
+        return self.choose()
+
+    def read_session(
+        self,
+        user_id: Optional[int] = None,
+        last_write: Optional[float] = None
+    ) -> AsyncSession:
+        """
+        AsyncSession reading from a replica, unless the client's last write
+        (see last_write_from) was too recent for replicas to have it.
+        """
+        replica = self._replica_for(last_write)
+        if replica is None:
+            db = AsyncSessionLocal()
+        else:
+            db = AsyncSessionLocal(read_bind=replica.engine.sync_engine)
+        if user_id is not None:
+            db.info[SESSION_USER_KEY] = user_id
+        return db
+
+    def sync_read_session(self) -> Session:
+        """Synchronous session reading from a replica, for thread pool work."""
+        replica = self._replica_for(None)
+        if replica is None:
+            return SessionLocal()
+        return SessionLocal(read_bind=replica.sync_engine)
+
+    async def check(self) -> None:
+        """Measure every replica's lag and update its health."""
+        for replica in self.replicas:
+            try:
+                lag = await replica.measure_lag()
+                if lag is None and replica.healthy:
+                    logger.warning("Replica %s is not streaming from the primary", replica.engine.url)
+            except Exception:
+                logger.warning("Replica %s is unreachable", replica.engine.url, exc_info=True)
+                lag = None
+            healthy = lag is not None and lag <= settings.REPLICA_MAX_LAG
+            if healthy != replica.healthy and lag is not None:
+                logger.warning(
+                    "Replica %s is %s (lag %.1fs)",
+                    replica.engine.url, "healthy" if healthy else "lagging", lag
+                )
+            replica.lag = lag
+            replica.healthy = healthy
+
+    def status(self) -> List[Dict]:
+        return [
+            {"url": replica.engine.url.render_as_string(), "lag": replica.lag, "healthy": replica.healthy}
+            for replica in self.replicas
+        ]
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(settings.REPLICA_HEALTH_INTERVAL)
+
+    def start(self) -> None:
+        """Start checking replica health on the running event loop."""
+        if self.replicas and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        for replica in self.replicas:
+            await replica.engine.dispose()
+            if replica._sync_engine is not None:
+                replica._sync_engine.dispose()
+
+replica_router = ReplicaRouter(settings.DATABASE_REPLICA_URLS)
+
+def last_write_from(request: Request) -> Optional[float]:
+    """The time of the client's last write from its cookie, if any."""
+    try:
+        last_write = float(request.cookies[LAST_WRITE_COOKIE])
+    except (KeyError, ValueError):
+        return None
+    return last_write if math.isfinite(last_write) else None
+
+def set_last_write_cookie(response: Response, written_at: float) -> None:
+    """Keep the client on the primary until a write at `written_at` has replicated."""
+    remaining = written_at + settings.REPLICA_STICKY_SECONDS - time.time()
+    if remaining > 0:
+        response.set_cookie(
+            LAST_WRITE_COOKIE,
+            repr(written_at),
+            max_age=math.ceil(remaining),
+            httponly=True,
+            samesite="lax"
+        )
+
+# Writes committed while handling the current request
+_request_writes: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "replica_router_request_writes", default=None
+)
+
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    """Sets the last_write cookie on responses to requests that wrote."""
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        writes: Dict[str, float] = {}
+        token = _request_writes.set(writes)
+        try:
+            response = await call_next(request)
+        finally:
+            _request_writes.reset(token)
+        if "written_at" in writes:
+            set_last_write_cookie(response, writes["written_at"])
+        return response
+
+# A user's flushed changes keep their reads on the primary once committed.
+# Core statements such as audit inserts do not flush and are not counted.
+
+_PENDING_KEY = "replica_router_wrote"
+
+@event.listens_for(Session, "after_flush")
+def _collect_write(session: Session, flush_context) -> None:
+    if session.info.get(SESSION_USER_KEY) is not None:
+        session.info[_PENDING_KEY] = True
+
+@event.listens_for(Session, "after_commit")
+def _note_committed_write(session: Session) -> None:
+    writes = _request_writes.get()
+    if session.info.pop(_PENDING_KEY, False) and writes is not None:
+        writes["written_at"] = time.time()
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_write(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -1,18 +1,166 @@
 # backend/app/db/session.py
-from sqlalchemy import create_engine
+"""
+Engines and sessions.
+
+A file-backed SQLite database gets two pooled engines: a pool of reader
+connections, and a single writer connection that takes the write lock up
+front with BEGIN IMMEDIATE. In WAL mode readers never block on the writer,
+so reads scale across threads while writes are serialized in the pool
+instead of failing with "database is locked". RoutingSession sends flushes
+and INSERT/UPDATE/DELETE statements to the writer, and keeps the rest of
+that transaction there so it reads its own writes.
+
+In-memory SQLite (one database per connection) and other databases use a
+single engine.
+
+The API routers use AsyncSession from get_async_db, on async engines set up
+the same way with the aiosqlite or asyncpg driver, so a query does not block
+the event loop. Background jobs and threads keep using SessionLocal.
+"""
+from typing import AsyncGenerator, Generator, Optional, Tuple
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
-from typing import Generator
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
 
 from ..core.config import settings
-
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
+from ..core.security_enhancements import (
+    CONNECTION_RECYCLE_TIME,
+    DB_CONNECTION_TIMEOUT,
+    MAX_CONNECTIONS,
+    SQLITE_SECURITY_PRAGMAS,
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_SECURITY_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+def _use_immediate_transactions(engine: Engine) -> None:
+    # pysqlite only emits BEGIN before the first DML statement, so a
+    # transaction that reads first could fail to upgrade its lock later
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin_immediate(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+# Async drivers for the synchronous database URLs used in settings
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+def async_database_url(database_url: str) -> URL:
+    """`database_url` with its driver replaced by the async one."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend in ASYNC_DRIVERS:
+        url = url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+    return url
+
+def is_memory_database(database_url) -> bool:
+    url = make_url(database_url)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+def create_engines(database_url, asynchronous: bool = False) -> Tuple[Engine, Optional[Engine]]:
+    """
+    The engine for writes and, for file-backed SQLite, a separate engine
+    for reads (None otherwise). With `asynchronous`, AsyncEngines using the
+    async driver for the database.
+    """
+    if asynchronous:
+        url = async_database_url(database_url)
+        new_engine = create_async_engine
+        pool_class = AsyncAdaptedQueuePool
+    else:
+        url = make_url(database_url)
+        new_engine = create_engine
+        pool_class = QueuePool
+
+    def sync_engine(e):
+        return e.sync_engine if asynchronous else e
+
+    pool_options = {
+        "poolclass": pool_class,
+        "pool_timeout": DB_CONNECTION_TIMEOUT,
+        "pool_recycle": CONNECTION_RECYCLE_TIME,
+    }
+
+    if url.get_backend_name() != "sqlite":
+        engine = new_engine(
+            url,
+            pool_size=MAX_CONNECTIONS,
+            max_overflow=0,
+            pool_pre_ping=True,
+            **pool_options
+        )
+        return engine, None
+
+    connect_args = {"check_same_thread": False, "timeout": DB_CONNECTION_TIMEOUT}
+    if is_memory_database(url):
+        engine = new_engine(url, connect_args=connect_args, poolclass=StaticPool)
+        event.listen(sync_engine(engine), "connect", _apply_sqlite_pragmas)
+        return engine, None
+
+    engine = new_engine(
+        url,
+        connect_args=connect_args,
+        pool_size=1,
+        max_overflow=0,
+        **pool_options
+    )
+    read_engine = new_engine(
+        url,
+        connect_args=connect_args,
+        pool_size=max(MAX_CONNECTIONS - 1, 1),
+        max_overflow=0,
+        **pool_options
+    )
+    for e in (engine, read_engine):
+        event.listen(sync_engine(e), "connect", _apply_sqlite_pragmas)
+    _use_immediate_transactions(sync_engine(engine))
+    return engine, read_engine
+
+_WRITING_KEY = "routing_session_writing"
+
+class RoutingSession(Session):
+    """Session that sends reads to `read_bind` when one is configured."""
+
+    def __init__(self, *args, read_bind: Optional[Engine] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.read_bind = read_bind
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.read_bind is None:
+            return super().get_bind(mapper, clause=clause, **kwargs)
+        if self._flushing or getattr(clause, "is_dml", False):
+            self.info[_WRITING_KEY] = True
+        if self.info.get(_WRITING_KEY):
+            return super().get_bind(mapper, clause=clause, **kwargs)
+        return self.read_bind
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _reset_routing(session: Session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(_WRITING_KEY, None)
+
+engine, read_engine = create_engines(settings.DATABASE_URL)
+
+SessionLocal = sessionmaker(
+    class_=RoutingSession,
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+    read_bind=read_engine,
+)
 
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
@@ -20,3 +168,19 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+async_engine, async_read_engine = create_engines(settings.DATABASE_URL, asynchronous=True)
+
+# Objects stay loaded after commit, since lazy loads are not possible with
+# AsyncSession once the handler has moved on
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    sync_session_class=RoutingSession,
+    read_bind=async_read_engine.sync_engine if async_read_engine is not None else None,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
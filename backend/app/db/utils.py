@@ -1,7 +1,7 @@
 # backend/app/db/utils.py
 from sqlalchemy.orm import Session
 from ..models.models import Base
-from .session import engine
+from .session import engine, read_engine
 
 def init_db(db: Session) -> None:
     """Initialize database."""
@@ -10,3 +10,5 @@ def init_db(db: Session) -> None:
 def close_db() -> None:
     """Close database connections."""
     engine.dispose()
+    if read_engine is not None:
+        read_engine.dispose()
@@ -1,11 +1,20 @@
 # backend/app/main.py
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
 from .core.config import settings
+from .core.password_hasher import password_hasher
+from .core.security import setup_password_hashing
 from .api import router as api_router
 from .db.base_class import Base
-from .db.session import engine
+from .db.replicas import ReadYourWritesMiddleware, replica_router
+from .db.session import async_engine, engine, is_memory_database
+from .services.audit import audit_writer
+from .services.contact_search import ensure_search_index
+from .services.import_jobs import import_jobs
+from .services.tag_cache import tag_cache
+from .services.vcard_handler import dedupe_pool, parse_pool
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -19,7 +28,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
+app.add_middleware(ReadYourWritesMiddleware)
 
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -28,3 +39,21 @@ app.include_router(api_router, prefix=settings.API_V1_STR)
 @app.on_event("startup")
 async def startup_event():
     Base.metadata.create_all(bind=engine)
+    if is_memory_database(async_engine.url):
+        # Not shared with the synchronous engine's in-memory database
+        async with async_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    ensure_search_index(engine)
+    await run_in_threadpool(setup_password_hashing)
+    replica_router.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    import_jobs.shutdown()
+    parse_pool.shutdown()
+    dedupe_pool.shutdown()
+    audit_writer.shutdown()
+    password_hasher.shutdown()
+    await replica_router.stop()
+    await tag_cache.close()
+    await async_engine.dispose()
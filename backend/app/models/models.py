@@ -1,6 +1,6 @@
 # backend/app/models/models.py
 from datetime import datetime
-from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey, Table, Text
+from sqlalchemy import Boolean, Column, Integer, JSON, String, DateTime, ForeignKey, Index, Table, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -15,7 +15,34 @@ contact_tags = Table(
     extend_existing=True
 )
 
+# Per-owner counter bumped with every change to the owner's contacts, for ETags
+contact_versions = Table(
+    'contact_versions',
+    Base.metadata,
+    Column('owner_id', Integer, primary_key=True),
+    Column('version', Integer, nullable=False, default=0),
+    extend_existing=True
+)
+
+# Progress of background vCard imports, shared by all worker processes
+import_jobs = Table(
+    'import_jobs',
+    Base.metadata,
+    Column('id', String(32), primary_key=True),
+    Column('owner_id', Integer, nullable=False, index=True),
+    Column('status', String, nullable=False),
+    Column('parsed', Integer, nullable=False, default=0),
+    Column('imported', Integer, nullable=False, default=0),
+    Column('duplicates', Integer, nullable=False, default=0),
+    Column('errors', JSON, nullable=False, default=list),
+    Column('error_count', Integer, nullable=False, default=0),
+    Column('created_at', DateTime, nullable=False),
+    Column('finished_at', DateTime, index=True),
+    extend_existing=True
+)
+
 class User(Base):
+    __tablename__ = 'users'
     __table_args__ = {'extend_existing': True}
 
     id = Column(Integer, primary_key=True, index=True)
@@ -32,7 +59,12 @@ class User(Base):
     audit_logs = relationship("AuditLogEntry", back_populates="user", cascade="all, delete-orphan")
 
 class Contact(Base):
-    __table_args__ = {'extend_existing': True}
+    __tablename__ = 'contacts'
+    __table_args__ = (
+        # Keyset pagination of an owner's contacts in name order
+        Index('ix_contacts_owner_name', 'owner_id', 'last_name', 'first_name', 'id'),
+        {'extend_existing': True}
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     first_name = Column(String, nullable=False)
@@ -49,6 +81,7 @@ class Contact(Base):
     tags = relationship("Tag", secondary=contact_tags, back_populates="contacts")
 
 class Tag(Base):
+    __tablename__ = 'tags'
     __table_args__ = {'extend_existing': True}
 
     id = Column(Integer, primary_key=True, index=True)
@@ -59,13 +92,21 @@ class Tag(Base):
 
 class AuditLogEntry(Base):
     __tablename__ = 'audit_logs'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Back the audit query filters, newest first with (timestamp, id) keyset paging
+        Index('ix_audit_logs_timestamp_id', 'timestamp', 'id'),
+        Index('ix_audit_logs_user_timestamp', 'user_id', 'timestamp', 'id'),
+        Index('ix_audit_logs_action_timestamp', 'action', 'timestamp', 'id'),
+        Index('ix_audit_logs_ip_timestamp', 'ip_address', 'timestamp', 'id'),
+        {'extend_existing': True}
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
     action = Column(String, nullable=False)
     details = Column(Text)
     ip_address = Column(String)
+    user_agent = Column(String)
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
 
     user = relationship("User", back_populates="audit_logs")
@@ -0,0 +1,20 @@
+# backend/app/schemas/audit.py
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+class AuditLogResponse(BaseModel):
+    id: int
+    user_id: Optional[int] = None
+    action: str
+    details: Optional[str] = None
+    ip_address: Optional[str] = None
+    user_agent: Optional[str] = None
+    timestamp: datetime
+
+    class Config:
+        from_attributes = True
+
+class AuditLogPage(BaseModel):
+    items: List[AuditLogResponse]
+    next_cursor: Optional[str] = None
@@ -1,7 +1,7 @@
 # backend/app/schemas/contact.py
 from typing import List, Optional
 from datetime import datetime
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, validator
 
 class ContactBase(BaseModel):
     first_name: str
@@ -25,5 +25,43 @@ class ContactResponse(ContactBase):
     owner_id: int
     tags: List[str] = []
 
+    @validator('tags', pre=True)
+    def tag_names(cls, v):
+        # Contact.tags holds Tag rows; the API exposes their names
+        return [getattr(tag, 'name', tag) for tag in v or []]
+
+    class Config:
+        from_attributes = True
+
+class ContactSuggestion(BaseModel):
+    id: int
+    display_name: str
+
+class ImportCardError(BaseModel):
+    index: Optional[int] = None
+    line: Optional[int] = None
+    error: str
+
+class ImportJobResponse(BaseModel):
+    id: str
+    status: str
+    parsed: int
+    imported: int
+    duplicates: int
+    errors: List[ImportCardError] = []
+    error_count: int = 0
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class TagCreate(BaseModel):
+    name: str
+
+class Tag(TagCreate):
+    id: int
+    created_at: Optional[datetime] = None
+
     class Config:
         from_attributes = True
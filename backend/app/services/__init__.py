@@ -3,8 +3,12 @@
 
 from .email import email_service
 from .vcard_handler import VCardHandler
+from .import_jobs import import_jobs
+from .audit import audit_writer
 
 __all__ = [
     "email_service",
     "VCardHandler",
+    "import_jobs",
+    "audit_writer",
 ]
@@ -0,0 +1,185 @@
+# backend/app/services/audit.py
+from datetime import datetime
+from typing import Dict, List, Optional
+import logging
+import queue
+import threading
+import time
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from .audit_storage import AuditStorage, get_audit_storage
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+class AuditLogWriter:
+    """
+    Writes audit log entries outside of the request that produced them.
+
+    Entries are put on a bounded in-process queue and written to the audit
+    storage backend in batches by a background thread, once
+    settings.AUDIT_BATCH_SIZE entries are pending or
+    settings.AUDIT_FLUSH_INTERVAL seconds after the first one arrived. When
+    the queue is full, the entry is written by the caller instead, which
+    slows requests down rather than losing entries. A batch that fails to
+    write is retried settings.AUDIT_WRITE_RETRIES times, with a doubling
+    delay, before it is logged and discarded. shutdown() flushes everything
+    still queued.
+
+    With settings.AUDIT_SYNC the entry is written immediately, through the
+    caller's session for the database backend, which keeps tests
+    deterministic. Handlers using an AsyncSession call record_async().
+    """
+
+    def __init__(self, storage: Optional[AuditStorage] = None):
+        self._storage = storage
+        self.overflowed = 0
+        self.lost = 0
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        db: Session,
+        user_id: Optional[int],
+        action: str,
+        details: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None
+    ) -> None:
+        """Record an audit log entry."""
+        entry = self._entry(user_id, action, details, ip_address, user_agent)
+        if settings.AUDIT_SYNC or not self._enqueue(entry):
+            self.storage.write_batch([entry], db=db)
+
+    async def record_async(
+        self,
+        db: AsyncSession,
+        user_id: Optional[int],
+        action: str,
+        details: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None
+    ) -> None:
+        """Record an audit log entry from a handler using an AsyncSession."""
+        entry = self._entry(user_id, action, details, ip_address, user_agent)
+        if settings.AUDIT_SYNC:
+            await db.run_sync(lambda session: self.storage.write_batch([entry], db=session))
+        elif not self._enqueue(entry):
+            # File-backed storage would block the event loop
+            await run_in_threadpool(self.storage.write_batch, [entry])
+
+    @staticmethod
+    def _entry(
+        user_id: Optional[int],
+        action: str,
+        details: Optional[str],
+        ip_address: Optional[str],
+        user_agent: Optional[str]
+    ) -> Dict:
+        return {
+            "user_id": user_id,
+            "action": action,
+            "details": details,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "timestamp": datetime.utcnow(),
+        }
+
+    def _enqueue(self, entry: Dict) -> bool:
+        """Queue an entry for the writer thread, False if the queue is full."""
+        try:
+            self._ensure_started().put_nowait(entry)
+            return True
+        except queue.Full:
+            self.overflowed += 1
+            if self.overflowed == 1 or self.overflowed % 1000 == 0:
+                logger.warning(
+                    "Audit log queue full, %d entries written by the caller so far",
+                    self.overflowed
+                )
+            return False
+
+    def _ensure_started(self) -> queue.Queue:
+        with self._lock:
+            if self._thread is None:
+                self._queue = queue.Queue(maxsize=settings.AUDIT_QUEUE_SIZE)
+                self._thread = threading.Thread(
+                    target=self._run,
+                    args=(self._queue,),
+                    name="audit-writer",
+                    daemon=True
+                )
+                self._thread.start()
+            return self._queue
+
+    @property
+    def storage(self) -> AuditStorage:
+        if self._storage is None:
+            self._storage = get_audit_storage()
+        return self._storage
+
+    def _run(self, entries: queue.Queue) -> None:
+        stopping = False
+        while not stopping:
+            batch: List[Dict] = []
+            deadline = None
+            while len(batch) < settings.AUDIT_BATCH_SIZE:
+                timeout = None
+                if deadline is not None:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                try:
+                    entry = entries.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+                if deadline is None:
+                    deadline = time.monotonic() + settings.AUDIT_FLUSH_INTERVAL
+
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: List[Dict]) -> None:
+        delay = settings.AUDIT_RETRY_DELAY
+        for attempt in range(settings.AUDIT_WRITE_RETRIES + 1):
+            try:
+                self.storage.write_batch(batch)
+                return
+            except Exception:
+                if attempt == settings.AUDIT_WRITE_RETRIES:
+                    self.lost += len(batch)
+                    logger.exception("Failed to write %d audit log entries", len(batch))
+                    return
+                logger.warning(
+                    "Failed to write %d audit log entries, retrying in %.1fs",
+                    len(batch), delay, exc_info=True
+                )
+            time.sleep(delay)
+            delay *= 2
+
+    def shutdown(self) -> None:
+        """Flush queued entries and stop the background thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            entries, self._queue = self._queue, None
+        if thread is not None and thread.is_alive():
+            entries.put(_STOP)
+            thread.join()
+
+def client_host(request: Request) -> Optional[str]:
+    """The client address for audit entries, when the server knows it."""
+    return request.client.host if request.client is not None else None
+
+audit_writer = AuditLogWriter()
@@ -0,0 +1,373 @@
+# backend/app/services/audit_storage.py
+"""
+Storage backends for the audit log.
+
+The database backend keeps entries in the audit_logs table. The segment
+backend keeps them out of the primary database in append-only JSON lines
+files, one segment per UTC day, each with a small block index so reads can
+skip the parts of a segment that cannot match.
+"""
+from abc import ABC, abstractmethod
+from datetime import date, datetime, time, timedelta
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import fcntl
+import heapq
+import json
+import os
+import re
+import threading
+
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..db.replicas import replica_router
+from ..db.session import SessionLocal
+from ..models.models import AuditLogEntry
+
+class AuditStorage(ABC):
+    """Interface implemented by audit log backends."""
+
+    @abstractmethod
+    def write_batch(self, entries: List[Dict], db: Optional[Session] = None) -> None:
+        """
+        Append entries. `db` is the caller's session when writing synchronously;
+        backends that do not live in the database ignore it.
+        """
+
+    @abstractmethod
+    def query(
+        self,
+        user_id: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        action: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+        descending: bool = False
+    ) -> List[Dict]:
+        """
+        Entries with start <= timestamp < end, ordered by (timestamp, id).
+
+        `after` is the (timestamp, id) key of the last entry already seen;
+        only entries past it in the requested order are returned, which lets
+        callers page through results without offsets.
+        """
+
+class DatabaseAuditStorage(AuditStorage):
+    """
+    Stores entries in the audit_logs table. Queries use
+    `read_session_factory`, e.g. to read from a replica.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        read_session_factory: Optional[Callable[[], Session]] = None
+    ):
+        self.session_factory = session_factory
+        self.read_session_factory = read_session_factory or session_factory
+
+    def write_batch(self, entries: List[Dict], db: Optional[Session] = None) -> None:
+        if db is not None:
+            db.execute(insert(AuditLogEntry.__table__), entries)
+            db.commit()
+            return
+
+        db = self.session_factory()
+        try:
+            db.execute(insert(AuditLogEntry.__table__), entries)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def query(
+        self,
+        user_id: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        action: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+        descending: bool = False
+    ) -> List[Dict]:
+        table = AuditLogEntry.__table__
+        stmt = select(table)
+        if user_id is not None:
+            stmt = stmt.where(table.c.user_id == user_id)
+        if action is not None:
+            stmt = stmt.where(table.c.action == action)
+        if ip_address is not None:
+            stmt = stmt.where(table.c.ip_address == ip_address)
+        if start is not None:
+            stmt = stmt.where(table.c.timestamp >= start)
+        if end is not None:
+            stmt = stmt.where(table.c.timestamp < end)
+        if after is not None:
+            key = tuple_(table.c.timestamp, table.c.id)
+            stmt = stmt.where(key < after if descending else key > after)
+
+        if descending:
+            stmt = stmt.order_by(table.c.timestamp.desc(), table.c.id.desc())
+        else:
+            stmt = stmt.order_by(table.c.timestamp, table.c.id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+
+        with self.read_session_factory() as db:
+            return [dict(row._mapping) for row in db.execute(stmt)]
+
+class _Descending:
+    """Heap key ordering `key` from largest to smallest."""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.key < self.key
+
+class SegmentAuditStorage(AuditStorage):
+    """
+    Stores entries in append-only segment files rotated by UTC day.
+
+    Each call to write_batch appends one block of JSON lines to the day's
+    segment (audit-YYYY-MM-DD.jsonl) and then one line describing the block
+    to the segment index (audit-YYYY-MM-DD.idx): its byte range, time span
+    and the users it contains. Queries pick segments by file name, then read
+    only the blocks whose index entry can match. Because the index line is
+    written after the data, readers never see a partially written block.
+
+    Appends hold an exclusive flock on the segment from finding the end of
+    the file until the index line is written, so several worker processes
+    can share a directory without recording stale offsets.
+    """
+
+    _SEGMENT_RE = re.compile(r"^audit-(\d{4}-\d{2}-\d{2})\.jsonl$")
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or settings.AUDIT_SEGMENT_DIR
+        self._lock = threading.Lock()
+
+    def _segment_path(self, day: date) -> str:
+        return os.path.join(self.directory, f"audit-{day.isoformat()}.jsonl")
+
+    def _index_path(self, day: date) -> str:
+        return os.path.join(self.directory, f"audit-{day.isoformat()}.idx")
+
+    def write_batch(self, entries: List[Dict], db: Optional[Session] = None) -> None:
+        by_day: Dict[date, List[Dict]] = {}
+        for entry in entries:
+            by_day.setdefault(entry["timestamp"].date(), []).append(entry)
+
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            for day, day_entries in sorted(by_day.items()):
+                self._append_block(day, day_entries)
+
+    def _append_block(self, day: date, entries: List[Dict]) -> None:
+        data = "".join(
+            json.dumps(
+                {**entry, "timestamp": entry["timestamp"].isoformat()},
+                separators=(",", ":")
+            ) + "\n"
+            for entry in entries
+        ).encode("utf-8")
+
+        timestamps = [entry["timestamp"] for entry in entries]
+        block = {
+            "length": len(data),
+            "start": min(timestamps).isoformat(),
+            "end": max(timestamps).isoformat(),
+            "users": sorted(
+                {entry["user_id"] for entry in entries},
+                key=lambda user_id: (user_id is None, user_id)
+            ),
+        }
+
+        with open(self._segment_path(day), "ab") as segment:
+            # The lock also keeps index lines in the order of their blocks
+            fcntl.flock(segment.fileno(), fcntl.LOCK_EX)
+            try:
+                offset = segment.seek(0, os.SEEK_END)
+                segment.write(data)
+                segment.flush()
+                os.fsync(segment.fileno())
+
+                with open(self._index_path(day), "a", encoding="utf-8") as index:
+                    index.write(json.dumps({"offset": offset, **block}, separators=(",", ":")) + "\n")
+            finally:
+                fcntl.flock(segment.fileno(), fcntl.LOCK_UN)
+
+    def _segment_days(self) -> List[date]:
+        if not os.path.isdir(self.directory):
+            return []
+
+        days = []
+        for name in os.listdir(self.directory):
+            match = self._SEGMENT_RE.match(name)
+            if match is not None:
+                days.append(date.fromisoformat(match.group(1)))
+        return sorted(days)
+
+    def _iter_blocks(self, day: date) -> Iterator[Dict]:
+        try:
+            with open(self._index_path(day), encoding="utf-8") as index:
+                for line in index:
+                    if line.endswith("\n"):
+                        yield json.loads(line)
+        except FileNotFoundError:
+            return
+
+    def query(
+        self,
+        user_id: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        action: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+        descending: bool = False
+    ) -> List[Dict]:
+        entries = self.iter_entries(
+            user_id=user_id,
+            start=start,
+            end=end,
+            action=action,
+            ip_address=ip_address,
+            after=after,
+            descending=descending
+        )
+        return list(islice(entries, limit))
+
+    def iter_entries(
+        self,
+        user_id: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        action: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+        descending: bool = False
+    ) -> Iterator[Dict]:
+        """
+        Matching entries in (timestamp, id) order, read lazily.
+
+        An entry's id is its byte offset in its segment, which together with
+        the timestamp orders entries the same way on every read. Blocks are
+        read in order of their time span and merged through a heap, so only
+        blocks whose spans overlap are held in memory at once, and a caller
+        that stops early never reads the rest of the segment.
+        """
+        def may_match(first: datetime, last: datetime) -> bool:
+            if start is not None and last < start:
+                return False
+            if end is not None and first >= end:
+                return False
+            if after is not None:
+                if descending and first > after[0]:
+                    return False
+                if not descending and last < after[0]:
+                    return False
+            return True
+
+        def matches(entry: Dict) -> bool:
+            if user_id is not None and entry["user_id"] != user_id:
+                return False
+            if action is not None and entry["action"] != action:
+                return False
+            if ip_address is not None and entry["ip_address"] != ip_address:
+                return False
+            if start is not None and entry["timestamp"] < start:
+                return False
+            if end is not None and entry["timestamp"] >= end:
+                return False
+            if after is not None:
+                key = (entry["timestamp"], entry["id"])
+                return key < after if descending else key > after
+            return True
+
+        days = self._segment_days()
+        if descending:
+            days.reverse()
+
+        for day in days:
+            day_start = datetime.combine(day, time.min)
+            if not may_match(day_start, day_start + timedelta(days=1)):
+                continue
+
+            blocks = []
+            for block in self._iter_blocks(day):
+                if user_id is not None and user_id not in block["users"]:
+                    continue
+                first = datetime.fromisoformat(block["start"])
+                last = datetime.fromisoformat(block["end"])
+                if may_match(first, last):
+                    blocks.append((first, last, block))
+            if not blocks:
+                continue
+
+            with open(self._segment_path(day), "rb") as segment:
+                yield from self._merge_blocks(segment, blocks, matches, descending)
+
+    @staticmethod
+    def _read_block(segment, block: Dict) -> Iterator[Dict]:
+        segment.seek(block["offset"])
+        position = block["offset"]
+        for line in segment.read(block["length"]).splitlines(keepends=True):
+            entry = json.loads(line)
+            entry["id"] = position
+            entry["timestamp"] = datetime.fromisoformat(entry["timestamp"])
+            position += len(line)
+            yield entry
+
+    def _merge_blocks(
+        self,
+        segment,
+        blocks: List[Tuple[datetime, datetime, Dict]],
+        matches: Callable[[Dict], bool],
+        descending: bool
+    ) -> Iterator[Dict]:
+        """
+        Yield the matching entries of a day's blocks in order.
+
+        Blocks are appended in flush order, so their time spans can overlap.
+        Ascending, blocks are loaded by start time and an entry is only
+        yielded once every block starting at or before it has been loaded;
+        descending mirrors this with end times.
+        """
+        if descending:
+            blocks.sort(key=lambda b: (b[1], b[2]["offset"]), reverse=True)
+        else:
+            blocks.sort(key=lambda b: (b[0], b[2]["offset"]))
+
+        heap: List[Tuple] = []
+        next_block = 0
+        while heap or next_block < len(blocks):
+            if not heap or next_block < len(blocks) and (
+                blocks[next_block][1] >= heap[0][1]["timestamp"] if descending
+                else blocks[next_block][0] <= heap[0][1]["timestamp"]
+            ):
+                for entry in self._read_block(segment, blocks[next_block][2]):
+                    if matches(entry):
+                        key = (entry["timestamp"], entry["id"])
+                        heapq.heappush(heap, (_Descending(key) if descending else key, entry))
+                next_block += 1
+                continue
+            yield heapq.heappop(heap)[1]
+
+def get_audit_storage() -> AuditStorage:
+    """Build the backend selected by settings.AUDIT_STORAGE."""
+    if settings.AUDIT_STORAGE == "segments":
+        return SegmentAuditStorage()
+    if settings.AUDIT_STORAGE == "database":
+        return DatabaseAuditStorage(read_session_factory=replica_router.sync_read_session)
+    raise ValueError(f"Unknown audit storage backend: {settings.AUDIT_STORAGE}")
@@ -0,0 +1,125 @@
+# backend/app/services/contact_search.py
+"""
+Full-text contact search.
+
+On SQLite, contacts are indexed in an FTS5 table that uses the contacts
+table as its external content. Triggers keep it in sync with every insert,
+update and delete, including the Core bulk inserts used by imports, which
+ORM events would miss. Other databases fall back to LIKE matching.
+"""
+from typing import List
+import re
+
+from sqlalchemy import or_, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ..models.models import Contact
+
+FTS_TABLE = "contacts_fts"
+
+# Indexed columns with their bm25 weights; a name hit outranks one in the notes
+SEARCH_COLUMNS = {
+    "first_name": 10.0,
+    "last_name": 10.0,
+    "email": 5.0,
+    "phone": 2.0,
+    "address": 1.0,
+    "notes": 1.0,
+}
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+def _ddl(table: str) -> List[str]:
+    columns = ", ".join(SEARCH_COLUMNS)
+    new_values = ", ".join(f"new.{column}" for column in SEARCH_COLUMNS)
+    old_values = ", ".join(f"old.{column}" for column in SEARCH_COLUMNS)
+    delete_old = (
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+    insert_new = (
+        f"INSERT INTO {FTS_TABLE}(rowid, {columns}) "
+        f"VALUES (new.id, {new_values});"
+    )
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        f"{columns}, content='{table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {table} "
+        f"BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {table} "
+        f"BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON {table} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+def ensure_search_index(engine: Engine) -> None:
+    """Create the FTS5 table and its triggers, indexing existing contacts once."""
+    if engine.dialect.name != "sqlite":
+        return
+
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE}
+        ).first()
+        for statement in _ddl(Contact.__table__.name):
+            conn.execute(text(statement))
+        if not exists:
+            conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+def build_match_query(query: str) -> str:
+    """
+    Turn user input into an FTS5 query: every word must match as a prefix.
+
+    Words are quoted so FTS5 operators and punctuation in the input are
+    treated as text.
+    """
+    return " ".join(f'"{token}"*' for token in _TOKEN_RE.findall(query))
+
+def search_contact_ids(
+    db: Session,
+    owner_id: int,
+    query: str,
+    limit: int = 20
+) -> List[int]:
+    """Ids of the owner's contacts matching `query`, best match first."""
+    if db.get_bind().dialect.name != "sqlite":
+        return _search_contact_ids_like(db, owner_id, query, limit)
+
+    match = build_match_query(query)
+    if not match:
+        return []
+
+    weights = ", ".join(str(weight) for weight in SEARCH_COLUMNS.values())
+    rows = db.execute(
+        text(
+            f"SELECT c.id FROM {FTS_TABLE} "
+            f"JOIN {Contact.__table__.name} AS c ON c.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH :match AND c.owner_id = :owner_id "
+            f"ORDER BY bm25({FTS_TABLE}, {weights}) "
+            f"LIMIT :limit"
+        ),
+        {"match": match, "owner_id": owner_id, "limit": limit}
+    )
+    return [row.id for row in rows]
+
+def _search_contact_ids_like(
+    db: Session,
+    owner_id: int,
+    query: str,
+    limit: int
+) -> List[int]:
+    tokens = _TOKEN_RE.findall(query)
+    if not tokens:
+        return []
+
+    table = Contact.__table__
+    stmt = select(table.c.id).where(table.c.owner_id == owner_id)
+    for token in tokens:
+        stmt = stmt.where(or_(
+            *(table.c[column].ilike(f"%{token}%") for column in SEARCH_COLUMNS)
+        ))
+    stmt = stmt.order_by(table.c.last_name, table.c.first_name, table.c.id).limit(limit)
+    return [row.id for row in db.execute(stmt)]
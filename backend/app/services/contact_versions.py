@@ -0,0 +1,77 @@
+# backend/app/services/contact_versions.py
+"""
+Per-owner change versions for contacts.
+
+Every flush that adds, changes or deletes an owner's contacts, or renames
+a tag on them, bumps the owner's row in contact_versions in the same
+transaction. Bulk imports that bypass the ORM bump it themselves. The
+version is shared by all worker processes through the database, so it can
+back the ETags of contact responses: an unchanged version means an
+unchanged address book.
+"""
+from itertools import chain
+from typing import Iterable
+
+from sqlalchemy import event, inspect, select, update
+from sqlalchemy.orm import Session
+
+from ..models.models import Contact, Tag, contact_tags, contact_versions
+
+def get_contact_version(db: Session, owner_id: int) -> int:
+    version = db.scalar(
+        select(contact_versions.c.version).where(contact_versions.c.owner_id == owner_id)
+    )
+    return version or 0
+
+def bump_contact_versions(db: Session, owner_ids: Iterable[int]) -> None:
+    """Increment the owners' versions in the session's transaction."""
+    rows = [{"owner_id": owner_id, "version": 1} for owner_id in sorted(set(owner_ids))]
+    if not rows:
+        return
+
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(contact_versions).on_conflict_do_update(
+            index_elements=[contact_versions.c.owner_id],
+            set_={"version": contact_versions.c.version + 1}
+        )
+        db.execute(stmt, rows)
+        return
+
+    owner_ids = [row["owner_id"] for row in rows]
+    db.execute(
+        update(contact_versions)
+        .where(contact_versions.c.owner_id.in_(owner_ids))
+        .values(version=contact_versions.c.version + 1)
+    )
+    existing = set(db.scalars(
+        select(contact_versions.c.owner_id).where(contact_versions.c.owner_id.in_(owner_ids))
+    ))
+    missing = [row for row in rows if row["owner_id"] not in existing]
+    if missing:
+        db.execute(contact_versions.insert(), missing)
+
+def _tag_owner_ids(db: Session, tag_id: int) -> Iterable[int]:
+    table = Contact.__table__
+    return db.scalars(
+        select(table.c.owner_id).distinct()
+        .join(contact_tags, contact_tags.c.contact_id == table.c.id)
+        .where(contact_tags.c.tag_id == tag_id)
+    )
+
+@event.listens_for(Session, "after_flush")
+def _bump_changed_owners(session: Session, flush_context) -> None:
+    owner_ids = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Contact):
+            owner_ids.add(obj.owner_id)
+            # A contact moved to another owner changes both address books
+            owner_ids.update(inspect(obj).attrs.owner_id.history.deleted)
+        elif isinstance(obj, Tag) and obj not in session.new:
+            owner_ids.update(_tag_owner_ids(session, obj.id))
+    owner_ids.discard(None)
+    bump_contact_versions(session, owner_ids)
@@ -0,0 +1,278 @@
+# backend/app/services/import_jobs.py
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional
+import logging
+import os
+import threading
+import uuid
+
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..db.session import SessionLocal
+from ..models.models import import_jobs as import_jobs_table
+from .vcard_handler import VCardHandler, _ContactImporter
+
+logger = logging.getLogger(__name__)
+
+class _ImportErrors(list):
+    """
+    The first `limit` errors of an import, with a count of all of them, so
+    a file full of bad cards does not grow the stored job state without
+    bound. Parsers only ever append().
+    """
+
+    def __init__(self, limit: int, errors: Iterable[Dict] = (), count: int = 0):
+        super().__init__(errors)
+        self.limit = limit
+        self.count = count
+
+    def append(self, error: Dict) -> None:
+        self.count += 1
+        if len(self) < self.limit:
+            super().append(error)
+
+class ImportJob:
+    """Progress and outcome of a background vCard import."""
+
+    def __init__(
+        self,
+        owner_id: int,
+        path: str,
+        bulk: bool = True,
+        parallel: bool = False,
+        tolerant: bool = True
+    ):
+        self.id = uuid.uuid4().hex
+        self.owner_id = owner_id
+        self.path = path
+        self.bulk = bulk
+        self.parallel = parallel
+        self.tolerant = tolerant
+        self.status = "queued"  # queued, running, completed, failed
+        self.parsed = 0
+        self.imported = 0
+        self.duplicates = 0
+        self.errors = _ImportErrors(settings.IMPORT_JOB_MAX_ERRORS)
+        self.created_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+
+    @classmethod
+    def from_row(cls, row) -> "ImportJob":
+        job = cls(row.owner_id, path="")
+        for field in ("id", "status", "parsed", "imported", "duplicates",
+                      "created_at", "finished_at"):
+            setattr(job, field, getattr(row, field))
+        job.errors = _ImportErrors(settings.IMPORT_JOB_MAX_ERRORS, row.errors, row.error_count)
+        return job
+
+    @property
+    def error_count(self) -> int:
+        return self.errors.count
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def state(self) -> Dict:
+        """The columns stored in the import_jobs table."""
+        return {
+            "status": self.status,
+            "parsed": self.parsed,
+            "imported": self.imported,
+            "duplicates": self.duplicates,
+            "errors": list(self.errors),
+            "error_count": self.errors.count,
+            "finished_at": self.finished_at,
+        }
+
+class ImportJobManager:
+    """
+    Runs vCard imports outside of the request that uploaded them.
+
+    Uploads are spooled to settings.UPLOAD_DIR and processed by a bounded
+    thread pool, each job with its own database session. Job state is
+    stored in the import_jobs table, written when a job starts and when it
+    ends, so clients can poll for progress from any worker process. Jobs
+    that commit in chunks also write their progress inside each chunk's
+    transaction: the import may hold the database's only writer connection,
+    so progress must not be written through a second session meanwhile.
+    Only the most recent settings.IMPORT_JOB_HISTORY finished jobs are
+    retained.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        self._session_factory = session_factory
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def upload_dir(self) -> str:
+        return os.path.join(settings.UPLOAD_DIR, "imports")
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=settings.IMPORT_WORKERS,
+                    thread_name_prefix="vcard-import"
+                )
+            return self._executor
+
+    async def _spool(self, file: UploadFile, path: str) -> None:
+        """Copy an upload to disk in chunks, enforcing the import size limit."""
+        size = 0
+        try:
+            out = await run_in_threadpool(open, path, "wb")
+            try:
+                while True:
+                    chunk = await file.read(settings.UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > settings.IMPORT_MAX_UPLOAD_SIZE:
+                        raise HTTPException(
+                            status_code=413,
+                            detail="Import file too large"
+                        )
+                    await run_in_threadpool(out.write, chunk)
+            finally:
+                await run_in_threadpool(out.close)
+        except BaseException:
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+
+    async def submit(
+        self,
+        file: UploadFile,
+        owner_id: int,
+        bulk: bool = True,
+        parallel: bool = False,
+        tolerant: bool = True
+    ) -> ImportJob:
+        """Spool an upload to disk and queue it for import."""
+        await run_in_threadpool(os.makedirs, self.upload_dir, exist_ok=True)
+        job = ImportJob(
+            owner_id,
+            path="",
+            bulk=bulk,
+            parallel=parallel,
+            tolerant=tolerant
+        )
+        job.path = os.path.join(self.upload_dir, f"{job.id}.vcf")
+        await self._spool(file, job.path)
+        await run_in_threadpool(self._create, job)
+
+        self._get_executor().submit(self._run, job)
+        return job
+
+    def _create(self, job: ImportJob) -> None:
+        with self._session_factory() as db:
+            db.execute(insert(import_jobs_table).values(
+                id=job.id,
+                owner_id=job.owner_id,
+                created_at=job.created_at,
+                **job.state()
+            ))
+            self._prune(db)
+            db.commit()
+
+    @staticmethod
+    def _write_state(db: Session, job: ImportJob) -> None:
+        db.execute(
+            update(import_jobs_table)
+            .where(import_jobs_table.c.id == job.id)
+            .values(**job.state())
+        )
+
+    def _save(self, job: ImportJob) -> None:
+        with self._session_factory() as db:
+            self._write_state(db, job)
+            db.commit()
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        with self._session_factory() as db:
+            row = db.execute(
+                select(import_jobs_table).where(import_jobs_table.c.id == job_id)
+            ).first()
+        return ImportJob.from_row(row) if row is not None else None
+
+    @staticmethod
+    def _prune(db: Session) -> None:
+        kept = (
+            select(import_jobs_table.c.id)
+            .where(import_jobs_table.c.finished_at.is_not(None))
+            .order_by(import_jobs_table.c.finished_at.desc())
+            .limit(settings.IMPORT_JOB_HISTORY)
+        )
+        db.execute(
+            delete(import_jobs_table)
+            .where(import_jobs_table.c.finished_at.is_not(None))
+            .where(import_jobs_table.c.id.not_in(kept.scalar_subquery()))
+        )
+
+    def _run(self, job: ImportJob) -> None:
+        job.status = "running"
+        db = self._session_factory()
+        
+        def record_progress() -> None:
+            # Cards that failed to parse count as parsed too
+            job.parsed = importer.total_processed + job.errors.count
+            job.imported = importer.imported_count
+            job.duplicates = importer.duplicate_count
+            self._write_state(db, job)
+        
+        try:
+            self._save(job)
+            importer = _ContactImporter(
+                db,
+                job.owner_id,
+                bulk=job.bulk,
+                keep_details=False,
+                chunked_commits=job.tolerant or job.parallel,
+                before_commit=record_progress
+            )
+            parsed_contacts = VCardHandler.parse_vcard_file(
+                job.path,
+                parallel=job.parallel,
+                errors=job.errors if job.tolerant or job.parallel else None
+            )
+            for contact_data in parsed_contacts:
+                importer.add(contact_data, validated=job.tolerant or job.parallel)
+            importer.finish()
+            job.parsed = importer.total_processed + job.errors.count
+            job.imported = importer.imported_count
+            job.duplicates = importer.duplicate_count
+            job.status = "completed"
+        except HTTPException as e:
+            db.rollback()
+            job.errors.append({"error": e.detail})
+            job.status = "failed"
+        except Exception as e:
+            db.rollback()
+            logger.exception("Import job %s failed", job.id)
+            job.errors.append({"error": str(e)})
+            job.status = "failed"
+        finally:
+            db.close()
+            job.finished_at = datetime.utcnow()
+            if os.path.exists(job.path):
+                os.remove(job.path)
+            try:
+                self._save(job)
+            except Exception:
+                logger.exception("Failed to record the outcome of import job %s", job.id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs and wait for running imports to finish."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+import_jobs = ImportJobManager()
@@ -0,0 +1,93 @@
+# backend/app/services/tag_cache.py
+"""
+Cache of the tag listing.
+
+Tags change rarely but are listed on nearly every page, so the serialized
+list is kept in memory together with its ETag, tagged with the generation
+it was loaded at. Writes bump the generation, and the next read reloads.
+
+With settings.TAG_CACHE_REDIS_URL the generation counter lives in Redis,
+so a write handled by one worker process invalidates the cache in all of
+them. Without it the counter is per process and only sees this process's
+writes, so entries also expire after settings.TAG_CACHE_TTL seconds, which
+bounds how long other workers serve (and 304) a stale list. If Redis
+cannot be reached, reads bypass the cache rather than risk serving stale
+tags.
+"""
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import logging
+import time
+
+from ..core.config import settings
+from ..core.http_cache import content_etag
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = "tag_cache:generation"
+
+class TagCache:
+    def __init__(self, redis_url: Optional[str] = None):
+        self._redis_url = redis_url
+        self._redis = None
+        self._generation = 0
+        # (generation, loaded at, ETag, tags)
+        self._entry: Optional[Tuple[int, float, str, List[Dict]]] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _get_redis(self):
+        if self._redis is None:
+            import redis.asyncio as redis
+            self._redis = redis.from_url(self._redis_url)
+        return self._redis
+
+    async def generation(self) -> Optional[int]:
+        """The current generation, or None when it cannot be determined."""
+        if not self._redis_url:
+            return self._generation
+        try:
+            value = await self._get_redis().get(GENERATION_KEY)
+        except Exception:
+            logger.warning("Tag cache generation unavailable, bypassing cache", exc_info=True)
+            return None
+        return int(value or 0)
+
+    async def get(self, load: Callable[[], Awaitable[List[Dict]]]) -> Tuple[str, List[Dict]]:
+        """(ETag, tags), calling `load` only when the cache is stale."""
+        # Read the generation before loading: a write that lands during the
+        # load bumps it, so the result is never served as current afterwards
+        generation = await self.generation()
+        entry = self._entry
+        if generation is not None and entry is not None and entry[0] == generation and (
+            self._redis_url or time.monotonic() - entry[1] < settings.TAG_CACHE_TTL
+        ):
+            self.hits += 1
+            return entry[2], entry[3]
+
+        self.misses += 1
+        loaded_at = time.monotonic()
+        tags = await load()
+        etag = content_etag(tags)
+        if generation is not None:
+            self._entry = (generation, loaded_at, etag, tags)
+        return etag, tags
+
+    async def invalidate(self) -> None:
+        """Call after committing a change to tags."""
+        self._generation += 1
+        self._entry = None
+        if self._redis_url:
+            try:
+                await self._get_redis().incr(GENERATION_KEY)
+            except Exception:
+                logger.exception("Failed to invalidate the shared tag cache")
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "shared": bool(self._redis_url)}
+
+    async def close(self) -> None:
+        redis, self._redis = self._redis, None
+        if redis is not None:
+            await redis.close()
+
+tag_cache = TagCache(settings.TAG_CACHE_REDIS_URL)
@@ -0,0 +1,203 @@
+# backend/app/services/typeahead.py
+"""
+In-memory prefix index for contact autocomplete.
+
+Each owner's contacts are loaded on first lookup into a sorted list of
+(normalized key, contact id) pairs, so a prefix lookup is a bisect plus a
+short scan. Contacts written through the ORM are applied incrementally once
+their transaction commits; bulk imports that bypass the ORM invalidate the
+owner instead.
+"""
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import threading
+import time
+import unicodedata
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.models import Contact
+
+def normalize(value: Optional[str]) -> str:
+    """Casefold and strip accents, so "Zoë" is found by "zoe"."""
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+def display_name(first_name: Optional[str], last_name: Optional[str]) -> str:
+    return f"{first_name or ''} {last_name or ''}".strip()
+
+def _index_keys(first_name: Optional[str], last_name: Optional[str], email: Optional[str]) -> Set[str]:
+    keys = set(normalize(display_name(first_name, last_name)).split())
+    email = normalize(email)
+    if email:
+        keys.add(email)
+    return keys
+
+class _OwnerIndex:
+    """Sorted prefix index over one owner's contacts."""
+
+    def __init__(self):
+        self.keys: List[Tuple[str, int]] = []
+        self.names: Dict[int, str] = {}
+        self.contact_keys: Dict[int, Set[str]] = {}
+        self.loaded_at = time.monotonic()
+
+    def load(self, rows: Iterable[Tuple[int, str, str, str]]) -> None:
+        keys = []
+        for contact_id, first_name, last_name, email in rows:
+            contact_keys = _index_keys(first_name, last_name, email)
+            self.names[contact_id] = display_name(first_name, last_name)
+            self.contact_keys[contact_id] = contact_keys
+            keys.extend((key, contact_id) for key in contact_keys)
+        keys.sort()
+        self.keys = keys
+
+    def add(
+        self,
+        contact_id: int,
+        first_name: Optional[str],
+        last_name: Optional[str],
+        email: Optional[str]
+    ) -> None:
+        self.remove(contact_id)
+        contact_keys = _index_keys(first_name, last_name, email)
+        self.names[contact_id] = display_name(first_name, last_name)
+        self.contact_keys[contact_id] = contact_keys
+        for key in contact_keys:
+            insort(self.keys, (key, contact_id))
+
+    def remove(self, contact_id: int) -> None:
+        self.names.pop(contact_id, None)
+        for key in self.contact_keys.pop(contact_id, ()):
+            i = bisect_left(self.keys, (key, contact_id))
+            if i < len(self.keys) and self.keys[i] == (key, contact_id):
+                del self.keys[i]
+
+    def lookup(self, query: str, limit: int) -> List[Tuple[int, str]]:
+        """
+        Contacts with a name word or email starting with every word of
+        `query`, in key order.
+        """
+        words = normalize(query).split()
+        if not words:
+            return []
+
+        # Scan the most selective (longest) word, check all of them per contact
+        first = max(words, key=len)
+        results: List[Tuple[int, str]] = []
+        seen: Set[int] = set()
+        i = bisect_left(self.keys, (first,))
+        while i < len(self.keys) and len(results) < limit:
+            key, contact_id = self.keys[i]
+            if not key.startswith(first):
+                break
+            i += 1
+            if contact_id in seen:
+                continue
+            seen.add(contact_id)
+            contact_keys = self.contact_keys[contact_id]
+            if all(any(k.startswith(word) for k in contact_keys) for word in words):
+                results.append((contact_id, self.names[contact_id]))
+        return results
+
+class TypeaheadIndex:
+    """
+    Per-owner prefix indexes, loaded lazily.
+
+    At most settings.TYPEAHEAD_MAX_OWNERS owners are kept, least recently
+    used first out, and an owner is reloaded after settings.TYPEAHEAD_TTL
+    seconds so changes made by other worker processes show up.
+    """
+
+    def __init__(self):
+        self._owners: "OrderedDict[int, _OwnerIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _load(self, db: Session, owner_id: int) -> _OwnerIndex:
+        table = Contact.__table__
+        rows = db.execute(
+            select(table.c.id, table.c.first_name, table.c.last_name, table.c.email)
+            .where(table.c.owner_id == owner_id)
+        )
+        index = _OwnerIndex()
+        index.load(rows)
+        return index
+
+    def lookup(self, db: Session, owner_id: int, query: str, limit: int = 10) -> List[Tuple[int, str]]:
+        """(id, display name) of the owner's contacts matching `query`."""
+        with self._lock:
+            index = self._owners.get(owner_id)
+            if index is not None and time.monotonic() - index.loaded_at > settings.TYPEAHEAD_TTL:
+                index = None
+            if index is not None:
+                self._owners.move_to_end(owner_id)
+                return index.lookup(query, limit)
+
+        index = self._load(db, owner_id)
+        with self._lock:
+            self._owners[owner_id] = index
+            self._owners.move_to_end(owner_id)
+            while len(self._owners) > settings.TYPEAHEAD_MAX_OWNERS:
+                self._owners.popitem(last=False)
+            return index.lookup(query, limit)
+
+    def contact_saved(
+        self,
+        owner_id: int,
+        contact_id: int,
+        first_name: Optional[str],
+        last_name: Optional[str],
+        email: Optional[str]
+    ) -> None:
+        with self._lock:
+            index = self._owners.get(owner_id)
+            if index is not None:
+                index.add(contact_id, first_name, last_name, email)
+
+    def contact_deleted(self, owner_id: int, contact_id: int) -> None:
+        with self._lock:
+            index = self._owners.get(owner_id)
+            if index is not None:
+                index.remove(contact_id)
+
+    def invalidate(self, owner_id: int) -> None:
+        """Drop an owner's index, e.g. after a bulk import bypassed the ORM."""
+        with self._lock:
+            self._owners.pop(owner_id, None)
+
+typeahead_index = TypeaheadIndex()
+
+# Contacts changed in a session are applied to the index only once it
+# commits. Values are captured at flush time, since the objects are expired
+# by the time the commit hook runs.
+
+_PENDING_KEY = "typeahead_changes"
+
+@event.listens_for(Session, "after_flush")
+def _collect_contact_changes(session: Session, flush_context) -> None:
+    changes = session.info.setdefault(_PENDING_KEY, [])
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Contact):
+            changes.append((
+                False, obj.owner_id, obj.id, obj.first_name, obj.last_name, obj.email
+            ))
+    for obj in session.deleted:
+        if isinstance(obj, Contact):
+            changes.append((True, obj.owner_id, obj.id))
+
+@event.listens_for(Session, "after_commit")
+def _apply_contact_changes(session: Session) -> None:
+    for deleted, owner_id, contact_id, *fields in session.info.pop(_PENDING_KEY, []):
+        if deleted:
+            typeahead_index.contact_deleted(owner_id, contact_id)
+        else:
+            typeahead_index.contact_saved(owner_id, contact_id, *fields)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_contact_changes(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -1,12 +1,658 @@
 # backend/app/services/vcard_handler.py
-from typing import List, Dict, Optional, Tuple
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from difflib import SequenceMatcher
+from functools import lru_cache
+from itertools import chain
+import asyncio
+import codecs
+import heapq
+import multiprocessing
+import os
+import threading
 import vobject
 from fastapi import UploadFile, HTTPException
+from pydantic import ValidationError
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
+from ..core.config import settings
 from ..models.models import Contact, Tag
 from ..schemas.contact import ContactCreate
+from . import vcard_serializer
+from .contact_versions import bump_contact_versions
+from .typeahead import typeahead_index
+
+class _VCardSplitter:
+    """
+    Incrementally split a stream of text lines into individual vCards.
+
+    Only the lines of the card currently being read are buffered, so memory
+    use is bounded by the largest single card rather than the whole file.
+    Cards are returned with the 1-based line number of their BEGIN:VCARD.
+    """
+
+    def __init__(self):
+        self._lines: List[str] = []
+        self._in_card = False
+        self._line_no = 0
+        self._start_line = 0
+
+    def feed(self, line: str) -> Optional[Tuple[int, str]]:
+        """Consume one line (with its line ending); return a card once complete."""
+        self._line_no += 1
+        marker = line.strip().upper()
+        if marker == "BEGIN:VCARD":
+            self._lines = [line]
+            self._in_card = True
+            self._start_line = self._line_no
+            return None
+
+        if not self._in_card:
+            # Ignore anything outside of BEGIN/END blocks
+            return None
+
+        self._lines.append(line)
+        if marker == "END:VCARD":
+            return self._take()
+        return None
+
+    def flush(self) -> Optional[Tuple[int, str]]:
+        """Return a trailing card that was never terminated by END:VCARD."""
+        if self._in_card:
+            return self._take()
+        return None
+
+    def _take(self) -> Tuple[int, str]:
+        card = "".join(self._lines)
+        self._lines = []
+        self._in_card = False
+        return self._start_line, card
+
+# Fields compared when detecting duplicate contacts during import. Both the
+# keys of parsed vCard dicts and the matching Contact columns are checked.
+DUPLICATE_EMAIL_FIELDS = ('email', 'work_email', 'home_email', 'other_email')
+DUPLICATE_PHONE_FIELDS = ('phone', 'mobile_phone', 'home_phone', 'work_phone', 'main_phone')
+
+# Maximum number of ids per IN (...) query
+_DUPLICATE_QUERY_CHUNK = 500
+
+class _DuplicateIndex:
+    """
+    In-memory index of an owner's contacts used to detect duplicates on import.
+
+    Existing contacts are loaded once with a single column-only query instead
+    of one query per card. Every match returns whatever was registered for the
+    key: the id of an existing contact, or the contact dict of an earlier card
+    from the same file.
+    """
+
+    def __init__(self):
+        self._emails: Dict[str, object] = {}
+        self._phones: Dict[str, object] = {}
+        self._names: Dict[Tuple[str, str], object] = {}
+
+    @classmethod
+    def load(cls, db: Session, owner_id: int, batch_size: int = 1000) -> "_DuplicateIndex":
+        """Build an index from the owner's existing contacts."""
+        index = cls()
+        table_columns = Contact.__table__.c
+        fields = [
+            f for f in DUPLICATE_EMAIL_FIELDS + DUPLICATE_PHONE_FIELDS
+            if f in table_columns
+        ]
+        rows = (
+            db.query(
+                Contact.id,
+                Contact.first_name,
+                Contact.last_name,
+                *[table_columns[f] for f in fields]
+            )
+            .filter(Contact.owner_id == owner_id)
+            .yield_per(batch_size)
+        )
+        for row in rows:
+            index.add(row._asdict(), row.id)
+        return index
+
+    @staticmethod
+    def _keys(contact_data: Dict):
+        emails = [
+            contact_data[f].strip().lower()
+            for f in DUPLICATE_EMAIL_FIELDS if contact_data.get(f)
+        ]
+        phones = [
+            contact_data[f].strip()
+            for f in DUPLICATE_PHONE_FIELDS if contact_data.get(f)
+        ]
+        name = None
+        if contact_data.get('first_name') and contact_data.get('last_name'):
+            name = (contact_data['first_name'], contact_data['last_name'])
+        return emails, phones, name
+
+    def match(self, contact_data: Dict) -> Optional[object]:
+        """Return the registered entry for the first matching key, if any."""
+        emails, phones, name = self._keys(contact_data)
+        for email in emails:
+            if email in self._emails:
+                return self._emails[email]
+        for phone in phones:
+            if phone in self._phones:
+                return self._phones[phone]
+        if name is not None and name in self._names:
+            return self._names[name]
+        return None
+
+    def add(self, contact_data: Dict, entry: object) -> None:
+        """Register all keys of a contact, keeping the first entry per key."""
+        emails, phones, name = self._keys(contact_data)
+        for email in emails:
+            self._emails.setdefault(email, entry)
+        for phone in phones:
+            self._phones.setdefault(phone, entry)
+        if name is not None:
+            self._names.setdefault(name, entry)
+
+def _validation_detail(error: ValidationError) -> str:
+    fields = ", ".join(
+        ".".join(str(loc) for loc in e["loc"]) for e in error.errors()
+    )
+    return f"Invalid contact data: {fields}"
+
+def _load_contacts_by_id(db: Session, ids: Iterable[int]) -> Dict[int, Contact]:
+    """Contact rows for `ids`, queried in chunks of _DUPLICATE_QUERY_CHUNK."""
+    ids = list(ids)
+    contacts = {}
+    for start in range(0, len(ids), _DUPLICATE_QUERY_CHUNK):
+        chunk = ids[start:start + _DUPLICATE_QUERY_CHUNK]
+        for contact in db.query(Contact).filter(Contact.id.in_(chunk)):
+            contacts[contact.id] = contact
+    return contacts
+
+class _ContactImporter:
+    """
+    Writes parsed contacts for one import, skipping duplicates.
+
+    Every card is validated against ContactCreate, here or by
+    _try_parse_card, before it is counted or indexed, so an invalid card
+    raises a 400 before anything about it is written. In the default mode every contact is added to the session; in
+    bulk mode accepted contacts are buffered and written with a single Core
+    INSERT ... executemany per batch, bypassing unit-of-work bookkeeping.
+    Both modes commit once at the end, so a failed import writes nothing.
+
+    With `keep_details` disabled only counters are kept, so long-running
+    imports do not accumulate every card in memory. With `chunked_commits`
+    both modes also commit every `batch_size` contacts, so work done before
+    a failure is kept; `before_commit` is then called inside each of those
+    transactions, so callers can record progress on the same connection.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        user_id: int,
+        bulk: bool = False,
+        batch_size: Optional[int] = None,
+        keep_details: bool = True,
+        chunked_commits: bool = False,
+        before_commit: Optional[Callable[[], None]] = None
+    ):
+        self.db = db
+        self.user_id = user_id
+        self.bulk = bulk
+        self.batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        self.keep_details = keep_details
+        self.chunked_commits = chunked_commits
+        self.before_commit = before_commit
+        self.duplicate_index = _DuplicateIndex.load(db, user_id)
+        self.imported: List[Dict] = []
+        self.duplicates: List[Dict] = []
+        self.total_processed = 0
+        self.imported_count = 0
+        self.duplicate_count = 0
+        self._pending: List[Dict] = []
+
+    def add(self, contact_data: Dict, validated: bool = False) -> None:
+        """
+        Import a single parsed card unless it duplicates a known contact.
+
+        Pass `validated` for cards from _try_parse_card, which already hold
+        their ContactCreate values.
+        """
+        if validated:
+            values = {field: contact_data.get(field) for field in ContactCreate.model_fields}
+        else:
+            try:
+                values = ContactCreate(**contact_data).dict()
+            except ValidationError as e:
+                raise HTTPException(status_code=400, detail=_validation_detail(e))
+        
+        self.total_processed += 1
+        existing_contact = self.duplicate_index.match(contact_data)
+        
+        if existing_contact is not None:
+            self.duplicate_count += 1
+            if self.keep_details:
+                self.duplicates.append({
+                    "imported": contact_data,
+                    "existing": existing_contact
+                })
+            return
+        
+        if self.bulk:
+            self._pending.append(dict(values, owner_id=self.user_id))
+        else:
+            self.db.add(Contact(**values, owner_id=self.user_id))
+        
+        self.imported_count += 1
+        if self.keep_details:
+            self.duplicate_index.add(contact_data, contact_data)
+            self.imported.append(contact_data)
+        else:
+            self.duplicate_index.add(contact_data, True)
+        
+        if self.bulk and len(self._pending) >= self.batch_size:
+            self._flush()
+            if self.chunked_commits:
+                self._commit_chunk()
+        elif not self.bulk and self.chunked_commits and self.imported_count % self.batch_size == 0:
+            self._commit_chunk()
+
+    def _commit_chunk(self) -> None:
+        if self.before_commit is not None:
+            self.before_commit()
+        self.db.commit()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        
+        self.db.execute(insert(Contact.__table__), self._pending)
+        # Core inserts bypass the flush that would bump the version
+        bump_contact_versions(self.db, [self.user_id])
+        self._pending = []
+
+    def _resolve_duplicates(self) -> None:
+        """Replace existing-contact ids in duplicate entries with Contact rows."""
+        contacts = _load_contacts_by_id(self.db, {
+            d["existing"] for d in self.duplicates if isinstance(d["existing"], int)
+        })
+        
+        for d in self.duplicates:
+            if isinstance(d["existing"], int):
+                d["existing"] = contacts.get(d["existing"])
+
+    def finish(self) -> Dict:
+        """Write any remaining contacts and return the import summary."""
+        self._flush()
+        self.db.commit()
+        self._resolve_duplicates()
+        if self.bulk:
+            # Bulk inserts bypass the ORM events that keep autocomplete current
+            typeahead_index.invalidate(self.user_id)
+        
+        return {
+            "imported": self.imported,
+            "duplicates": self.duplicates,
+            "total_processed": self.total_processed
+        }
+
+# Similarity above which two contacts are reported as duplicates
+DUPLICATE_SIMILARITY_THRESHOLD = 0.8
+
+# Approximate size of each chunk written by streaming exports
+_EXPORT_CHUNK_SIZE = 64 * 1024
+
+# Below this many candidate pairs, process pool overhead outweighs the gain
+_PARALLEL_MIN_PAIRS = 20000
+
+# Blocks larger than this (a common surname, say) are not compared all
+# against all: each member is only compared with its next _BLOCK_WINDOW
+# members in sorted order, so candidates grow linearly with contacts
+_MAX_BLOCK_SIZE = 50
+_BLOCK_WINDOW = 10
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys('bfpv', '1'),
+    **dict.fromkeys('cgjkqsxz', '2'),
+    **dict.fromkeys('dt', '3'),
+    'l': '4',
+    **dict.fromkeys('mn', '5'),
+    'r': '6',
+}
+
+def _soundex(name: str) -> str:
+    """American Soundex code of a name, e.g. 'Robert' -> 'R163'."""
+    letters = [c for c in name.lower() if 'a' <= c <= 'z']
+    if not letters:
+        return name.lower()
+    
+    code = letters[0].upper()
+    previous = _SOUNDEX_CODES.get(letters[0], '')
+    for c in letters[1:]:
+        digit = _SOUNDEX_CODES.get(c, '')
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # 'h' and 'w' do not separate letters with the same code
+        if c not in 'hw':
+            previous = digit
+    return code.ljust(4, '0')
+
+def _dedupe_record(
+    first_name: Optional[str],
+    last_name: Optional[str],
+    email: Optional[str],
+    phone: Optional[str]
+) -> Tuple[str, str, str, str]:
+    """Normalized (first name, last name, email, phone) used for scoring."""
+    return (
+        (first_name or '').lower(),
+        (last_name or '').lower(),
+        (email or '').lower(),
+        (phone or '').strip(),
+    )
+
+def _blocking_keys(record: Tuple[str, str, str, str]) -> List[str]:
+    """
+    Keys that every likely duplicate of a record shares with it.
+
+    Pairs that have both emails or both phones only pass the threshold when
+    those are equal, so exact email and phone-suffix keys cover them. Pairs
+    compared on names alone need the last names to be close, so they are
+    blocked on the last name's phonetic code, and on the first name's for
+    contacts missing a last name. Soundex keeps the first letter, so a typo
+    there (Smith/Xmith) is caught by a key of the first name's code with
+    the digits of the last name's code, and a typo later in the name by one
+    with the last name's first three letters.
+    """
+    first, last, email, phone = record
+    keys = []
+    if email:
+        keys.append('e:' + email)
+    digits = ''.join(c for c in phone if c.isdigit())
+    if digits:
+        keys.append('p:' + digits[-7:])
+    first_code = _soundex(first) if first else ''
+    if first_code:
+        keys.append('f:' + first_code)
+    if last:
+        last_code = _soundex(last)
+        keys.append('l:' + last_code)
+        if first_code:
+            keys.append('s:' + first_code + '|' + last_code[1:])
+            keys.append('n:' + first_code + '|' + last[:3])
+    return keys
+
+def _candidate_pairs(records: List[Tuple[str, str, str, str]]) -> List[Tuple[int, int]]:
+    """
+    Index pairs (i < j) of records sharing a blocking key.
+
+    Members of blocks over _MAX_BLOCK_SIZE are sorted by (first, last,
+    email, phone) and each is paired with the next _BLOCK_WINDOW only
+    (sorted neighbourhood), so a block contributes at most _BLOCK_WINDOW
+    pairs per member however skewed the names are.
+    """
+    blocks: Dict[str, List[int]] = {}
+    for i, record in enumerate(records):
+        for key in _blocking_keys(record):
+            blocks.setdefault(key, []).append(i)
+    
+    pairs = set()
+    for members in blocks.values():
+        if len(members) <= _MAX_BLOCK_SIZE:
+            for n, i in enumerate(members):
+                for j in members[n + 1:]:
+                    pairs.add((i, j))
+            continue
+        
+        members.sort(key=records.__getitem__)
+        for n, i in enumerate(members):
+            for j in members[n + 1:n + 1 + _BLOCK_WINDOW]:
+                pairs.add((i, j) if i < j else (j, i))
+    return sorted(pairs)
+
+@lru_cache(maxsize=65536)
+def _name_similarity(name1: str, name2: str) -> float:
+    """SequenceMatcher ratio of two names; the same names recur across pairs."""
+    if name1 == name2:
+        return 1.0
+    return SequenceMatcher(None, name1, name2).ratio()
+
+def _similarity(
+    record1: Tuple[str, str, str, str],
+    record2: Tuple[str, str, str, str]
+) -> Optional[float]:
+    """Average per-field similarity of two records, or None if nothing to compare."""
+    first1, last1, email1, phone1 = record1
+    first2, last2, email2, phone2 = record2
+    score = 0
+    total_fields = 0
+    
+    # Compare names
+    if first1 and first2:
+        score += _name_similarity(first1, first2)
+        total_fields += 1
+    
+    if last1 and last2:
+        score += _name_similarity(last1, last2)
+        total_fields += 1
+    
+    # Compare emails
+    if email1 and email2:
+        score += float(email1 == email2)
+        total_fields += 1
+    
+    # Compare phones
+    if phone1 and phone2:
+        score += float(phone1 == phone2)
+        total_fields += 1
+    
+    if total_fields == 0:
+        return None
+    return score / total_fields
+
+def _contact_details_differ(
+    record1: Tuple[str, str, str, str],
+    record2: Tuple[str, str, str, str]
+) -> bool:
+    """
+    Whether both records have an email or a phone and it differs. One
+    mismatched field out of at most four caps the similarity at 0.75, below
+    the threshold, so such pairs need no name comparison.
+    """
+    email1, phone1 = record1[2:]
+    email2, phone2 = record2[2:]
+    return bool(
+        (email1 and email2 and email1 != email2)
+        or (phone1 and phone2 and phone1 != phone2)
+    )
+
+def _score_pair_chunk(
+    pairs: List[Tuple[int, int, Tuple[str, str, str, str], Tuple[str, str, str, str]]],
+    limit: Optional[int] = None
+) -> List[Tuple[int, int, float]]:
+    """
+    Score (i, j, record_i, record_j) pairs and keep those above the threshold.
+
+    Runs in worker processes, so it only receives plain tuples. With a limit,
+    only the chunk's top-k pairs are returned.
+    """
+    duplicates = []
+    for i, j, record1, record2 in pairs:
+        if _contact_details_differ(record1, record2):
+            continue
+        similarity = _similarity(record1, record2)
+        if similarity is not None and similarity > DUPLICATE_SIMILARITY_THRESHOLD:
+            duplicates.append((i, j, similarity))
+    return _top_duplicates(duplicates, limit)
+
+def _duplicate_order(duplicate: Tuple[int, int, float]) -> Tuple[float, int, int]:
+    """Sort key: highest similarity first, ties in pair order."""
+    i, j, similarity = duplicate
+    return (-similarity, i, j)
+
+def _top_duplicates(
+    duplicates: Iterable[Tuple[int, int, float]],
+    limit: Optional[int] = None
+) -> List[Tuple[int, int, float]]:
+    """Order duplicates, keeping only the top `limit` with a heap if given."""
+    if limit is None:
+        return sorted(duplicates, key=_duplicate_order)
+    return heapq.nsmallest(limit, duplicates, key=_duplicate_order)
+
+def _find_duplicate_pairs(
+    records: List[Tuple[str, str, str, str]],
+    parallel: bool = False,
+    limit: Optional[int] = None
+) -> List[Tuple[int, int, float]]:
+    """
+    Score candidate pairs and return (i, j, similarity) sorted by similarity.
+
+    In parallel mode the pairs are split into chunks scored across a process
+    pool, and each chunk's top-k results are merged with a heap.
+    """
+    pairs = _candidate_pairs(records)
+    
+    if not parallel or len(pairs) < _PARALLEL_MIN_PAIRS:
+        return _score_pair_chunk(
+            [(i, j, records[i], records[j]) for i, j in pairs],
+            limit
+        )
+    
+    workers = _dedupe_workers()
+    chunk_size = max(_PARALLEL_MIN_PAIRS // 4, -(-len(pairs) // (workers * 4)))
+    futures = [
+        dedupe_pool.submit(
+            _score_pair_chunk,
+            [(i, j, records[i], records[j]) for i, j in pairs[start:start + chunk_size]],
+            limit
+        )
+        for start in range(0, len(pairs), chunk_size)
+    ]
+    return _top_duplicates(
+        chain.from_iterable(future.result() for future in futures),
+        limit
+    )
+
+def _try_parse_card(card: str) -> Tuple[Optional[Dict], Optional[str]]:
+    """
+    Parse and validate a single card, returning (data, None) or (None, error).
+
+    Besides vCard syntax, the result is checked against ContactCreate so that
+    cards which could not be imported are reported alongside parse failures.
+    The validated values replace the parsed ones, so the importer can take
+    the card with `validated=True` instead of validating it again.
+    """
+    try:
+        contact_data = VCardHandler._parse_card(card)
+    except HTTPException as e:
+        return None, e.detail
+    
+    try:
+        contact = ContactCreate(**contact_data)
+    except ValidationError as e:
+        return None, _validation_detail(e)
+    contact_data.update(contact.dict(exclude_unset=True))
+    return contact_data, None
+
+def _parse_card_batch(cards: List[str]) -> List[Tuple[Optional[Dict], Optional[str]]]:
+    """Parse a batch of raw cards in a worker process, returning (data, error) per card."""
+    return [_try_parse_card(card) for card in cards]
+
+def _batched(items: Iterable, size: int) -> Iterator[List]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _parse_workers() -> int:
+    return settings.IMPORT_PARSE_WORKERS or os.cpu_count() or 1
+
+def _dedupe_workers() -> int:
+    return settings.DEDUPE_WORKERS or os.cpu_count() or 1
+
+def _worker_context() -> multiprocessing.context.BaseContext:
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+class _ProcessPool:
+    """
+    A process pool kept for the life of the application.
+
+    Starting worker processes costs far more than parsing or scoring a
+    batch, so parallel imports and duplicate scans share one pool instead
+    of forking a new one per request. It is created on first use, replaced
+    if a worker process dies, and shut down with the application.
+
+    Workers are started from a forkserver (spawn where that is unavailable),
+    never forked from the application process: it runs the audit writer,
+    password hashing threads and connection pools, and a forked child would
+    inherit their locks in whatever state they were and share its open
+    database connections.
+    """
+
+    def __init__(self, workers: Callable[[], int]):
+        self._workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._workers(),
+                    mp_context=_worker_context()
+                )
+            return self._executor
+
+    def submit(self, fn: Callable, *args: Any) -> Future:
+        executor = self._get_executor()
+        try:
+            return executor.submit(fn, *args)
+        except BrokenProcessPool:
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False)
+            return self._get_executor().submit(fn, *args)
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+parse_pool = _ProcessPool(_parse_workers)
+dedupe_pool = _ProcessPool(_dedupe_workers)
+
+def _collect_batch(
+    results: List[Tuple[Optional[Dict], Optional[str]]],
+    first_index: int,
+    lines: List[int],
+    errors: List[Dict]
+) -> List[Dict]:
+    """Split a parsed batch into contact dicts, recording failed cards in `errors`."""
+    contacts = []
+    for offset, (contact_data, error) in enumerate(results):
+        if error is None:
+            contacts.append(contact_data)
+        else:
+            errors.append({
+                "index": first_index + offset,
+                "line": lines[offset],
+                "error": error
+            })
+    return contacts
 
 class VCardHandler:
     """Handler for VCard import and export operations."""
@@ -76,267 +722,457 @@ class VCardHandler:
         return addresses
 
     @staticmethod
-    def parse_vcard(vcard_content: str) -> List[Dict]:
-        """Parse VCard content and return a list of contact dictionaries."""
-        contacts = []
+    def _parse_card(card: str) -> Dict:
+        """Parse a single vCard and return a contact dictionary."""
+        try:
+            vcard = vobject.readOne(card)
+            contact_data = {}
+            
+            # Basic information
+            if hasattr(vcard, 'n') and vcard.n.value:
+                contact_data['last_name'] = vcard.n.value.family
+                contact_data['first_name'] = vcard.n.value.given
+            
+            if hasattr(vcard, 'org') and vcard.org.value:
+                contact_data['company'] = vcard.org.value[0]
+            
+            # Parse phones, emails, and addresses
+            contact_data.update(VCardHandler._parse_phone_numbers(vcard))
+            contact_data.update(VCardHandler._parse_emails(vcard))
+            contact_data.update(VCardHandler._parse_addresses(vcard))
+            
+            # Handle birthday
+            if hasattr(vcard, 'bday'):
+                try:
+                    contact_data['birthday'] = datetime.strptime(
+                        vcard.bday.value,
+                        "%Y-%m-%d"
+                    )
+                except ValueError:
+                    pass
+            
+            # Handle photo
+            if hasattr(vcard, 'photo'):
+                try:
+                    photo_data = vcard.photo.value
+                    if len(photo_data) <= 5 * 1024 * 1024:  # 5MB limit
+                        contact_data['photo'] = photo_data
+                except Exception:
+                    pass
+            
+            # Handle notes
+            if hasattr(vcard, 'note'):
+                contact_data['notes'] = vcard.note.value
+            
+            # Handle URLs
+            if hasattr(vcard, 'url'):
+                for url in vcard.url_list:
+                    if 'linkedin' in url.value.lower():
+                        contact_data['linkedin'] = url.value
+                    elif 'facebook' in url.value.lower():
+                        contact_data['facebook'] = url.value
+                    else:
+                        contact_data['homepage'] = url.value
+            
+            return contact_data
+            
+        except Exception as e:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Error parsing vCard: {str(e)}"
+            )
+
+    @staticmethod
+    def _iter_cards(lines: Iterable[str]) -> Iterator[Tuple[int, str]]:
+        """Split text lines into (start line, vCard string) pairs."""
+        splitter = _VCardSplitter()
+        for line in lines:
+            card = splitter.feed(line)
+            if card is not None:
+                yield card
+        card = splitter.flush()
+        if card is not None:
+            yield card
+
+    @staticmethod
+    def split_vcards(lines: Iterable[str]) -> Iterator[str]:
+        """Split an iterable of text lines into individual vCard strings."""
+        for _, card in VCardHandler._iter_cards(lines):
+            yield card
+
+    @staticmethod
+    async def _iter_upload_lines(
+        file: UploadFile,
+        chunk_size: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """Read an upload in fixed-size chunks and yield decoded text lines."""
+        chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        pending = ''
         
-        # Split content into individual vcards if multiple exist
-        vcard_parts = vcard_content.split("BEGIN:VCARD")
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+            
+            lines = (pending + decoder.decode(chunk)).splitlines(keepends=True)
+            # The last line may continue in the next chunk (including a
+            # CRLF split across the boundary), so hold it back.
+            pending = lines.pop() if lines else ''
+            for line in lines:
+                yield line
         
-        for part in vcard_parts:
-            if not part.strip():
+        pending += decoder.decode(b'', final=True)
+        if pending:
+            yield pending
+
+    @staticmethod
+    async def _iter_upload_cards(
+        file: UploadFile,
+        chunk_size: Optional[int] = None
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """Stream an upload and yield (start line, vCard string) pairs."""
+        splitter = _VCardSplitter()
+        async for line in VCardHandler._iter_upload_lines(file, chunk_size):
+            card = splitter.feed(line)
+            if card is not None:
+                yield card
+        card = splitter.flush()
+        if card is not None:
+            yield card
+
+    @staticmethod
+    async def iter_upload_vcards(
+        file: UploadFile,
+        chunk_size: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """Stream an upload and yield one raw vCard string at a time."""
+        async for _, card in VCardHandler._iter_upload_cards(file, chunk_size):
+            yield card
+
+    @staticmethod
+    def _parse_cards_tolerant(
+        cards: Iterable[Tuple[int, str]],
+        errors: List[Dict]
+    ) -> Iterator[Dict]:
+        """Parse (line, card) pairs, recording failures in `errors` and moving on."""
+        for index, (line, card) in enumerate(cards):
+            contact_data, error = _try_parse_card(card)
+            if error is None:
+                yield contact_data
+            else:
+                errors.append({"index": index, "line": line, "error": error})
+
+    @staticmethod
+    async def parse_vcard_stream(
+        file: UploadFile,
+        chunk_size: Optional[int] = None,
+        errors: Optional[List[Dict]] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Stream an upload and yield one contact dictionary per vCard.
+
+        By default the first invalid card raises HTTPException(400). When an
+        `errors` list is given, the parser is tolerant: each failed card is
+        recorded as {"index", "line", "error"} and parsing continues.
+        """
+        index = 0
+        async for line, card in VCardHandler._iter_upload_cards(file, chunk_size):
+            if errors is None:
+                yield VCardHandler._parse_card(card)
                 continue
-                
-            try:
-                vcard = vobject.readOne("BEGIN:VCARD" + part)
-                contact_data = {}
-                
-                # Basic information
-                if hasattr(vcard, 'n') and vcard.n.value:
-                    contact_data['last_name'] = vcard.n.value.family
-                    contact_data['first_name'] = vcard.n.value.given
-                
-                if hasattr(vcard, 'org') and vcard.org.value:
-                    contact_data['company'] = vcard.org.value[0]
-                
-                # Parse phones, emails, and addresses
-                contact_data.update(VCardHandler._parse_phone_numbers(vcard))
-                contact_data.update(VCardHandler._parse_emails(vcard))
-                contact_data.update(VCardHandler._parse_addresses(vcard))
-                
-                # Handle birthday
-                if hasattr(vcard, 'bday'):
-                    try:
-                        contact_data['birthday'] = datetime.strptime(
-                            vcard.bday.value,
-                            "%Y-%m-%d"
-                        )
-                    except ValueError:
-                        pass
-                
-                # Handle photo
-                if hasattr(vcard, 'photo'):
-                    try:
-                        photo_data = vcard.photo.value
-                        if len(photo_data) <= 5 * 1024 * 1024:  # 5MB limit
-                            contact_data['photo'] = photo_data
-                    except Exception:
-                        pass
-                
-                # Handle notes
-                if hasattr(vcard, 'note'):
-                    contact_data['notes'] = vcard.note.value
-                
-                # Handle URLs
-                if hasattr(vcard, 'url'):
-                    for url in vcard.url_list:
-                        if 'linkedin' in url.value.lower():
-                            contact_data['linkedin'] = url.value
-                        elif 'facebook' in url.value.lower():
-                            contact_data['facebook'] = url.value
-                        else:
-                            contact_data['homepage'] = url.value
-                
-                contacts.append(contact_data)
-                
-            except Exception as e:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Error parsing vCard: {str(e)}"
-                )
-        
-        return contacts
+            
+            contact_data, error = _try_parse_card(card)
+            if error is None:
+                yield contact_data
+            else:
+                errors.append({"index": index, "line": line, "error": error})
+            index += 1
 
     @staticmethod
-    def _check_duplicate(db: Session, contact_data: Dict) -> Optional[Contact]:
-        """Check for duplicate contacts."""
-        queries = []
-        
-        # Check emails
-        for email_field in ['email', 'work_email', 'home_email', 'other_email']:
-            if contact_data.get(email_field):
-                queries.append(getattr(Contact, email_field) == contact_data[email_field])
+    def parse_vcards_parallel(
+        cards: Iterable[Tuple[int, str]],
+        errors: List[Dict],
+        batch_size: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """
+        Parse (line, card) pairs in batches across a process pool.
+
+        Contact dictionaries are yielded in the original card order. Cards that
+        fail to parse are appended to `errors` as {"index", "line", "error"}
+        instead of aborting the whole import. Only a few batches per worker are
+        in flight at a time, so memory stays bounded for large files. Batches
+        run on the shared parse_pool.
+        """
+        workers = _parse_workers()
+        batch_size = batch_size or settings.IMPORT_PARSE_BATCH_SIZE
+        pending = deque()
+        first_index = 0
         
-        # Check phones
-        for phone_field in ['mobile_phone', 'home_phone', 'work_phone', 'main_phone']:
-            if contact_data.get(phone_field):
-                queries.append(getattr(Contact, phone_field) == contact_data[phone_field])
+        try:
+            for batch in _batched(cards, batch_size):
+                lines = [line for line, _ in batch]
+                future = parse_pool.submit(_parse_card_batch, [card for _, card in batch])
+                pending.append((first_index, lines, future))
+                first_index += len(batch)
+                if len(pending) >= workers * 2:
+                    index, lines, future = pending.popleft()
+                    yield from _collect_batch(future.result(), index, lines, errors)
+            
+            while pending:
+                index, lines, future = pending.popleft()
+                yield from _collect_batch(future.result(), index, lines, errors)
+        finally:
+            # Abandoned imports leave no queued batches behind
+            for _, _, future in pending:
+                future.cancel()
+
+    @staticmethod
+    async def parse_vcard_stream_parallel(
+        file: UploadFile,
+        errors: List[Dict],
+        batch_size: Optional[int] = None
+    ) -> AsyncIterator[Dict]:
+        """Async counterpart of parse_vcards_parallel for streamed uploads."""
+        workers = _parse_workers()
+        batch_size = batch_size or settings.IMPORT_PARSE_BATCH_SIZE
+        pending = deque()
+        first_index = 0
+        batch = []
         
-        # Check name
-        if contact_data.get('first_name') and contact_data.get('last_name'):
-            queries.append(
-                (Contact.first_name == contact_data['first_name']) &
-                (Contact.last_name == contact_data['last_name'])
+        try:
+            async for line, card in VCardHandler._iter_upload_cards(file):
+                batch.append((line, card))
+                if len(batch) < batch_size:
+                    continue
+                lines = [line for line, _ in batch]
+                future = parse_pool.submit(_parse_card_batch, [card for _, card in batch])
+                pending.append((first_index, lines, future))
+                first_index += len(batch)
+                batch = []
+                if len(pending) >= workers * 2:
+                    index, lines, future = pending.popleft()
+                    for contact_data in _collect_batch(
+                        await asyncio.wrap_future(future), index, lines, errors
+                    ):
+                        yield contact_data
+            
+            if batch:
+                lines = [line for line, _ in batch]
+                future = parse_pool.submit(_parse_card_batch, [card for _, card in batch])
+                pending.append((first_index, lines, future))
+            while pending:
+                index, lines, future = pending.popleft()
+                for contact_data in _collect_batch(
+                    await asyncio.wrap_future(future), index, lines, errors
+                ):
+                    yield contact_data
+        finally:
+            for _, _, future in pending:
+                future.cancel()
+
+    @staticmethod
+    def parse_vcard_file(
+        path: str,
+        parallel: bool = False,
+        errors: Optional[List[Dict]] = None
+    ) -> Iterator[Dict]:
+        """
+        Stream a vCard file from disk and yield one contact dictionary per card.
+
+        Passing an `errors` list makes parsing tolerant (see
+        parse_vcard_stream). With `parallel`, cards are parsed in a process
+        pool, which is always tolerant.
+        """
+        # newline='' keeps original line endings so cards are passed through as-is
+        with open(path, encoding='utf-8', errors='ignore', newline='') as f:
+            cards = VCardHandler._iter_cards(f)
+            if parallel:
+                yield from VCardHandler.parse_vcards_parallel(
+                    cards,
+                    errors if errors is not None else []
+                )
+            elif errors is not None:
+                yield from VCardHandler._parse_cards_tolerant(cards, errors)
+            else:
+                for _, card in cards:
+                    yield VCardHandler._parse_card(card)
+
+    @staticmethod
+    def parse_vcard(vcard_content: str) -> List[Dict]:
+        """Parse VCard content and return a list of contact dictionaries."""
+        return [
+            VCardHandler._parse_card(card)
+            for card in VCardHandler.split_vcards(
+                vcard_content.splitlines(keepends=True)
             )
-        
-        if not queries:
-            return None
-        
-        return db.query(Contact).filter(or_(*queries)).first()
+        ]
 
     @staticmethod
     async def import_contacts(
         db: Session,
         file: UploadFile,
         user_id: int,
-        preview_only: bool = False
+        preview_only: bool = False,
+        bulk: bool = False,
+        batch_size: Optional[int] = None,
+        parallel: bool = False,
+        tolerant: bool = False
     ) -> Dict:
-        """Import contacts from a VCard file."""
-        content = await file.read()
-        vcard_content = content.decode('utf-8', errors='ignore')
-        
-        parsed_contacts = VCardHandler.parse_vcard(vcard_content)
+        """
+        Import contacts from a VCard file.
+
+        The upload is parsed as a stream, one card at a time, so the whole
+        file is never held in memory. With `bulk`, accepted contacts are
+        inserted in batches of `batch_size` (default
+        settings.IMPORT_BATCH_SIZE) with Core INSERTs. Either way the import
+        is committed once at the end, so an invalid card writes nothing.
+
+        With `tolerant`, cards that fail to parse or validate are reported
+        under "errors" with their index and line number instead of aborting
+        the import, and valid contacts are committed every `batch_size`
+        cards. `parallel` parses cards in a process pool and is always
+        tolerant.
+        """
+        errors: List[Dict] = []
+        if parallel:
+            parsed_contacts = VCardHandler.parse_vcard_stream_parallel(file, errors)
+        else:
+            parsed_contacts = VCardHandler.parse_vcard_stream(
+                file,
+                errors=errors if tolerant else None
+            )
         
         if preview_only:
+            preview = [contact_data async for contact_data in parsed_contacts]
             return {
-                "preview": parsed_contacts,
-                "total": len(parsed_contacts)
+                "preview": preview,
+                "total": len(preview),
+                "errors": errors
             }
         
-        imported = []
-        duplicates = []
+        importer = _ContactImporter(
+            db,
+            user_id,
+            bulk=bulk,
+            batch_size=batch_size,
+            chunked_commits=tolerant or parallel
+        )
+        async for contact_data in parsed_contacts:
+            importer.add(contact_data, validated=tolerant or parallel)
         
-        for contact_data in parsed_contacts:
-            existing_contact = VCardHandler._check_duplicate(db, contact_data)
-            
-            if existing_contact:
-                duplicates.append({
-                    "imported": contact_data,
-                    "existing": existing_contact
-                })
-                continue
-            
-            contact = ContactCreate(**contact_data)
-            db_contact = Contact(**contact.dict(), created_by=user_id)
-            db.add(db_contact)
-            imported.append(contact_data)
+        result = importer.finish()
+        result["errors"] = errors
+        return result
+
+# backend/app/services/vcard_handler.py (continued...)
+
+    @staticmethod
+    def _build_vcard(contact: Contact, rev: Optional[str] = None) -> vobject.vCard:
+        """
+        Build a vobject vCard for a single contact.
+
+        Exports use the faster vcard_serializer; this is kept as the reference
+        implementation its output is checked and benchmarked against.
+        """
+        vcard = vobject.vCard()
         
-        db.commit()
+        # Add name
+        vcard.add('n')
+        vcard.n.value = vobject.vcard.Name(
+            family=contact.last_name or '',
+            given=contact.first_name or ''
+        )
         
-        return {
-            "imported": imported,
-            "duplicates": duplicates,
-            "total_processed": len(parsed_contacts)
-        }
+        # Add formatted name
+        vcard.add('fn')
+        vcard.fn.value = f"{contact.first_name} {contact.last_name}".strip()
+        
+        # Add phone number
+        if contact.phone:
+            tel = vcard.add('tel')
+            tel.value = contact.phone
+        
+        # Add email address
+        if contact.email:
+            email = vcard.add('email')
+            email.value = contact.email
+            email.type_param = ['HOME']
+        
+        # Add address
+        if contact.address:
+            adr = vcard.add('adr')
+            adr.value = vobject.vcard.Address(street=contact.address)
+            adr.type_param = ['HOME']
+        
+        # Add photo
+        photo_data = getattr(contact, 'photo', None)
+        if photo_data:
+            photo = vcard.add('photo')
+            photo.value = photo_data
+            photo.encoding_param = 'b'
+            photo.type_param = ['JPEG']
+        
+        # Add notes
+        if contact.notes:
+            note = vcard.add('note')
+            note.value = contact.notes
+        
+        # Add revision timestamp
+        rev_line = vcard.add('rev')
+        rev_line.value = rev or datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+        
+        return vcard
 
-# backend/app/services/vcard_handler.py (continued...)
+    @staticmethod
+    def serialize_contact(contact: Contact, rev: Optional[str] = None) -> str:
+        """Serialize a single contact to VCard format."""
+        return vcard_serializer.serialize_contact(contact, rev=rev)
 
     @staticmethod
     def export_contacts(contacts: List[Contact]) -> str:
         """Export contacts to VCard format."""
-        output = []
+        rev = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+        return "\n".join(
+            VCardHandler.serialize_contact(contact, rev=rev) for contact in contacts
+        )
+
+    @staticmethod
+    def iter_export(
+        db: Session,
+        owner_id: int,
+        tag: Optional[str] = None,
+        batch_size: Optional[int] = None
+    ) -> Iterator[str]:
+        """
+        Stream an owner's contacts in VCard format.
+
+        Rows are fetched `batch_size` at a time (default
+        settings.EXPORT_BATCH_SIZE) and serialized cards are yielded in chunks
+        of roughly _EXPORT_CHUNK_SIZE characters, so memory use does not grow
+        with the number of contacts.
+        """
+        query = db.query(Contact).filter(Contact.owner_id == owner_id)
+        if tag:
+            query = query.join(Contact.tags).filter(Tag.name == tag)
         
+        rev = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+        buffer = []
+        buffered = 0
+        contacts = query.order_by(Contact.id).yield_per(
+            batch_size or settings.EXPORT_BATCH_SIZE
+        )
         for contact in contacts:
-            vcard = vobject.vCard()
-            
-            # Add name
-            vcard.add('n')
-            vcard.n.value = vobject.vcard.Name(
-                family=contact.last_name or '',
-                given=contact.first_name or ''
-            )
-            
-            # Add formatted name
-            vcard.add('fn')
-            vcard.fn.value = f"{contact.first_name} {contact.last_name}".strip()
-            
-            # Add organization
-            if contact.company:
-                vcard.add('org')
-                vcard.org.value = [contact.company]
-            
-            # Add phone numbers
-            if contact.mobile_phone:
-                tel = vcard.add('tel')
-                tel.value = contact.mobile_phone
-                tel.type_param = ['CELL']
-                
-            if contact.home_phone:
-                tel = vcard.add('tel')
-                tel.value = contact.home_phone
-                tel.type_param = ['HOME']
-                
-            if contact.work_phone:
-                tel = vcard.add('tel')
-                tel.value = contact.work_phone
-                tel.type_param = ['WORK']
-                
-            if contact.main_phone:
-                tel = vcard.add('tel')
-                tel.value = contact.main_phone
-                tel.type_param = ['MAIN']
-                
-            if contact.other_phone:
-                tel = vcard.add('tel')
-                tel.value = contact.other_phone
-                tel.type_param = ['OTHER']
-            
-            # Add email addresses
-            if contact.email:
-                email = vcard.add('email')
-                email.value = contact.email
-                email.type_param = ['HOME']
-                
-            if contact.work_email:
-                email = vcard.add('email')
-                email.value = contact.work_email
-                email.type_param = ['WORK']
-                
-            if contact.other_email:
-                email = vcard.add('email')
-                email.value = contact.other_email
-                email.type_param = ['OTHER']
-            
-            # Add addresses
-            if contact.home_address:
-                adr = vcard.add('adr')
-                adr.value = vobject.vcard.Address(street=contact.home_address)
-                adr.type_param = ['HOME']
-                
-            if contact.work_address:
-                adr = vcard.add('adr')
-                adr.value = vobject.vcard.Address(street=contact.work_address)
-                adr.type_param = ['WORK']
-            
-            # Add birthday
-            if contact.birthday:
-                bday = vcard.add('bday')
-                bday.value = contact.birthday.strftime("%Y-%m-%d")
-            
-            # Add photo
-            if contact.photo:
-                photo = vcard.add('photo')
-                photo.value = contact.photo
-                photo.encoding_param = 'b'
-                photo.type_param = ['JPEG']
-            
-            # Add notes
-            if contact.notes:
-                note = vcard.add('note')
-                note.value = contact.notes
-            
-            # Add URLs
-            if contact.homepage:
-                url = vcard.add('url')
-                url.value = contact.homepage
-                
-            if contact.linkedin:
-                url = vcard.add('url')
-                url.value = contact.linkedin
-                url.type_param = ['linkedin']
-                
-            if contact.facebook:
-                url = vcard.add('url')
-                url.value = contact.facebook
-                url.type_param = ['facebook']
-            
-            # Add revision timestamp
-            rev = vcard.add('rev')
-            rev.value = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
-            
-            output.append(vcard.serialize())
+            card = VCardHandler.serialize_contact(contact, rev=rev)
+            buffer.append(card)
+            buffered += len(card)
+            if buffered >= _EXPORT_CHUNK_SIZE:
+                yield "".join(buffer)
+                buffer = []
+                buffered = 0
         
-        return "\n".join(output)
+        if buffer:
+            yield "".join(buffer)
 
     @staticmethod
     def merge_contacts(
@@ -378,53 +1214,38 @@ class VCardHandler:
         return target
 
     @staticmethod
-    def find_duplicates(db: Session, user_id: int) -> List[Tuple[Contact, Contact, float]]:
+    def find_duplicates(
+        db: Session,
+        user_id: int,
+        parallel: bool = False,
+        limit: Optional[int] = None
+    ) -> List[Tuple[Contact, Contact, float]]:
         """
         Find potential duplicate contacts based on similarity.
         Returns a list of tuples (contact1, contact2, similarity_score).
+
+        Only pairs that share a blocking key (see _blocking_keys) are scored,
+        so contacts with nothing in common are never compared. With
+        `parallel`, scoring is spread across the shared dedupe_pool of
+        settings.DEDUPE_WORKERS processes; `limit` keeps only the top matches.
         """
-        from difflib import SequenceMatcher
+        rows = db.query(
+            Contact.id,
+            Contact.first_name,
+            Contact.last_name,
+            Contact.email,
+            Contact.phone
+        ).filter(Contact.owner_id == user_id).all()
+        records = [_dedupe_record(*row[1:]) for row in rows]
         
-        contacts = db.query(Contact).filter(Contact.created_by == user_id).all()
-        duplicates = []
+        matches = _find_duplicate_pairs(records, parallel=parallel, limit=limit)
         
-        for i, contact1 in enumerate(contacts):
-            for contact2 in contacts[i+1:]:
-                score = 0
-                total_fields = 0
-                
-                # Compare names
-                if contact1.first_name and contact2.first_name:
-                    score += SequenceMatcher(
-                        None, 
-                        contact1.first_name.lower(), 
-                        contact2.first_name.lower()
-                    ).ratio()
-                    total_fields += 1
-                
-                if contact1.last_name and contact2.last_name:
-                    score += SequenceMatcher(
-                        None, 
-                        contact1.last_name.lower(), 
-                        contact2.last_name.lower()
-                    ).ratio()
-                    total_fields += 1
-                
-                # Compare emails
-                if contact1.email and contact2.email:
-                    score += float(contact1.email.lower() == contact2.email.lower())
-                    total_fields += 1
-                
-                # Compare phones
-                if contact1.mobile_phone and contact2.mobile_phone:
-                    score += float(
-                        contact1.mobile_phone.strip() == contact2.mobile_phone.strip()
-                    )
-                    total_fields += 1
-                
-                if total_fields > 0:
-                    similarity = score / total_fields
-                    if similarity > 0.8:  # Threshold for considering as duplicate
-                        duplicates.append((contact1, contact2, similarity))
+        # Only load full rows for contacts that are part of a match
+        contacts = _load_contacts_by_id(
+            db, {rows[k].id for i, j, _ in matches for k in (i, j)}
+        )
         
-        return sorted(duplicates, key=lambda x: x[2], reverse=True)
+        return [
+            (contacts[rows[i].id], contacts[rows[j].id], similarity)
+            for i, j, similarity in matches
+        ]
@@ -0,0 +1,127 @@
+"""
+Benchmark duplicate detection with and without blocking.
+
+Runs against synthetic in-memory records, so no database is needed:
+
+    python -m benchmarks.find_duplicates
+    python -m benchmarks.find_duplicates --sizes 1000 10000 100000 --naive-limit 3000
+    python -m benchmarks.find_duplicates --parallel
+
+"candidates" counts the pairs blocking passes on for scoring, which
+should grow linearly, and "pairs" the duplicates reported. "planted" is
+the share of the generated near-duplicates found, and "recall" the share
+of the all-pairs scan's matches found. With skewed surnames, the scan
+also matches every contact sharing a common first and last name, so its
+result grows quadratically and blocking cannot keep all of it.
+"""
+import argparse
+import itertools
+import random
+import string
+import time
+
+from app.services.vcard_handler import (
+    DUPLICATE_SIMILARITY_THRESHOLD,
+    _candidate_pairs,
+    _find_duplicate_pairs,
+    _similarity,
+)
+
+FIRST_NAMES = [
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael",
+    "Linda", "William", "Elizabeth", "David", "Barbara", "Richard", "Susan",
+    "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen",
+]
+
+# Distinct surnames to draw from; real address books are dominated by a
+# few common surnames, so they are drawn with Zipf weights (rank ** -1)
+SURNAMES = 5000
+
+def _random_last_name(rng: random.Random) -> str:
+    length = rng.randint(4, 9)
+    return rng.choice(string.ascii_uppercase) + "".join(
+        rng.choice(string.ascii_lowercase) for _ in range(length)
+    )
+
+def _surname_pool(rng: random.Random):
+    names = [_random_last_name(rng).lower() for _ in range(SURNAMES)]
+    weights = [1 / rank for rank in range(1, SURNAMES + 1)]
+    return names, list(itertools.accumulate(weights))
+
+def make_records(count: int, duplicate_rate: float = 0.05, seed: int = 42):
+    """
+    Synthetic (first, last, email, phone) records with Zipf-distributed
+    surnames and a few contacts missing one of their names, and the index
+    pairs of the near-duplicates planted among them.
+    """
+    rng = random.Random(seed)
+    surnames, cum_weights = _surname_pool(rng)
+    records = []
+    planted = []
+    for _ in range(count):
+        if records and rng.random() < duplicate_rate:
+            original = rng.randrange(len(records))
+            first, last, email, phone = records[original]
+            planted.append((original, len(records)))
+            records.append((first, last[:-1] + "e" if last else last, email, phone))
+            continue
+        first = rng.choice(FIRST_NAMES).lower()
+        last = rng.choices(surnames, cum_weights=cum_weights)[0]
+        missing = rng.random()
+        if missing < 0.02:
+            first = ""
+        elif missing < 0.04:
+            last = ""
+        email = f"{first}.{last}{rng.randint(0, 999)}@example.com" if rng.random() < 0.7 else ""
+        phone = f"+1{rng.randint(2000000000, 9999999999)}" if rng.random() < 0.6 else ""
+        records.append((first, last, email, phone))
+    return records, planted
+
+def naive_pairs(records):
+    """The previous all-pairs scan, for comparison."""
+    duplicates = []
+    for i, record1 in enumerate(records):
+        for j in range(i + 1, len(records)):
+            similarity = _similarity(record1, records[j])
+            if similarity is not None and similarity > DUPLICATE_SIMILARITY_THRESHOLD:
+                duplicates.append((i, j, similarity))
+    return sorted(duplicates, key=lambda x: x[2], reverse=True)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--naive-limit", type=int, default=3000,
+                        help="largest size to also run the all-pairs scan for")
+    parser.add_argument("--parallel", action="store_true",
+                        help="score candidate pairs across a process pool")
+    args = parser.parse_args()
+
+    print(
+        f"{'contacts':>10} {'candidates':>11} {'blocked s':>10} {'us/contact':>11} "
+        f"{'pairs':>8} {'planted':>8} {'naive s':>9} {'recall':>7}"
+    )
+    for size in args.sizes:
+        records, planted = make_records(size)
+        candidates = len(_candidate_pairs(records))
+
+        start = time.perf_counter()
+        blocked = _find_duplicate_pairs(records, parallel=args.parallel)
+        blocked_time = time.perf_counter() - start
+        found = {(i, j) for i, j, _ in blocked}
+        planted_recall = sum(pair in found for pair in planted) / len(planted)
+
+        naive_time = recall = ""
+        if size <= args.naive_limit:
+            start = time.perf_counter()
+            expected = naive_pairs(records)
+            naive_time = f"{time.perf_counter() - start:.2f}"
+            hits = sum((i, j) in found for i, j, _ in expected)
+            recall = f"{hits / len(expected):.3f}" if expected else "n/a"
+
+        print(
+            f"{size:>10} {candidates:>11} {blocked_time:>10.2f} {blocked_time / size * 1e6:>11.1f} "
+            f"{len(blocked):>8} {planted_recall:>8.3f} {naive_time:>9} {recall:>7}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark the fast vCard serializer against the vobject-based one.
+
+Uses synthetic in-memory contacts, so no database is needed:
+
+    python -m benchmarks.vcard_export
+    python -m benchmarks.vcard_export --count 50000
+"""
+import argparse
+import random
+import time
+from types import SimpleNamespace
+
+from app.services import vcard_serializer
+from app.services.vcard_handler import VCardHandler
+
+REV = "20240101T000000Z"
+
+def make_contacts(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    contacts = []
+    for n in range(count):
+        contacts.append(SimpleNamespace(
+            first_name=f"First{n}",
+            last_name=rng.choice(["Smith", "Müller", "O'Brien, Jr.", "Nguyen"]),
+            email=f"user{n}@example.com",
+            phone=f"+1 555 {rng.randint(1000, 9999)}" if rng.random() < 0.8 else None,
+            address="1 Main St, Springfield; IL" if rng.random() < 0.5 else None,
+            notes="Met at the conference.\nFollow up next week. " * rng.randint(0, 4) or None,
+        ))
+    return contacts
+
+def _time(serialize, contacts):
+    start = time.perf_counter()
+    output = [serialize(contact) for contact in contacts]
+    return time.perf_counter() - start, output
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=10000)
+    args = parser.parse_args()
+
+    contacts = make_contacts(args.count)
+    vobject_time, expected = _time(
+        lambda c: VCardHandler._build_vcard(c, rev=REV).serialize(), contacts
+    )
+    fast_time, actual = _time(
+        lambda c: vcard_serializer.serialize_contact(c, rev=REV), contacts
+    )
+
+    print(f"contacts:  {args.count}")
+    print(f"vobject:   {vobject_time:.2f}s ({vobject_time / args.count * 1e6:.1f} us/contact)")
+    print(f"fast path: {fast_time:.2f}s ({fast_time / args.count * 1e6:.1f} us/contact)")
+    print(f"speedup:   {vobject_time / fast_time:.1f}x")
+    print(f"identical: {actual == expected}")
+
+if __name__ == "__main__":
+    main()
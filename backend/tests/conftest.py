@@ -1,17 +1,21 @@
 # backend/tests/conftest.py
 import os
 import pytest
-from typing import Generator
+from typing import AsyncGenerator, Dict, Generator
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
 
 # Set environment variables first
 os.environ.update({
     "TESTING": "true",
     "DATABASE_URL": "sqlite:///:memory:",
     "SECRET_KEY": "test-secret-key",
+    "AUDIT_SYNC": "true",
+    "AUTH_CACHE_TTL": "0",
+    "PASSWORD_HASH_CALIBRATE": "false",
     "BACKEND_CORS_ORIGINS": '["http://localhost:3000","http://localhost:8000"]'
 })
 
@@ -19,16 +23,27 @@ os.environ.update({
 from app.db.base import Base
 
 # Then import other dependencies
-from app.db.session import get_db
+from app.core.security import create_access_token, get_password_hash
+from app.core.dependencies import get_read_db
+from app.db.session import async_database_url, get_async_db, get_db
+from app.api import contacts as contacts_api
 from app.main import app
 from app.models.models import User, Contact, Tag
+from app.services.import_jobs import import_jobs
+
+TEST_PASSWORD = "Test1234!@#$"
+
+# Tests share a database file, since the async routers and the synchronous
+# fixtures cannot share an in-memory database
+@pytest.fixture(scope="session")
+def database_url(tmp_path_factory) -> str:
+    return f"sqlite:///{tmp_path_factory.mktemp('db') / 'test.db'}"
 
 @pytest.fixture(scope="session")
-def engine():
+def engine(database_url):
     engine = create_engine(
-        "sqlite:///:memory:",
+        database_url,
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
     )
     
     # Enable foreign keys for SQLite
@@ -45,25 +60,93 @@ def engine():
 
 @pytest.fixture(scope="function")
 def db_session(engine) -> Generator[Session, None, None]:
-    connection = engine.connect()
-    transaction = connection.begin()
-    session = sessionmaker(autocommit=False, autoflush=False, bind=connection)()
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
 
     yield session
 
     session.close()
-    transaction.rollback()
-    connection.close()
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+
+@pytest.fixture(scope="session")
+def async_engine(engine, database_url):
+    # No pooling: each test client runs its own event loop
+    return create_async_engine(async_database_url(database_url), poolclass=NullPool)
 
 @pytest.fixture(scope="function")
-def client(db_session: Session) -> Generator[TestClient, None, None]:
+def client(db_session: Session, engine, async_engine, monkeypatch) -> Generator[TestClient, None, None]:
     def override_get_db():
         try:
             yield db_session
         finally:
             pass
 
+    async def override_get_async_db() -> AsyncGenerator[AsyncSession, None]:
+        async with AsyncSession(async_engine, autoflush=False, expire_on_commit=False) as session:
+            yield session
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_read_db] = override_get_async_db
+    # Exports and import jobs open sessions of their own
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(contacts_api, "SessionLocal", session_factory)
+    monkeypatch.setattr(import_jobs, "_session_factory", session_factory)
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
+
+def _create_user(db: Session, email: str, is_admin: bool = False) -> User:
+    user = User(
+        email=email,
+        username=email.split("@")[0],
+        hashed_password=get_password_hash(TEST_PASSWORD),
+        is_active=True,
+        is_admin=is_admin
+    )
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+def _token_headers(user: User) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {create_access_token(data={'sub': user.email})}"}
+
+@pytest.fixture(scope="function")
+def test_user(db_session: Session) -> User:
+    return _create_user(db_session, "test@example.com")
+
+@pytest.fixture(scope="function")
+def test_admin(db_session: Session) -> User:
+    return _create_user(db_session, "admin@example.com", is_admin=True)
+
+@pytest.fixture(scope="function")
+def auth_headers(test_user: User) -> Dict[str, str]:
+    return _token_headers(test_user)
+
+@pytest.fixture(scope="function")
+def admin_headers(test_admin: User) -> Dict[str, str]:
+    return _token_headers(test_admin)
+
+@pytest.fixture(scope="function")
+def test_contact(db_session: Session, test_user: User) -> Contact:
+    contact = Contact(
+        first_name="John",
+        last_name="Doe",
+        email="john.doe@example.com",
+        phone="+1 555 0100",
+        owner_id=test_user.id
+    )
+    db_session.add(contact)
+    db_session.commit()
+    db_session.refresh(contact)
+    return contact
+
+@pytest.fixture(scope="function")
+def test_tag(db_session: Session) -> Tag:
+    tag = Tag(name="Friends")
+    db_session.add(tag)
+    db_session.commit()
+    db_session.refresh(tag)
+    return tag
@@ -0,0 +1,249 @@
+from datetime import datetime, timedelta
+import multiprocessing
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.models import AuditLogEntry
+from app.services import audit
+from app.services.audit import AuditLogWriter
+from app.services.audit_storage import AuditStorage, DatabaseAuditStorage, SegmentAuditStorage
+
+@pytest.fixture
+def audit_session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    AuditLogEntry.__table__.create(engine)
+    return sessionmaker(bind=engine)
+
+def _count(session_factory):
+    with session_factory() as db:
+        return db.execute(select(func.count()).select_from(AuditLogEntry.__table__)).scalar()
+
+def test_audit_writer_flushes_batches_on_shutdown(monkeypatch, audit_session_factory):
+    monkeypatch.setattr(audit.settings, "AUDIT_SYNC", False)
+    monkeypatch.setattr(audit.settings, "AUDIT_BATCH_SIZE", 3)
+    monkeypatch.setattr(audit.settings, "AUDIT_FLUSH_INTERVAL", 60)
+    writer = AuditLogWriter(DatabaseAuditStorage(audit_session_factory))
+
+    for n in range(7):
+        writer.record(None, user_id=1, action="list_contacts", details=str(n))
+    writer.shutdown()
+
+    assert _count(audit_session_factory) == 7
+    with audit_session_factory() as db:
+        rows = db.execute(select(AuditLogEntry.__table__)).all()
+    assert sorted(int(row.details) for row in rows) == list(range(7))
+    assert all(row.timestamp is not None for row in rows)
+
+def test_audit_writer_writes_inline_when_queue_is_full(monkeypatch, audit_session_factory):
+    monkeypatch.setattr(audit.settings, "AUDIT_SYNC", False)
+    monkeypatch.setattr(audit.settings, "AUDIT_QUEUE_SIZE", 2)
+    writer = AuditLogWriter(DatabaseAuditStorage(audit_session_factory))
+    # Nothing drains the queue
+    monkeypatch.setattr(writer, "_run", lambda entries: None)
+
+    for _ in range(5):
+        writer.record(None, user_id=1, action="list_tags")
+
+    assert writer.overflowed == 3
+    assert writer._queue.qsize() == 2
+    assert _count(audit_session_factory) == 3
+
+@pytest.mark.asyncio
+async def test_audit_writer_writes_inline_from_async_handlers(monkeypatch, audit_session_factory):
+    monkeypatch.setattr(audit.settings, "AUDIT_SYNC", False)
+    monkeypatch.setattr(audit.settings, "AUDIT_QUEUE_SIZE", 1)
+    writer = AuditLogWriter(DatabaseAuditStorage(audit_session_factory))
+    monkeypatch.setattr(writer, "_run", lambda entries: None)
+
+    for _ in range(3):
+        await writer.record_async(None, user_id=1, action="list_tags")
+
+    assert writer.overflowed == 2
+    assert _count(audit_session_factory) == 2
+
+class _FlakyStorage(AuditStorage):
+    def __init__(self, failures):
+        self.failures = failures
+        self.written = []
+
+    def write_batch(self, entries, db=None):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("storage unavailable")
+        self.written.extend(entries)
+
+    def query(self, **filters):
+        return list(self.written)
+
+def test_audit_writer_retries_failed_batches(monkeypatch):
+    monkeypatch.setattr(audit.settings, "AUDIT_WRITE_RETRIES", 2)
+    monkeypatch.setattr(audit.settings, "AUDIT_RETRY_DELAY", 0)
+    storage = _FlakyStorage(failures=2)
+    writer = AuditLogWriter(storage)
+
+    writer._write([_entry(1, datetime(2024, 3, 1))])
+    assert len(storage.written) == 1
+    assert writer.lost == 0
+
+    storage.failures = 3
+    writer._write([_entry(1, datetime(2024, 3, 1))])
+    assert len(storage.written) == 1
+    assert writer.lost == 1
+
+def test_audit_writer_sync_mode_uses_callers_session(monkeypatch, audit_session_factory):
+    monkeypatch.setattr(audit.settings, "AUDIT_SYNC", True)
+    writer = AuditLogWriter(DatabaseAuditStorage(audit_session_factory))
+
+    with audit_session_factory() as db:
+        writer.record(db, user_id=1, action="view_tag", user_agent="pytest")
+
+    assert _count(audit_session_factory) == 1
+    assert writer._thread is None
+
+def _entry(user_id, timestamp, action="list_contacts"):
+    return {"user_id": user_id, "action": action, "details": None,
+            "ip_address": "127.0.0.1", "user_agent": None, "timestamp": timestamp}
+
+def test_segment_storage_rotates_by_day_and_scans_ranges(tmp_path):
+    storage = SegmentAuditStorage(str(tmp_path))
+    day1 = datetime(2024, 3, 1, 23, 59)
+    day2 = datetime(2024, 3, 2, 0, 1)
+    storage.write_batch([_entry(1, day1), _entry(2, day1), _entry(1, day2)])
+    storage.write_batch([_entry(2, day2 + timedelta(hours=1))])
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "audit-2024-03-01.idx", "audit-2024-03-01.jsonl",
+        "audit-2024-03-02.idx", "audit-2024-03-02.jsonl",
+    ]
+    assert [e["timestamp"] for e in storage.query(user_id=1)] == [day1, day2]
+    assert [e["user_id"] for e in storage.query(start=day2)] == [1, 2]
+    assert [e["user_id"] for e in storage.query(end=day2)] == [1, 2]
+    assert storage.query(user_id=2, start=day2, limit=1)[0]["timestamp"] == day2 + timedelta(hours=1)
+    assert storage.query(user_id=3) == []
+
+def test_segment_storage_ignores_unindexed_tail(tmp_path):
+    storage = SegmentAuditStorage(str(tmp_path))
+    timestamp = datetime(2024, 3, 1, 12)
+    storage.write_batch([_entry(1, timestamp)])
+    # A block whose index line was never written, e.g. after a crash
+    with open(tmp_path / "audit-2024-03-01.jsonl", "a") as segment:
+        segment.write('{"user_id":1,"timestamp":"2024-03-01T13:00:00"}\n')
+
+    assert [e["timestamp"] for e in storage.query(user_id=1)] == [timestamp]
+
+def test_audit_writer_with_segment_storage(monkeypatch, tmp_path):
+    monkeypatch.setattr(audit.settings, "AUDIT_SYNC", False)
+    writer = AuditLogWriter(SegmentAuditStorage(str(tmp_path)))
+
+    writer.record(None, user_id=5, action="view_tag", user_agent="pytest")
+    writer.shutdown()
+
+    [entry] = writer.storage.query(user_id=5)
+    assert entry["action"] == "view_tag"
+    assert entry["user_agent"] == "pytest"
+
+def test_audit_storage_is_abstract():
+    with pytest.raises(TypeError):
+        AuditStorage()
+
+def test_segment_storage_merges_overlapping_blocks_in_order(tmp_path):
+    storage = SegmentAuditStorage(str(tmp_path))
+    base = datetime(2024, 3, 1, 12)
+    storage.write_batch([_entry(1, base + timedelta(minutes=m)) for m in (0, 4, 8)])
+    storage.write_batch([_entry(2, base + timedelta(minutes=m)) for m in (2, 6)])
+    storage.write_batch([_entry(3, base + timedelta(minutes=10))])
+
+    ascending = [e["user_id"] for e in storage.query()]
+    assert ascending == [1, 2, 1, 2, 1, 3]
+    assert [e["user_id"] for e in storage.query(descending=True)] == ascending[::-1]
+    assert [e["user_id"] for e in storage.query(limit=3)] == [1, 2, 1]
+
+    entries = storage.iter_entries()
+    assert next(entries)["timestamp"] == base
+    entries.close()
+
+def _write_from_process(directory, user_id):
+    storage = SegmentAuditStorage(directory)
+    for n in range(20):
+        storage.write_batch([_entry(user_id, datetime(2024, 3, 1, 12, n))] * 5)
+
+def test_segment_storage_appends_from_several_processes(tmp_path):
+    context = multiprocessing.get_context("fork")
+    processes = [
+        context.Process(target=_write_from_process, args=(str(tmp_path), user_id))
+        for user_id in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    storage = SegmentAuditStorage(str(tmp_path))
+    entries = storage.query()
+    assert len(entries) == 4 * 20 * 5
+    for user_id in range(4):
+        assert len(storage.query(user_id=user_id)) == 100
+
+def _page_through(storage, **filters):
+    pages, after = [], None
+    while True:
+        page = storage.query(after=after, descending=True, limit=2, **filters)
+        if not page:
+            return pages
+        pages.append([(e["user_id"], e["timestamp"]) for e in page])
+        after = (page[-1]["timestamp"], page[-1]["id"])
+
+@pytest.fixture(params=["database", "segments"])
+def paged_storage(request, tmp_path, audit_session_factory):
+    if request.param == "database":
+        storage = DatabaseAuditStorage(audit_session_factory)
+    else:
+        storage = SegmentAuditStorage(str(tmp_path))
+    base = datetime(2024, 3, 1, 23, 58)
+    # Two entries share a timestamp, so paging has to break ties on id
+    storage.write_batch([
+        _entry(1, base), _entry(2, base + timedelta(minutes=1)),
+        _entry(1, base + timedelta(minutes=1)), _entry(1, base + timedelta(minutes=3), "view_tag"),
+    ])
+    storage.write_batch([_entry(2, base + timedelta(minutes=4))])
+    return storage, base
+
+def test_audit_query_keyset_pages(paged_storage):
+    storage, base = paged_storage
+    pages = _page_through(storage)
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    flat = [entry for page in pages for entry in page]
+    assert [ts for _, ts in flat] == sorted((ts for _, ts in flat), reverse=True)
+    assert sorted(flat) == sorted(
+        (e["user_id"], e["timestamp"]) for e in storage.query()
+    )
+
+def test_audit_query_filters(paged_storage):
+    storage, base = paged_storage
+    assert [len(page) for page in _page_through(storage, user_id=1)] == [2, 1]
+    assert [e["action"] for e in storage.query(action="view_tag")] == ["view_tag"]
+    assert len(storage.query(ip_address="127.0.0.1")) == 5
+    assert storage.query(ip_address="10.0.0.1") == []
+    window = storage.query(start=base + timedelta(minutes=1), end=base + timedelta(minutes=3))
+    assert [e["timestamp"] for e in window] == [base + timedelta(minutes=1)] * 2
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(["2024-03-01T12:00:00", 42])
+    assert decode_cursor(cursor, 2) == ["2024-03-01T12:00:00", 42]
+    with pytest.raises(HTTPException):
+        decode_cursor("not-a-cursor", 2)
+    with pytest.raises(HTTPException):
+        decode_cursor(cursor, 3)
+    assert decode_cursor(cursor, 2, (str, int)) == ["2024-03-01T12:00:00", 42]
+    with pytest.raises(HTTPException):
+        decode_cursor(encode_cursor(["2024-03-01T12:00:00", True]), 2, (str, int))
@@ -11,7 +11,7 @@ def test_create_user(client: TestClient, db_session: Session):
         json={
             "email": "test@example.com",
             "username": "testuser",
-            "password": "Test123!@#$",
+            "password": "Test1234!@#$",
             "is_active": True,
         },
     )
@@ -35,7 +35,7 @@ def test_create_user_weak_password(client: TestClient, db_session: Session):
 
 def test_login_user(client: TestClient, db_session: Session):
     # Create test user
-    hashed_password = get_password_hash("Test123!@#$")
+    hashed_password = get_password_hash("Test1234!@#$")
     user = User(
         email="test@example.com",
         username="testuser",
@@ -49,7 +49,7 @@ def test_login_user(client: TestClient, db_session: Session):
         "/api/v1/auth/login",
         data={
             "username": "test@example.com",
-            "password": "Test123!@#$",
+            "password": "Test1234!@#$",
         },
     )
     assert response.status_code == 200
@@ -59,7 +59,7 @@ def test_login_user(client: TestClient, db_session: Session):
 
 def test_login_wrong_password(client: TestClient, db_session: Session):
     # Create test user
-    hashed_password = get_password_hash("Test123!@#$")
+    hashed_password = get_password_hash("Test1234!@#$")
     user = User(
         email="test@example.com",
         username="testuser",
@@ -78,3 +78,40 @@ def test_login_wrong_password(client: TestClient, db_session: Session):
     )
     assert response.status_code == 401
     assert "Incorrect email or password" in response.json()["detail"]
+
+def test_password_hashing_does_not_hold_a_connection(client: TestClient, async_engine, monkeypatch):
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.core.password_hasher import password_hasher
+    from app.db.session import get_async_db
+    from app.main import app
+
+    sessions = []
+    in_transaction = []
+
+    async def override_get_async_db():
+        async with AsyncSession(async_engine, autoflush=False, expire_on_commit=False) as session:
+            sessions.append(session)
+            yield session
+
+    def recording(method):
+        async def wrapper(*args):
+            in_transaction.append(sessions[-1].in_transaction())
+            return await method(*args)
+        return wrapper
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    monkeypatch.setattr(password_hasher, "hash", recording(password_hasher.hash))
+    monkeypatch.setattr(password_hasher, "verify", recording(password_hasher.verify))
+
+    response = client.post(
+        "/api/v1/auth/register",
+        json={"email": "pool@example.com", "username": "pool", "password": "Test1234!@#$"},
+    )
+    assert response.status_code == 200
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": "pool@example.com", "password": "Test1234!@#$"},
+    )
+    assert response.status_code == 200
+    assert in_transaction == [False, False]
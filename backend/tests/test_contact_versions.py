@@ -0,0 +1,37 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.http_cache import weak_etag
+from app.models.models import contact_versions
+from app.services.contact_versions import bump_contact_versions, get_contact_version
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    contact_versions.create(engine)
+    with sessionmaker(bind=engine)() as session:
+        yield session
+
+def test_versions_start_at_zero_and_increase_per_owner(db):
+    assert get_contact_version(db, 1) == 0
+
+    bump_contact_versions(db, [1, 2])
+    bump_contact_versions(db, [1, 1])
+    db.commit()
+
+    assert get_contact_version(db, 1) == 2
+    assert get_contact_version(db, 2) == 1
+    assert get_contact_version(db, 3) == 0
+
+def test_bump_is_part_of_the_transaction(db):
+    bump_contact_versions(db, [1])
+    db.rollback()
+    assert get_contact_version(db, 1) == 0
+
+def test_weak_etag_changes_with_version_and_request():
+    etag = weak_etag(1, 5, "limit=10")
+    assert etag.startswith('W/"') and etag == weak_etag(1, 5, "limit=10")
+    assert etag != weak_etag(1, 6, "limit=10")
+    assert etag != weak_etag(1, 5, "limit=20")
+    assert etag != weak_etag(2, 5, "limit=10")
@@ -4,7 +4,7 @@ from fastapi import status
 
 def test_create_contact(client, test_user, auth_headers):
     response = client.post(
-        "/api/contacts/",
+        "/api/v1/contacts/",
         json={
             "first_name": "Jane",
             "last_name": "Doe",
@@ -22,7 +22,7 @@ def test_create_contact(client, test_user, auth_headers):
 
 def test_get_contacts(client, test_contact, auth_headers):
     response = client.get(
-        "/api/contacts/",
+        "/api/v1/contacts/",
         headers=auth_headers
     )
     assert response.status_code == status.HTTP_200_OK
@@ -32,7 +32,7 @@ def test_get_contacts(client, test_contact, auth_headers):
 
 def test_get_contacts_with_search(client, test_contact, auth_headers):
     response = client.get(
-        "/api/contacts/?search=John",
+        "/api/v1/contacts/?search=John",
         headers=auth_headers
     )
     assert response.status_code == status.HTTP_200_OK
@@ -42,7 +42,7 @@ def test_get_contacts_with_search(client, test_contact, auth_headers):
 
 def test_get_contact(client, test_contact, auth_headers):
     response = client.get(
-        f"/api/contacts/{test_contact.id}",
+        f"/api/v1/contacts/{test_contact.id}",
         headers=auth_headers
     )
     assert response.status_code == status.HTTP_200_OK
@@ -52,14 +52,14 @@ def test_get_contact(client, test_contact, auth_headers):
 
 def test_get_contact_not_found(client, auth_headers):
     response = client.get(
-        "/api/contacts/99999",
+        "/api/v1/contacts/99999",
         headers=auth_headers
     )
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 def test_update_contact(client, test_contact, auth_headers):
     response = client.put(
-        f"/api/contacts/{test_contact.id}",
+        f"/api/v1/contacts/{test_contact.id}",
         json={
             "first_name": "Johnny",
             "last_name": "Doe",
@@ -74,14 +74,14 @@ def test_update_contact(client, test_contact, auth_headers):
 
 def test_delete_contact(client, test_contact, auth_headers):
     response = client.delete(
-        f"/api/contacts/{test_contact.id}",
+        f"/api/v1/contacts/{test_contact.id}",
         headers=auth_headers
     )
     assert response.status_code == status.HTTP_200_OK
     
     # Verify contact is deleted
     get_response = client.get(
-        f"/api/contacts/{test_contact.id}",
+        f"/api/v1/contacts/{test_contact.id}",
         headers=auth_headers
     )
     assert get_response.status_code == status.HTTP_404_NOT_FOUND
@@ -101,7 +101,7 @@ END:VCARD"""
     }
     
     response = client.post(
-        "/api/contacts/import",
+        "/api/v1/contacts/import",
         files=files,
         headers=auth_headers
     )
@@ -110,9 +110,34 @@ END:VCARD"""
     assert "imported" in result
     assert len(result["imported"]) > 0
 
+def test_import_job_progress_can_be_polled(client, auth_headers):
+    vcard_content = """BEGIN:VCARD
+VERSION:3.0
+FN:John Smith
+N:Smith;John;;;
+EMAIL:john.smith@example.com
+END:VCARD"""
+
+    response = client.post(
+        "/api/v1/contacts/import/jobs",
+        files={'file': ('contacts.vcf', vcard_content, 'text/vcard')},
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    job = response.json()
+    assert job["status"] in ("queued", "running", "completed")
+
+    response = client.get(f"/api/v1/contacts/import/jobs/{job['id']}", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["id"] == job["id"]
+
+def test_get_import_job_not_found(client, auth_headers):
+    response = client.get("/api/v1/contacts/import/jobs/missing", headers=auth_headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
 def test_export_contacts(client, test_contact, auth_headers):
     response = client.post(
-        "/api/contacts/export",
+        "/api/v1/contacts/export",
         json=[test_contact.id],
         headers=auth_headers
     )
@@ -122,10 +147,34 @@ def test_export_contacts(client, test_contact, auth_headers):
     assert "filename" in result
     assert result["filename"] == "contacts.vcf"
 
+def test_export_contacts_streams_vcards(client, db_session, test_user, auth_headers):
+    from app.models.models import Contact
+    import vobject
+
+    db_session.add_all([
+        Contact(first_name="Ann", last_name="Lee", email="ann@example.com",
+                phone="+1 555 0100", address="1 Main St", notes="Met at PyCon",
+                owner_id=test_user.id),
+        Contact(first_name="Bo", last_name="Chen", owner_id=test_user.id),
+    ])
+    db_session.commit()
+
+    response = client.get("/api/v1/contacts/export", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/vcard")
+
+    cards = {card.fn.value: card for card in vobject.readComponents(response.text)}
+    assert set(cards) == {"Ann Lee", "Bo Chen"}
+    ann = cards["Ann Lee"]
+    assert ann.email.value == "ann@example.com"
+    assert ann.tel.value == "+1 555 0100"
+    assert ann.adr.value.street == "1 Main St"
+    assert ann.note.value == "Met at PyCon"
+
 def test_filter_contacts_by_tag(client, test_contact, test_tag, auth_headers):
     # Add tag to contact
     response = client.put(
-        f"/api/contacts/{test_contact.id}",
+        f"/api/v1/contacts/{test_contact.id}",
         json={
             "first_name": test_contact.first_name,
             "last_name": test_contact.last_name,
@@ -137,7 +186,7 @@ def test_filter_contacts_by_tag(client, test_contact, test_tag, auth_headers):
 
     # Filter contacts by tag
     response = client.get(
-        f"/api/contacts/?tags={test_tag.name}",
+        f"/api/v1/contacts/?tags={test_tag.name}",
         headers=auth_headers
     )
     assert response.status_code == status.HTTP_200_OK
@@ -145,3 +194,101 @@ def test_filter_contacts_by_tag(client, test_contact, test_tag, auth_headers):
     assert len(contacts["items"]) > 0
     assert all(test_tag.name in [t["name"] for t in contact["tags"]] 
               for contact in contacts["items"])
+
+def test_get_contacts_cursor_pagination(client, db_session, test_user, auth_headers):
+    from app.models.models import Contact
+
+    for first_name, last_name in [("Ann", "Brown"), ("Bob", "Adams"), ("Cy", "Brown"), ("Di", "Clark")]:
+        db_session.add(Contact(first_name=first_name, last_name=last_name, owner_id=test_user.id))
+    db_session.commit()
+
+    names, cursor = [], None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/contacts/", params=params, headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        names += [(c["last_name"], c["first_name"]) for c in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert names == sorted(names)
+    assert ("Adams", "Bob") in names and ("Clark", "Di") in names
+
+def test_get_contacts_invalid_cursor(client, auth_headers):
+    response = client.get("/api/v1/contacts/?cursor=bogus", headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+@pytest.mark.parametrize("values", [[{}, [], 1], ["Doe", "John", True], ["Doe", "John", "1"], [None, "John", 1]])
+def test_get_contacts_cursor_with_wrong_types(client, auth_headers, values):
+    from app.core.pagination import encode_cursor
+
+    response = client.get(
+        "/api/v1/contacts/",
+        params={"cursor": encode_cursor(values)},
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+def _count_statements(async_engine, request):
+    from sqlalchemy import event
+
+    statements = []
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    bind = async_engine.sync_engine
+    event.listen(bind, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = request()
+    finally:
+        event.remove(bind, "before_cursor_execute", before_cursor_execute)
+    assert response.status_code == status.HTTP_200_OK
+    return len(statements)
+
+def test_list_contacts_loads_tags_in_constant_queries(client, db_session, async_engine, test_user, auth_headers):
+    from app.models.models import Contact, Tag
+
+    tags = [Tag(name="Family"), Tag(name="Work")]
+    for n in range(10):
+        db_session.add(Contact(first_name=f"First{n}", last_name="Tagged",
+                               owner_id=test_user.id, tags=tags))
+    db_session.commit()
+
+    def list_page(limit):
+        return lambda: client.get(f"/api/v1/contacts/?limit={limit}", headers=auth_headers)
+
+    small_page = _count_statements(async_engine, list_page(2))
+    large_page = _count_statements(async_engine, list_page(10))
+    assert small_page == large_page
+
+    response = client.get("/api/v1/contacts/?limit=10", headers=auth_headers)
+    assert all(sorted(c["tags"]) == ["Family", "Work"] for c in response.json())
+
+def test_get_contacts_not_modified(client, test_contact, auth_headers):
+    response = client.get("/api/v1/contacts/", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    response = client.get("/api/v1/contacts/", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+
+    # Any change to the address book changes the ETag
+    client.post(
+        "/api/v1/contacts/",
+        json={"first_name": "New", "last_name": "Contact"},
+        headers=auth_headers
+    )
+    response = client.get("/api/v1/contacts/", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+
+def test_get_contact_not_modified(client, test_contact, auth_headers):
+    url = f"/api/v1/contacts/{test_contact.id}"
+    etag = client.get(url, headers=auth_headers).headers["ETag"]
+    response = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
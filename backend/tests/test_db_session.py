@@ -0,0 +1,112 @@
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, insert, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import RoutingSession, async_database_url, create_engines
+
+metadata = MetaData()
+items = Table(
+    "items", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String),
+)
+
+def make_engines(tmp_path):
+    engine, read_engine = create_engines(f"sqlite:///{tmp_path / 'test.db'}")
+    metadata.create_all(engine)
+    return engine, read_engine
+
+def test_file_database_uses_wal_and_pragmas(tmp_path):
+    engine, read_engine = make_engines(tmp_path)
+    assert read_engine is not None
+    for e in (engine, read_engine):
+        with e.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            assert conn.exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
+            assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+    assert engine.pool.size() == 1
+    engine.dispose()
+    read_engine.dispose()
+
+def test_in_memory_database_uses_single_engine():
+    engine, read_engine = create_engines("sqlite:///:memory:")
+    assert read_engine is None
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
+
+def test_session_routes_writes_to_writer(tmp_path):
+    engine, read_engine = make_engines(tmp_path)
+    Session = sessionmaker(class_=RoutingSession, bind=engine, read_bind=read_engine)
+
+    with Session() as db:
+        assert db.get_bind(clause=select(items)) is read_engine
+        db.execute(insert(items).values(name="a"))
+        # The rest of the transaction stays on the writer and sees its own rows
+        assert db.get_bind(clause=select(items)) is engine
+        assert db.execute(select(items.c.name)).scalars().all() == ["a"]
+        db.commit()
+        assert db.get_bind(clause=select(items)) is read_engine
+        assert db.execute(select(items.c.name)).scalars().all() == ["a"]
+
+    engine.dispose()
+    read_engine.dispose()
+
+def test_reads_proceed_while_write_is_open(tmp_path):
+    engine, read_engine = make_engines(tmp_path)
+    Session = sessionmaker(class_=RoutingSession, bind=engine, read_bind=read_engine)
+
+    writer = Session()
+    writer.execute(insert(items).values(name="uncommitted"))
+
+    results = []
+    def read():
+        with Session() as db:
+            results.append(db.execute(text("SELECT count(*) FROM items")).scalar())
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == [0, 0, 0, 0]
+    writer.commit()
+    writer.close()
+    engine.dispose()
+    read_engine.dispose()
+
+def test_async_database_url_uses_async_drivers():
+    assert str(async_database_url("sqlite:///./data/app.db")) == "sqlite+aiosqlite:///./data/app.db"
+    assert async_database_url("postgresql://u:p@db/app").drivername == "postgresql+asyncpg"
+    assert async_database_url("postgresql+psycopg2://u:p@db/app").drivername == "postgresql+asyncpg"
+
+@pytest.mark.asyncio
+async def test_async_session_routes_and_overlaps_queries(tmp_path):
+    make_engines(tmp_path)[0].dispose()
+    engine, read_engine = create_engines(f"sqlite:///{tmp_path / 'test.db'}", asynchronous=True)
+    Session = async_sessionmaker(
+        bind=engine,
+        sync_session_class=RoutingSession,
+        read_bind=read_engine.sync_engine,
+        expire_on_commit=False,
+    )
+
+    async with Session() as db:
+        async with engine.connect() as conn:
+            assert (await conn.exec_driver_sql("PRAGMA journal_mode")).scalar() == "wal"
+        await db.execute(insert(items).values(name="a"))
+        assert db.sync_session.get_bind(clause=select(items)) is engine.sync_engine
+        await db.commit()
+        assert db.sync_session.get_bind(clause=select(items)) is read_engine.sync_engine
+
+    async def count():
+        async with Session() as db:
+            return await db.scalar(text("SELECT count(*) FROM items"))
+
+    assert await asyncio.gather(*(count() for _ in range(8))) == [1] * 8
+    await engine.dispose()
+    await read_engine.dispose()
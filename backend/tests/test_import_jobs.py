@@ -0,0 +1,124 @@
+import io
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db import session as db_session_module
+from app.db.base import Base
+from app.db.session import RoutingSession, create_engines
+from app.models.models import Contact, User, import_jobs as import_jobs_table
+from app.services.import_jobs import ImportJob, ImportJobManager
+
+BROKEN_VCARD = "BEGIN:VCARD\r\nVERSION:3.0\r\nBROKEN LINE\r\nEND:VCARD\r\n"
+
+def _upload(content: str) -> UploadFile:
+    return UploadFile(file=io.BytesIO(content.encode("utf-8")), filename="contacts.vcf")
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path / "uploads"))
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+@pytest.mark.asyncio
+async def test_job_state_is_visible_to_other_workers(session_factory):
+    manager = ImportJobManager(session_factory)
+    job = await manager.submit(_upload(BROKEN_VCARD), owner_id=7, tolerant=False)
+    manager.shutdown()
+
+    # A manager in another worker process only shares the database
+    stored = ImportJobManager(session_factory).get(job.id)
+    assert stored.owner_id == 7
+    assert stored.status == "failed"
+    assert stored.errors
+    assert stored.finished_at is not None
+    assert not os.path.exists(job.path)
+    assert ImportJobManager(session_factory).get("missing") is None
+
+@pytest.mark.asyncio
+async def test_oversized_upload_is_rejected(session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_MAX_UPLOAD_SIZE", 10)
+    manager = ImportJobManager(session_factory)
+    with pytest.raises(HTTPException) as exc:
+        await manager.submit(_upload(BROKEN_VCARD), owner_id=7)
+    assert exc.value.status_code == 413
+    assert os.listdir(manager.upload_dir) == []
+    with session_factory() as db:
+        assert db.execute(select(import_jobs_table)).first() is None
+
+def test_only_recent_finished_jobs_are_kept(session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_JOB_HISTORY", 2)
+    manager = ImportJobManager(session_factory)
+    started = datetime(2024, 1, 1)
+    jobs = []
+    for n in range(3):
+        job = ImportJob(owner_id=1, path="")
+        job.status = "completed"
+        job.finished_at = started + timedelta(minutes=n)
+        manager._create(job)
+        jobs.append(job)
+    running = ImportJob(owner_id=1, path="")
+    manager._create(running)
+
+    assert manager.get(jobs[0].id) is None
+    assert [manager.get(job.id).status for job in jobs[1:]] == ["completed", "completed"]
+    assert manager.get(running.id).status == "queued"
+
+def _vcards(count: int) -> str:
+    return "".join(
+        f"BEGIN:VCARD\r\nVERSION:3.0\r\nFN:First{n} Last{n}\r\nN:Last{n};First{n};;;\r\n"
+        f"EMAIL;TYPE=WORK:person{n}@example.com\r\nEND:VCARD\r\n"
+        for n in range(count)
+    )
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("tolerant", [False, True])
+async def test_bulk_job_does_not_wait_for_its_own_writer_connection(tmp_path, monkeypatch, tolerant):
+    # File-backed SQLite has a single writer connection, held by a bulk
+    # import from its first INSERT until it commits
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path / "uploads"))
+    monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 50)
+    monkeypatch.setattr(db_session_module, "DB_CONNECTION_TIMEOUT", 1)
+    engine, read_engine = create_engines(f"sqlite:///{tmp_path / 'app.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(class_=RoutingSession, bind=engine, read_bind=read_engine, autoflush=False)
+    with factory() as db:
+        user = User(email="bulk@example.com", username="bulk", hashed_password="x")
+        db.add(user)
+        db.commit()
+        owner_id = user.id
+
+    try:
+        manager = ImportJobManager(factory)
+        job = await manager.submit(_upload(_vcards(120)), owner_id=owner_id, tolerant=tolerant)
+        manager.shutdown()
+
+        stored = manager.get(job.id)
+        assert stored.errors == []
+        assert stored.status == "completed"
+        assert (stored.parsed, stored.imported) == (120, 120)
+        with factory() as db:
+            assert db.scalar(select(func.count()).select_from(Contact)) == 120
+    finally:
+        engine.dispose()
+        read_engine.dispose()
+
+@pytest.mark.asyncio
+async def test_job_stores_only_the_first_errors(session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_JOB_MAX_ERRORS", 2)
+    manager = ImportJobManager(session_factory)
+    job = await manager.submit(_upload(BROKEN_VCARD * 5), owner_id=7, tolerant=True)
+    manager.shutdown()
+
+    stored = manager.get(job.id)
+    assert stored.status == "completed"
+    assert len(stored.errors) == 2
+    assert stored.error_count == 5
+    assert stored.parsed == 5
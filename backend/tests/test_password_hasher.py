@@ -0,0 +1,130 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core import password_hasher as hasher_module
+from app.core import security
+from app.core.password_hasher import PasswordHasher
+from app.models.models import User
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_round_trip():
+    hasher = PasswordHasher()
+    hashed = await hasher.hash("Correct-Horse-9")
+
+    assert await hasher.verify("Correct-Horse-9", hashed)
+    assert not await hasher.verify("wrong", hashed)
+    assert hasher.stats()["completed"] == 3
+    hasher.shutdown()
+
+@pytest.mark.asyncio
+async def test_rejects_when_queue_is_full(monkeypatch):
+    monkeypatch.setattr(hasher_module.settings, "PASSWORD_HASH_WORKERS", 1)
+    monkeypatch.setattr(hasher_module.settings, "PASSWORD_HASH_MAX_PENDING", 2)
+    release = threading.Event()
+    monkeypatch.setattr(hasher_module, "get_password_hash", lambda password: release.wait(5) and password)
+    hasher = PasswordHasher()
+
+    running = [asyncio.ensure_future(hasher.hash(str(n))) for n in range(2)]
+    await asyncio.sleep(0.05)
+    assert hasher.stats()["active"] == 1 and hasher.stats()["queued"] == 1
+
+    with pytest.raises(HTTPException) as exc:
+        await hasher.hash("one too many")
+    assert exc.value.status_code == 503
+    assert exc.value.headers["Retry-After"] == "1"
+
+    # The event loop keeps serving other work while the pool is busy
+    await asyncio.sleep(0)
+    release.set()
+    assert await asyncio.gather(*running) == ["0", "1"]
+    assert hasher.stats() == {
+        "workers": 1, "max_pending": 2, "active": 0, "queued": 0,
+        "completed": 2, "rejected": 1, "rehashed": 0,
+    }
+    hasher.shutdown()
+
+@pytest.fixture
+def restore_hashing():
+    params = dict(security.password_hash_params)
+    yield
+    security.configure_password_hashing(**params)
+
+def test_calibration_respects_minimum_cost():
+    # An unreachable target still yields the minimum cost
+    assert security.calibrate_password_hashing("bcrypt", 1) == {"rounds": security.BCRYPT_MIN_ROUNDS}
+    params = security.calibrate_password_hashing("argon2", 1)
+    assert params["time_cost"] == security.ARGON2_MIN_TIME_COST
+
+def test_calibration_is_shared_through_the_cache_file(monkeypatch, tmp_path, restore_hashing):
+    monkeypatch.setattr(security.settings, "PASSWORD_HASH_CALIBRATE", True)
+    monkeypatch.setattr(security.settings, "PASSWORD_HASH_ALGORITHM", "bcrypt")
+    monkeypatch.setattr(
+        security.settings, "PASSWORD_HASH_CALIBRATION_FILE", str(tmp_path / "data" / "calibration.json")
+    )
+    calls = []
+    def calibrate(scheme, target_ms):
+        calls.append(target_ms)
+        return {"rounds": 11}
+    monkeypatch.setattr(security, "calibrate_password_hashing", calibrate)
+
+    assert security.setup_password_hashing() == {"rounds": 11}
+    # Other worker processes reuse the measurement
+    assert security.setup_password_hashing() == {"rounds": 11}
+    assert calls == [security.settings.PASSWORD_HASH_TARGET_MS]
+
+    monkeypatch.setattr(security.settings, "PASSWORD_HASH_TARGET_MS", 500)
+    security.setup_password_hashing()
+    assert calls[1:] == [500]
+
+def test_needs_rehash_only_upgrades(restore_hashing):
+    security.configure_password_hashing("bcrypt", rounds=5)
+    weak = security.get_password_hash("Correct-Horse-9")
+    security.configure_password_hashing("bcrypt", rounds=6)
+    strong = security.get_password_hash("Correct-Horse-9")
+
+    assert security.needs_rehash(weak)
+    assert not security.needs_rehash(strong)
+
+    # A stronger hash from a faster host is kept
+    security.configure_password_hashing("bcrypt", rounds=5)
+    assert not security.needs_rehash(strong)
+
+    security.configure_password_hashing("argon2", time_cost=1, memory_cost=1024, parallelism=1)
+    assert security.needs_rehash(strong)
+    upgraded = security.get_password_hash("Correct-Horse-9")
+    assert upgraded.startswith("$argon2id$")
+    assert not security.needs_rehash(upgraded)
+    # Old bcrypt hashes still verify
+    assert security.verify_password("Correct-Horse-9", strong)
+
+def test_rehash_in_background_updates_stale_hash(monkeypatch, restore_hashing):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    User.__table__.create(engine)
+    monkeypatch.setattr(hasher_module, "SessionLocal", sessionmaker(bind=engine))
+    security.configure_password_hashing("bcrypt", rounds=5)
+    old_hash = security.get_password_hash("Correct-Horse-9")
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__).values(
+            id=1, email="a@example.com", username="a", hashed_password=old_hash
+        ))
+
+    security.configure_password_hashing("argon2", time_cost=1, memory_cost=1024, parallelism=1)
+    hasher = PasswordHasher()
+    assert hasher.rehash_in_background(1, "Correct-Horse-9", old_hash)
+    hasher.shutdown()
+
+    with engine.connect() as conn:
+        new_hash = conn.execute(select(User.__table__.c.hashed_password)).scalar_one()
+    assert new_hash.startswith("$argon2id$")
+    assert security.verify_password("Correct-Horse-9", new_hash)
+    assert hasher.stats()["rehashed"] == 1
+    # Nothing left to upgrade
+    assert not hasher.rehash_in_background(1, "Correct-Horse-9", new_hash)
@@ -0,0 +1,86 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core import dependencies, principal_cache as cache_module
+from app.core.dependencies import get_current_principal
+from app.core.principal_cache import Principal, PrincipalCache
+from app.db.replicas import SESSION_USER_KEY
+
+@pytest.fixture(autouse=True)
+def cache_enabled(monkeypatch):
+    # The test configuration turns the cache off for API tests
+    monkeypatch.setattr(cache_module.settings, "AUTH_CACHE_TTL", 60)
+
+def _principal(user_id=1, is_active=True):
+    return Principal(user_id, f"user{user_id}@example.com", is_active, False)
+
+def test_cache_expires_at_ttl_or_token_expiry(monkeypatch):
+    cache = PrincipalCache()
+    cache.put("a", _principal())
+    cache.put("b", _principal(), token_expires_at=time.time() - 1)
+
+    assert cache.get("a").id == 1
+    assert cache.get("b") is None
+
+    monkeypatch.setattr(cache_module.time, "time", lambda: time.monotonic() + 10 ** 10)
+    assert cache.get("a") is None
+
+def test_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(cache_module.settings, "AUTH_CACHE_SIZE", 2)
+    cache = PrincipalCache()
+    cache.put("a", _principal(1))
+    cache.put("b", _principal(2))
+    cache.get("a")
+    cache.put("c", _principal(3))
+
+    assert cache.get("b") is None
+    assert cache.get("a").id == 1 and cache.get("c").id == 3
+
+def test_cache_disabled_with_zero_ttl(monkeypatch):
+    monkeypatch.setattr(cache_module.settings, "AUTH_CACHE_TTL", 0)
+    cache = PrincipalCache()
+    cache.put("a", _principal())
+    assert cache.get("a") is None
+
+def test_invalidate_user_drops_all_their_tokens():
+    cache = PrincipalCache()
+    cache.put("a", _principal(1))
+    cache.put("b", _principal(1))
+    cache.put("c", _principal(2))
+    cache.invalidate_user(1)
+
+    assert cache.get("a") is None and cache.get("b") is None
+    assert cache.get("c").id == 2
+
+def test_committed_user_changes_invalidate(monkeypatch):
+    cache = PrincipalCache()
+    monkeypatch.setattr(cache_module, "principal_cache", cache)
+    cache.put("a", _principal(1))
+    cache.put("b", _principal(2))
+
+    with sessionmaker(bind=create_engine("sqlite://"))() as db:
+        db.connection()
+        db.info[cache_module._PENDING_KEY] = {2}
+        db.rollback()
+        assert cache.get("b") is not None
+
+        db.connection()
+        db.info[cache_module._PENDING_KEY] = {1}
+        db.commit()
+
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+
+@pytest.mark.asyncio
+async def test_get_current_principal_skips_the_database_on_a_hit(monkeypatch):
+    cache = PrincipalCache()
+    monkeypatch.setattr(dependencies, "principal_cache", cache)
+    cache.put("token", _principal(7))
+    # The session is only tagged with the user, never queried
+    db = SimpleNamespace(info={})
+    assert (await get_current_principal(db=db, token="token")).id == 7
+    assert db.info == {SESSION_USER_KEY: 7}
@@ -0,0 +1,144 @@
+import time
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import replicas as replicas_module
+from app.db.replicas import (
+    LAST_WRITE_COOKIE,
+    SESSION_USER_KEY,
+    ReadYourWritesMiddleware,
+    ReplicaRouter,
+    last_write_from,
+)
+
+@pytest.fixture
+def router(tmp_path):
+    router = ReplicaRouter([
+        f"sqlite:///{tmp_path / 'replica1.db'}",
+        f"sqlite:///{tmp_path / 'replica2.db'}",
+        f"sqlite:///{tmp_path / 'missing' / 'replica3.db'}",
+    ])
+    yield router
+    for replica in router.replicas:
+        replica.engine.sync_engine.dispose()
+
+@pytest.mark.asyncio
+async def test_reads_go_to_healthy_replicas_round_robin(router):
+    assert router.choose() is None  # Not checked yet
+
+    await router.check()
+    assert [replica.healthy for replica in router.replicas] == [True, True, False]
+    first, second = router.replicas[:2]
+    assert [router.choose() for _ in range(4)] == [first, second, first, second]
+
+    db = router.read_session(user_id=1)
+    assert db.sync_session.read_bind in (first.engine.sync_engine, second.engine.sync_engine)
+    assert db.info[SESSION_USER_KEY] == 1
+    await db.close()
+    await router.stop()
+
+@pytest.mark.asyncio
+async def test_lagging_replicas_are_skipped(router, monkeypatch):
+    monkeypatch.setattr(replicas_module.settings, "REPLICA_MAX_LAG", 5.0)
+    async def lag():
+        return 30.0
+    for replica in router.replicas:
+        monkeypatch.setattr(replica, "measure_lag", lag)
+
+    await router.check()
+    assert router.choose() is None
+    assert [status["lag"] for status in router.status()] == [30.0, 30.0, 30.0]
+    await router.stop()
+
+@pytest.mark.asyncio
+async def test_lost_replication_is_unhealthy(router, monkeypatch):
+    async def not_streaming():
+        return None
+    monkeypatch.setattr(router.replicas[0], "measure_lag", not_streaming)
+
+    await router.check()
+    assert [replica.healthy for replica in router.replicas] == [False, True, False]
+    await router.stop()
+
+@pytest.mark.asyncio
+async def test_recent_writers_read_from_the_primary(router, monkeypatch):
+    monkeypatch.setattr(replicas_module.settings, "REPLICA_STICKY_SECONDS", 60.0)
+    await router.check()
+
+    assert router.wrote_recently(time.time() - 1)
+    assert not router.wrote_recently(time.time() - 120)
+    assert not router.wrote_recently(None)
+    db = router.read_session(user_id=1, last_write=time.time())
+    assert db.sync_session.read_bind not in [r.engine.sync_engine for r in router.replicas]
+    await db.close()
+
+    monkeypatch.setattr(replicas_module.settings, "REPLICA_STICKY_SECONDS", 0.0)
+    assert not router.wrote_recently(time.time())
+    await router.stop()
+
+def test_committed_flushes_are_recorded_for_the_request():
+    writes = {}
+    token = replicas_module._request_writes.set(writes)
+    try:
+        with sessionmaker(bind=create_engine("sqlite://"))() as db:
+            db.info[SESSION_USER_KEY] = 7
+            db.connection()
+            db.info[replicas_module._PENDING_KEY] = True
+            db.rollback()
+            assert writes == {}
+
+            db.connection()
+            db.info[replicas_module._PENDING_KEY] = True
+            db.commit()
+    finally:
+        replicas_module._request_writes.reset(token)
+
+    assert time.time() - writes["written_at"] < 5
+
+@pytest.mark.asyncio
+async def test_async_commits_are_recorded_for_the_request():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    writes = {}
+    token = replicas_module._request_writes.set(writes)
+    try:
+        async with AsyncSession(engine) as db:
+            await db.connection()
+            db.sync_session.info[replicas_module._PENDING_KEY] = True
+            await db.commit()
+    finally:
+        replicas_module._request_writes.reset(token)
+        await engine.dispose()
+
+    assert "written_at" in writes
+
+def test_last_write_cookie_round_trip(monkeypatch):
+    monkeypatch.setattr(replicas_module.settings, "REPLICA_STICKY_SECONDS", 60.0)
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    @app.post("/write")
+    def write():
+        replicas_module._request_writes.get()["written_at"] = time.time()
+
+    @app.get("/read")
+    def read(request: Request):
+        return {"last_write": last_write_from(request)}
+
+    client = TestClient(app)
+    assert client.get("/read").json() == {"last_write": None}
+    assert LAST_WRITE_COOKIE not in client.get("/read").cookies
+
+    response = client.post("/write")
+    assert LAST_WRITE_COOKIE in response.cookies
+    assert "Max-Age=60" in response.headers["set-cookie"]
+    # Any worker process can tell the client wrote recently
+    last_write = client.get("/read").json()["last_write"]
+    assert replicas_module.replica_router.wrote_recently(last_write)
+
+    client.cookies.set(LAST_WRITE_COOKIE, "nan")
+    assert client.get("/read").json() == {"last_write": None}
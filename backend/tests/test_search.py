@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import create_engine, delete, insert, update
+from sqlalchemy.orm import sessionmaker
+
+from app.models.models import Contact, User
+from app.services.contact_search import build_match_query, ensure_search_index, search_contact_ids
+
+CONTACTS = [
+    {"id": 1, "first_name": "John", "last_name": "Smith", "email": "john@example.com",
+     "phone": "+1 555 0100", "notes": "Met at PyCon", "owner_id": 1},
+    {"id": 2, "first_name": "Jane", "last_name": "Johnson", "email": "jane@example.org",
+     "address": "12 Smith Street", "owner_id": 1},
+    {"id": 3, "first_name": "Zoë", "last_name": "Müller", "notes": "Prefers email", "owner_id": 1},
+    {"id": 4, "first_name": "John", "last_name": "Other", "owner_id": 2},
+]
+
+def _rows(contacts):
+    fields = ("email", "phone", "address", "notes")
+    return [{**dict.fromkeys(fields), **contact} for contact in contacts]
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    User.__table__.create(engine)
+    Contact.__table__.create(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Contact.__table__), _rows(CONTACTS[:2]))
+    # Contacts that existed before the index are picked up by the initial rebuild
+    ensure_search_index(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Contact.__table__), _rows(CONTACTS[2:]))
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+def test_build_match_query_quotes_words():
+    assert build_match_query('john "OR" sm*') == '"john"* "OR"* "sm"*'
+    assert build_match_query("  ()  ") == ""
+
+def test_search_ranks_and_scopes_to_owner(db):
+    # A last-name hit outranks the same word in an address
+    assert search_contact_ids(db, 1, "smith") == [1, 2]
+    assert search_contact_ids(db, 1, "joh") == [1, 2]
+    assert search_contact_ids(db, 2, "john") == [4]
+    assert search_contact_ids(db, 1, "john pycon") == [1]
+    assert search_contact_ids(db, 1, "555") == [1]
+    assert search_contact_ids(db, 1, "muller zoe") == [3]
+    assert search_contact_ids(db, 1, "nobody") == []
+    assert search_contact_ids(db, 1, "smith", limit=1) == [1]
+
+def test_search_index_follows_updates_and_deletes(db):
+    table = Contact.__table__
+    db.execute(update(table).where(table.c.id == 1).values(last_name="Brown"))
+    db.execute(delete(table).where(table.c.id == 2))
+    db.commit()
+
+    assert search_contact_ids(db, 1, "smith") == []
+    assert search_contact_ids(db, 1, "brown") == [1]
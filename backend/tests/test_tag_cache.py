@@ -0,0 +1,69 @@
+import pytest
+from starlette.requests import Request
+
+from app.core.http_cache import content_etag, if_none_match
+from app.services import tag_cache as tag_cache_module
+from app.services.tag_cache import TagCache
+
+def _request(if_none_match_header=None):
+    headers = []
+    if if_none_match_header is not None:
+        headers.append((b"if-none-match", if_none_match_header.encode()))
+    return Request({"type": "http", "headers": headers})
+
+@pytest.mark.asyncio
+async def test_cache_loads_once_per_generation():
+    cache = TagCache()
+    loads = []
+    async def load():
+        loads.append(1)
+        return [{"id": len(loads), "name": "Friends"}]
+
+    etag, tags = await cache.get(load)
+    assert await cache.get(load) == (etag, tags)
+    assert len(loads) == 1
+
+    await cache.invalidate()
+    new_etag, new_tags = await cache.get(load)
+    assert len(loads) == 2
+    assert new_tags == [{"id": 2, "name": "Friends"}]
+    assert new_etag != etag
+    assert cache.stats() == {"hits": 1, "misses": 2, "shared": False}
+
+@pytest.mark.asyncio
+async def test_unshared_entries_expire(monkeypatch):
+    # Writes handled by other worker processes do not reach this cache
+    cache = TagCache()
+    names = iter(["Friends", "Family", "Work"])
+    async def load():
+        return [{"id": 1, "name": next(names)}]
+
+    monkeypatch.setattr(tag_cache_module.settings, "TAG_CACHE_TTL", 30.0)
+    etag, _ = await cache.get(load)
+    assert (await cache.get(load))[0] == etag
+
+    monkeypatch.setattr(tag_cache_module.settings, "TAG_CACHE_TTL", 0.0)
+    new_etag, tags = await cache.get(load)
+    assert tags == [{"id": 1, "name": "Family"}]
+    assert new_etag != etag
+
+@pytest.mark.asyncio
+async def test_write_during_load_is_not_cached_as_current():
+    cache = TagCache()
+    async def load_racing_a_write():
+        await cache.invalidate()
+        return [{"id": 1, "name": "stale"}]
+    await cache.get(load_racing_a_write)
+
+    async def load():
+        return [{"id": 1, "name": "fresh"}]
+    assert (await cache.get(load))[1] == [{"id": 1, "name": "fresh"}]
+
+def test_if_none_match():
+    etag = content_etag([{"id": 1, "name": "Friends"}])
+    assert etag == content_etag([{"name": "Friends", "id": 1}])
+    assert not if_none_match(_request(), etag)
+    assert if_none_match(_request(etag), etag)
+    assert if_none_match(_request(f'"other", W/{etag}'), etag)
+    assert if_none_match(_request("*"), etag)
+    assert not if_none_match(_request('"other"'), etag)
@@ -5,7 +5,7 @@ from fastapi import status
 def test_create_tag(client, auth_headers):
     """Test creating a new tag."""
     response = client.post(
-        "/api/tags/",
+        "/api/v1/tags/",
         json={"name": "New Tag"},
         headers=auth_headers
     )
@@ -17,7 +17,7 @@ def test_create_tag(client, auth_headers):
 def test_create_duplicate_tag(client, test_tag, auth_headers):
     """Test creating a tag with a duplicate name."""
     response = client.post(
-        "/api/tags/",
+        "/api/v1/tags/",
         json={"name": test_tag.name},
         headers=auth_headers
     )
@@ -27,7 +27,7 @@ def test_create_duplicate_tag(client, test_tag, auth_headers):
 def test_get_tags(client, test_tag, auth_headers):
     """Test getting all tags."""
     response = client.get(
-        "/api/tags/",
+        "/api/v1/tags/",
         headers=auth_headers
     )
     assert response.status_code == status.HTTP_200_OK
@@ -38,7 +38,7 @@ def test_get_tags(client, test_tag, auth_headers):
 def test_get_tag(client, test_tag, auth_headers):
     """Test getting a specific tag by ID."""
     response = client.get(
-        f"/api/tags/{test_tag.id}",
+        f"/api/v1/tags/{test_tag.id}",
         headers=auth_headers
     )
     assert response.status_code == status.HTTP_200_OK
@@ -49,7 +49,7 @@ def test_get_tag(client, test_tag, auth_headers):
 def test_get_nonexistent_tag(client, auth_headers):
     """Test getting a tag that doesn't exist."""
     response = client.get(
-        "/api/tags/99999",
+        "/api/v1/tags/99999",
         headers=auth_headers
     )
     assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -58,7 +58,7 @@ def test_update_tag(client, test_tag, auth_headers):
     """Test updating a tag's name."""
     new_name = "Updated Tag Name"
     response = client.put(
-        f"/api/tags/{test_tag.id}",
+        f"/api/v1/tags/{test_tag.id}",
         json={"name": new_name},
         headers=auth_headers
     )
@@ -71,14 +71,14 @@ def test_update_tag_duplicate_name(client, test_tag, auth_headers):
     """Test updating a tag with a name that already exists."""
     # First create another tag
     client.post(
-        "/api/tags/",
+        "/api/v1/tags/",
         json={"name": "Another Tag"},
         headers=auth_headers
     )
     
     # Try to update the test_tag with the same name
     response = client.put(
-        f"/api/tags/{test_tag.id}",
+        f"/api/v1/tags/{test_tag.id}",
         json={"name": "Another Tag"},
         headers=auth_headers
     )
@@ -88,14 +88,14 @@ def test_update_tag_duplicate_name(client, test_tag, auth_headers):
 def test_delete_tag(client, test_tag, auth_headers):
     """Test deleting a tag."""
     response = client.delete(
-        f"/api/tags/{test_tag.id}",
+        f"/api/v1/tags/{test_tag.id}",
         headers=auth_headers
     )
     assert response.status_code == status.HTTP_200_OK
     
     # Verify tag is deleted
     get_response = client.get(
-        f"/api/tags/{test_tag.id}",
+        f"/api/v1/tags/{test_tag.id}",
         headers=auth_headers
     )
     assert get_response.status_code == status.HTTP_404_NOT_FOUND
@@ -104,7 +104,7 @@ def test_delete_tag_with_contacts(client, test_tag, test_contact, auth_headers):
     """Test deleting a tag that is associated with contacts."""
     # First associate the tag with a contact
     client.put(
-        f"/api/contacts/{test_contact.id}",
+        f"/api/v1/contacts/{test_contact.id}",
         json={
             "first_name": test_contact.first_name,
             "last_name": test_contact.last_name,
@@ -115,7 +115,7 @@ def test_delete_tag_with_contacts(client, test_tag, test_contact, auth_headers):
     
     # Try to delete the tag
     response = client.delete(
-        f"/api/tags/{test_tag.id}",
+        f"/api/v1/tags/{test_tag.id}",
         headers=auth_headers
     )
     assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -124,7 +124,7 @@ def test_delete_tag_with_contacts(client, test_tag, test_contact, auth_headers):
 def test_search_tags(client, test_tag, auth_headers):
     """Test searching for tags by name."""
     response = client.get(
-        f"/api/tags/search/{test_tag.name[:3]}",
+        f"/api/v1/tags/search/{test_tag.name[:3]}",
         headers=auth_headers
     )
     assert response.status_code == status.HTTP_200_OK
@@ -136,7 +136,7 @@ def test_get_tag_usage_stats(client, test_tag, test_contact, auth_headers):
     """Test getting usage statistics for tags."""
     # First associate the tag with a contact
     client.put(
-        f"/api/contacts/{test_contact.id}",
+        f"/api/v1/contacts/{test_contact.id}",
         json={
             "first_name": test_contact.first_name,
             "last_name": test_contact.last_name,
@@ -146,7 +146,7 @@ def test_get_tag_usage_stats(client, test_tag, test_contact, auth_headers):
     )
     
     response = client.get(
-        "/api/tags/stats/usage",
+        "/api/v1/tags/stats/usage",
         headers=auth_headers
     )
     assert response.status_code == status.HTTP_200_OK
@@ -159,7 +159,7 @@ def test_merge_tags(client, test_tag, auth_headers, admin_headers):
     """Test merging two tags."""
     # Create a second tag
     create_response = client.post(
-        "/api/tags/",
+        "/api/v1/tags/",
         json={"name": "Tag to Merge"},
         headers=auth_headers
     )
@@ -167,14 +167,14 @@ def test_merge_tags(client, test_tag, auth_headers, admin_headers):
     
     # Merge the tags
     response = client.post(
-        f"/api/tags/merge/{source_tag_id}/{test_tag.id}",
+        f"/api/v1/tags/merge/{source_tag_id}/{test_tag.id}",
         headers=admin_headers
     )
     assert response.status_code == status.HTTP_200_OK
     
     # Verify source tag is deleted
     get_response = client.get(
-        f"/api/tags/{source_tag_id}",
+        f"/api/v1/tags/{source_tag_id}",
         headers=auth_headers
     )
     assert get_response.status_code == status.HTTP_404_NOT_FOUND
@@ -182,7 +182,7 @@ def test_merge_tags(client, test_tag, auth_headers, admin_headers):
 def test_merge_nonexistent_tags(client, test_tag, admin_headers):
     """Test merging when one or both tags don't exist."""
     response = client.post(
-        f"/api/tags/merge/99999/{test_tag.id}",
+        f"/api/v1/tags/merge/99999/{test_tag.id}",
         headers=admin_headers
     )
     assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -190,8 +190,34 @@ def test_merge_nonexistent_tags(client, test_tag, admin_headers):
 def test_merge_same_tag(client, test_tag, admin_headers):
     """Test attempting to merge a tag with itself."""
     response = client.post(
-        f"/api/tags/merge/{test_tag.id}/{test_tag.id}",
+        f"/api/v1/tags/merge/{test_tag.id}/{test_tag.id}",
         headers=admin_headers
     )
     assert response.status_code == status.HTTP_400_BAD_REQUEST
     assert "cannot merge tag with itself" in response.json()["detail"].lower()
+
+def test_get_tags_not_modified(client, test_tag, auth_headers):
+    """Test revalidating the tag list with its ETag."""
+    response = client.get("/api/v1/tags/", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    etag = response.headers["ETag"]
+
+    response = client.get("/api/v1/tags/", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+
+    # A write invalidates the cached list
+    client.post("/api/v1/tags/", json={"name": "Another Tag"}, headers=auth_headers)
+    response = client.get("/api/v1/tags/", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+
+def test_get_tags_is_audited(client, db_session, test_user, test_tag, auth_headers):
+    """Cached and revalidated listings are still written to the audit log."""
+    from app.models.models import AuditLogEntry
+
+    etag = client.get("/api/v1/tags/", headers=auth_headers).headers["ETag"]
+    client.get("/api/v1/tags/", headers={**auth_headers, "If-None-Match": etag})
+
+    entries = db_session.query(AuditLogEntry).filter_by(action="list_tags").all()
+    assert [entry.user_id for entry in entries] == [test_user.id, test_user.id]
@@ -0,0 +1,80 @@
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.models.models import Contact, User
+from app.services import typeahead
+from app.services.typeahead import TypeaheadIndex, _OwnerIndex, normalize
+
+def _index(*contacts):
+    index = _OwnerIndex()
+    index.load(contacts)
+    return index
+
+def test_normalize():
+    assert normalize("Zoë MÜLLER") == "zoe muller"
+    assert normalize(None) == ""
+
+def test_owner_index_prefix_lookup():
+    index = _index(
+        (1, "John", "Smith", "john@example.com"),
+        (2, "Jane", "Johnson", None),
+        (3, "Zoë", "Müller", "zoe@example.org"),
+    )
+    assert index.lookup("jo", 10) == [(1, "John Smith"), (2, "Jane Johnson")]
+    assert index.lookup("john sm", 10) == [(1, "John Smith")]
+    assert index.lookup("zoe@", 10) == [(3, "Zoë Müller")]
+    assert index.lookup("mul", 10) == [(3, "Zoë Müller")]
+    assert index.lookup("jo", 1) == [(1, "John Smith")]
+    assert index.lookup("  ", 10) == []
+
+def test_owner_index_incremental_updates():
+    index = _index((1, "John", "Smith", None))
+    index.add(2, "Johanna", "Brown", None)
+    index.add(1, "Jack", "Smith", None)
+    assert index.lookup("jo", 10) == [(2, "Johanna Brown")]
+    assert index.lookup("smi", 10) == [(1, "Jack Smith")]
+
+    index.remove(2)
+    assert index.lookup("jo", 10) == []
+    assert sorted(index.keys) == [("jack", 1), ("smith", 1)]
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://")
+    User.__table__.create(engine)
+    Contact.__table__.create(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Contact.__table__), [
+            {"first_name": "John", "last_name": "Smith", "email": None, "owner_id": 1},
+            {"first_name": "Jane", "last_name": "Doe", "email": "jd@example.com", "owner_id": 2},
+        ])
+    return sessionmaker(bind=engine)
+
+def test_typeahead_index_loads_lazily_per_owner(monkeypatch, session_factory):
+    monkeypatch.setattr(typeahead.settings, "TYPEAHEAD_MAX_OWNERS", 1)
+    index = TypeaheadIndex()
+    with session_factory() as db:
+        assert index.lookup(db, 1, "jo") == [(1, "John Smith")]
+        index.contact_saved(1, 5, "Joe", "Bloggs", None)
+        assert index.lookup(db, 1, "jo") == [(5, "Joe Bloggs"), (1, "John Smith")]
+
+        # Only one owner fits, so loading owner 2 evicts owner 1
+        assert index.lookup(db, 2, "jd@") == [(2, "Jane Doe")]
+        assert index.lookup(db, 1, "jo") == [(1, "John Smith")]
+
+def test_changes_apply_on_commit_only(monkeypatch, session_factory):
+    index = TypeaheadIndex()
+    monkeypatch.setattr(typeahead, "typeahead_index", index)
+    with session_factory() as db:
+        index.lookup(db, 1, "x")
+
+        db.info[typeahead._PENDING_KEY] = [(False, 1, 7, "Rolled", "Back", None)]
+        db.rollback()
+        db.info[typeahead._PENDING_KEY] = [(False, 1, 8, "Committed", "Contact", None),
+                                           (True, 1, 1)]
+        db.commit()
+
+        assert index.lookup(db, 1, "rol") == []
+        assert index.lookup(db, 1, "com") == [(8, "Committed Contact")]
+        assert index.lookup(db, 1, "john") == []
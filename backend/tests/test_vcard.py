@@ -0,0 +1,324 @@
+import io
+from types import SimpleNamespace
+
+import pytest
+import vobject
+from fastapi import HTTPException, UploadFile
+
+from app.models.models import Contact
+from app.services import vcard_handler, vcard_serializer
+from app.services.vcard_handler import (
+    VCardHandler,
+    _DuplicateIndex,
+    _find_duplicate_pairs,
+    _soundex,
+)
+
+VCARDS = """BEGIN:VCARD\r
+VERSION:3.0\r
+FN:John Smith\r
+N:Smith;John;;;\r
+EMAIL;TYPE=WORK:john.smith@example.com\r
+TEL;TYPE=CELL:+1234567890\r
+END:VCARD\r
+BEGIN:VCARD\r
+VERSION:3.0\r
+FN:Jane Doe\r
+N:Doe;Jane;;;\r
+NOTE:A rather long note that is folded across two physical lines in the\r
+  exported file\r
+END:VCARD\r
+"""
+
+def _upload(content: str) -> UploadFile:
+    return UploadFile(file=io.BytesIO(content.encode("utf-8")), filename="contacts.vcf")
+
+def test_split_vcards():
+    cards = list(VCardHandler.split_vcards(VCARDS.splitlines(keepends=True)))
+    assert len(cards) == 2
+    assert cards[0].startswith("BEGIN:VCARD")
+    assert cards[1].rstrip().endswith("END:VCARD")
+
+def test_parse_vcard():
+    contacts = VCardHandler.parse_vcard(VCARDS)
+    assert [c["first_name"] for c in contacts] == ["John", "Jane"]
+    assert contacts[0]["last_name"] == "Smith"
+    assert "john.smith@example.com" in contacts[0].values()
+    assert "folded across two physical lines" in contacts[1]["notes"]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+async def test_parse_vcard_stream_matches_parse_vcard(chunk_size):
+    streamed = [
+        contact async for contact in
+        VCardHandler.parse_vcard_stream(_upload(VCARDS), chunk_size=chunk_size)
+    ]
+    assert streamed == VCardHandler.parse_vcard(VCARDS)
+
+def test_parse_vcard_file(tmp_path):
+    path = tmp_path / "contacts.vcf"
+    path.write_bytes(VCARDS.encode("utf-8"))
+    assert list(VCardHandler.parse_vcard_file(str(path))) == VCardHandler.parse_vcard(VCARDS)
+
+@pytest.mark.asyncio
+async def test_parse_vcard_stream_invalid_card():
+    content = "BEGIN:VCARD\r\nVERSION:3.0\r\nN:Broken\r\nBROKEN LINE\r\n"
+    with pytest.raises(HTTPException) as exc:
+        async for _ in VCardHandler.parse_vcard_stream(_upload(content)):
+            pass
+    assert exc.value.status_code == 400
+
+def test_duplicate_index_matches_within_file():
+    index = _DuplicateIndex()
+    index.add({"first_name": "John", "last_name": "Smith", "email": "John@Example.com"}, 1)
+
+    assert index.match({"first_name": "J", "last_name": "S", "work_email": " john@example.com"}) == 1
+    assert index.match({"first_name": "John", "last_name": "Smith"}) == 1
+    assert index.match({"first_name": "Jane", "last_name": "Smith"}) is None
+
+    card = {"first_name": "Jane", "last_name": "Doe", "mobile_phone": "+1234567890"}
+    index.add(card, card)
+    assert index.match({"first_name": "X", "last_name": "Y", "phone": "+1234567890"}) is card
+
+def test_soundex():
+    assert _soundex("Robert") == _soundex("Rupert") == "R163"
+    assert _soundex("Ashcraft") == "A261"
+    assert _soundex("Smith") == _soundex("Smyth")
+
+def test_find_duplicate_pairs_blocks_unrelated_contacts():
+    records = [
+        ("john", "smith", "john@example.com", ""),
+        ("alice", "jones", "", "+1 555 0100"),
+        ("jon", "smyth", "", ""),
+        ("john", "smith", "john@example.com", "+1 555 0199"),
+        ("alicia", "brown", "", "+1 555 0100"),
+    ]
+    pairs = _find_duplicate_pairs(records)
+    assert [(i, j) for i, j, _ in pairs] == [(0, 3), (0, 2), (2, 3)]
+    assert pairs[0][2] == 1.0
+
+def test_find_duplicate_pairs_compares_name_variants():
+    records = [
+        ("john", "smith", "", ""),
+        ("", "smith", "", ""),
+        ("john", "xmith", "", ""),
+        ("mary", "jones", "", ""),
+    ]
+    pairs = _find_duplicate_pairs(records)
+    assert [(i, j) for i, j, _ in pairs] == [(0, 1), (0, 2)]
+
+def test_find_duplicate_pairs_compares_first_name_only_contacts():
+    records = [
+        ("john", "", "", ""),
+        ("mary", "jones", "", ""),
+        ("jon", "", "", ""),
+        ("john", "", "", ""),
+    ]
+    pairs = _find_duplicate_pairs(records)
+    assert [(i, j) for i, j, _ in pairs] == [(0, 3), (0, 2), (2, 3)]
+
+def test_candidate_pairs_grow_linearly_in_oversized_blocks():
+    # A very common surname puts every record in one block
+    records = [(f"first{n}", "smith", "", "") for n in range(2000)]
+    pairs = vcard_handler._candidate_pairs(records)
+    assert len(pairs) <= len(records) * vcard_handler._BLOCK_WINDOW * 2
+    # Sorted neighbours are still compared
+    assert (0, 1) in pairs
+
+def test_find_duplicate_pairs_parallel_matches_serial(monkeypatch):
+    records = [
+        (first, last, "", "")
+        for first in ("john", "jon", "johnny")
+        for last in ("smith", "smyth", "smithe", "jones")
+    ]
+    serial = _find_duplicate_pairs(records)
+    monkeypatch.setattr(vcard_handler, "_PARALLEL_MIN_PAIRS", 1)
+    monkeypatch.setattr(vcard_handler.settings, "DEDUPE_WORKERS", 2)
+
+    assert _find_duplicate_pairs(records, parallel=True) == serial
+    assert _find_duplicate_pairs(records, parallel=True, limit=3) == serial[:3]
+
+def _contact(**fields):
+    values = dict(first_name="Jane", last_name="Doe", email=None, phone=None,
+                  address=None, notes=None)
+    values.update(fields)
+    return SimpleNamespace(**values)
+
+@pytest.mark.parametrize("contact", [
+    _contact(),
+    _contact(email="jane@example.com", phone="+1 555 0100", address="1 Main St"),
+    _contact(last_name="Doe, Jr.; III", address="1 Main St, Apt; 4\nSpringfield",
+             notes="Backslash \\ and\r\nnewlines"),
+    _contact(first_name="Zoë", notes="Ünïcödé nötes spanning several folded lines " * 8),
+])
+def test_serialize_contact_matches_vobject(contact):
+    rev = "20240101T000000Z"
+    expected = VCardHandler._build_vcard(contact, rev=rev).serialize()
+    assert vcard_serializer.serialize_contact(contact, rev=rev) == expected
+
+@pytest.mark.parametrize("line", [
+    "NOTE:" + "ü" * 40,
+    "NOTE:" + "联系人" * 20,
+    "NOTE:" + "x" * 70,
+])
+def test_fold_line_counts_octets(line):
+    folded = vcard_serializer.fold_line(line)
+    physical = folded.split("\r\n")[:-1]
+    assert all(len(part.encode("utf-8")) <= vcard_serializer.LINE_LENGTH for part in physical)
+    assert "".join(part[1:] if n else part for n, part in enumerate(physical)) == line
+    if len(line.encode("utf-8")) > vcard_serializer.LINE_LENGTH:
+        assert len(physical) > 1
+
+@pytest.mark.parametrize("notes", ["ü" * 40, "联系人" * 20])
+def test_serialize_contact_folds_multibyte_lines(notes):
+    # vobject only folds lines longer than 75 characters, so short
+    # multibyte lines are checked by round trip rather than against it
+    card = vcard_serializer.serialize_contact(_contact(notes=notes))
+    assert all(len(line.encode("utf-8")) <= 75 for line in card.split("\r\n"))
+    assert vobject.readOne(card).note.value == notes
+
+def test_export_serializers_only_read_contact_columns():
+    # Exports stream after the response headers are sent, so a missing
+    # attribute would cut the body short instead of failing the request
+    contact = SimpleNamespace(**{
+        column.name: f"{column.name} value" for column in Contact.__table__.columns
+    })
+    card = vobject.readOne(vcard_serializer.serialize_contact(contact))
+    assert card.email.value == "email value"
+    assert card.tel.value == "phone value"
+    assert card.note.value == "notes value"
+    VCardHandler._build_vcard(contact)
+
+def test_serialize_contact_photo_round_trips():
+    photo = bytes(range(256)) * 4
+    card = vcard_serializer.serialize_contact(_contact(photo=photo))
+    assert all(len(line.encode("utf-8")) <= 75 for line in card.split("\r\n"))
+    assert vobject.readOne(card).photo.value == photo
+
+BROKEN_VCARD = "BEGIN:VCARD\r\nVERSION:3.0\r\nBROKEN LINE\r\nEND:VCARD\r\n"
+
+def test_parse_vcards_parallel_keeps_order_and_collects_errors(monkeypatch):
+    monkeypatch.setattr(vcard_handler.settings, "IMPORT_PARSE_WORKERS", 2)
+    john, jane = VCARDS.split("END:VCARD\r\n", 1)
+    content = (john + "END:VCARD\r\n" + BROKEN_VCARD + jane) * 3
+    cards = list(VCardHandler._iter_cards(content.splitlines(keepends=True)))
+    errors = []
+
+    contacts = list(VCardHandler.parse_vcards_parallel(cards, errors, batch_size=2))
+
+    assert [c["first_name"] for c in contacts] == ["John", "Jane"] * 3
+    assert [e["index"] for e in errors] == [1, 4, 7]
+    assert [e["line"] for e in errors] == [8, 26, 44]
+
+@pytest.mark.asyncio
+async def test_parse_vcard_stream_parallel(monkeypatch):
+    monkeypatch.setattr(vcard_handler.settings, "IMPORT_PARSE_WORKERS", 2)
+    errors = []
+    contacts = [
+        contact async for contact in VCardHandler.parse_vcard_stream_parallel(
+            _upload(BROKEN_VCARD + VCARDS), errors, batch_size=1
+        )
+    ]
+    assert contacts == VCardHandler.parse_vcard(VCARDS)
+    assert [e["index"] for e in errors] == [0]
+
+def test_parallel_parsing_reuses_one_process_pool(monkeypatch):
+    monkeypatch.setattr(vcard_handler.settings, "IMPORT_PARSE_WORKERS", 2)
+    pool = vcard_handler._ProcessPool(vcard_handler._parse_workers)
+    monkeypatch.setattr(vcard_handler, "parse_pool", pool)
+    cards = list(VCardHandler._iter_cards(VCARDS.splitlines(keepends=True)))
+
+    first = list(VCardHandler.parse_vcards_parallel(cards, [], batch_size=1))
+    executor = pool._executor
+    second = list(VCardHandler.parse_vcards_parallel(cards, [], batch_size=1))
+
+    assert first == second == VCardHandler.parse_vcard(VCARDS)
+    assert pool._executor is executor
+    # Workers must not be forked from the multithreaded application process
+    assert executor._mp_context.get_start_method() in ("forkserver", "spawn")
+    pool.shutdown()
+    assert pool._executor is None
+
+MISSING_NAME_VCARD = "BEGIN:VCARD\r\nVERSION:3.0\r\nFN:Nobody\r\nEND:VCARD\r\n"
+
+@pytest.mark.asyncio
+async def test_parse_vcard_stream_tolerant_reports_lines():
+    content = VCARDS + BROKEN_VCARD + MISSING_NAME_VCARD + VCARDS
+    errors = []
+    contacts = [
+        contact async for contact in
+        VCardHandler.parse_vcard_stream(_upload(content), chunk_size=5, errors=errors)
+    ]
+    assert contacts == VCardHandler.parse_vcard(VCARDS) * 2
+    assert [(e["index"], e["line"]) for e in errors] == [(2, 15), (3, 19)]
+    assert "first_name" in errors[1]["error"]
+
+def test_parse_vcard_file_tolerant(tmp_path):
+    path = tmp_path / "contacts.vcf"
+    path.write_bytes((MISSING_NAME_VCARD + VCARDS).encode("utf-8"))
+    errors = []
+    assert list(VCardHandler.parse_vcard_file(str(path), errors=errors)) == VCardHandler.parse_vcard(VCARDS)
+    assert [(e["index"], e["line"]) for e in errors] == [(0, 1)]
+
+def _stored_contacts(db):
+    return sorted(
+        (c.first_name, c.last_name, c.email, c.phone, c.notes)
+        for c in db.query(Contact)
+    )
+
+@pytest.mark.asyncio
+async def test_bulk_import_matches_orm_import(db_session, test_user):
+    results = {}
+    for bulk in (False, True):
+        db_session.query(Contact).delete()
+        db_session.commit()
+        first = await VCardHandler.import_contacts(
+            db_session, _upload(VCARDS + VCARDS), test_user.id, bulk=bulk, batch_size=1
+        )
+        again = await VCardHandler.import_contacts(
+            db_session, _upload(VCARDS), test_user.id, bulk=bulk
+        )
+        results[bulk] = (
+            first["imported"],
+            len(first["duplicates"]),
+            [d["existing"].first_name for d in again["duplicates"]],
+            _stored_contacts(db_session),
+        )
+
+    assert results[True] == results[False]
+    assert len(results[True][0]) == 2
+    assert results[True][1] == 2
+    assert results[True][2] == ["John", "Jane"]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("bulk", [False, True])
+async def test_import_with_invalid_card_writes_nothing(db_session, test_user, bulk):
+    content = VCARDS + MISSING_NAME_VCARD
+    with pytest.raises(HTTPException) as exc:
+        await VCardHandler.import_contacts(
+            db_session, _upload(content), test_user.id, bulk=bulk, batch_size=1
+        )
+    assert exc.value.status_code == 400
+    assert "first_name" in exc.value.detail
+
+    db_session.rollback()
+    assert _stored_contacts(db_session) == []
+
+@pytest.mark.asyncio
+async def test_tolerant_import_validates_each_card_once(db_session, test_user, monkeypatch):
+    validated = []
+
+    class CountingContactCreate(vcard_handler.ContactCreate):
+        def __init__(self, **data):
+            validated.append(data.get("first_name"))
+            super().__init__(**data)
+
+    monkeypatch.setattr(vcard_handler, "ContactCreate", CountingContactCreate)
+    result = await VCardHandler.import_contacts(
+        db_session, _upload(VCARDS + MISSING_NAME_VCARD), test_user.id, bulk=True, tolerant=True
+    )
+
+    assert len(result["imported"]) == 2
+    assert len(result["errors"]) == 1
+    assert len(validated) == 3
+    assert len(_stored_contacts(db_session)) == 2
@@ -1,5 +1,5 @@
 // frontend/src/components/admin/AuditLog.jsx
-import React, { useState } from 'react';
+import React, { useCallback, useEffect, useRef, useState } from 'react';
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card';
 import { Button } from '@/components/ui/button';
 import { Input } from '@/components/ui/input';
@@ -11,43 +11,61 @@ import {
   SelectValue,
 } from "@/components/ui/select";
 import { Clock, Search, Filter } from 'lucide-react';
+import api from '../../services/api';
+
+const PAGE_SIZE = 50;
+const FILTER_DEBOUNCE_MS = 300;
+
+// The API returns naive UTC timestamps; without a zone Date would read
+// them as local time.
+const parseUtc = (dateString) => {
+  const hasZone = /(Z|[+-]\d{2}:?\d{2})$/.test(dateString);
+  return new Date(hasZone ? dateString : `${dateString}Z`);
+};
 
 const AuditLog = () => {
-  const [logs, setLogs] = useState([
-    {
-      id: 1,
-      action: 'User Login',
-      user: 'admin@example.com',
-      timestamp: new Date().toISOString(),
-      details: 'Successful login attempt',
-      ip: '192.168.1.1'
-    },
-    {
-      id: 2,
-      action: 'Contact Created',
-      user: 'user@example.com',
-      timestamp: new Date().toISOString(),
-      details: 'Created new contact: John Doe',
-      ip: '192.168.1.2'
-    }
-  ]);
-  const [searchTerm, setSearchTerm] = useState('');
+  const [logs, setLogs] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loading, setLoading] = useState(false);
+  const [ipInput, setIpInput] = useState('');
+  const [ipFilter, setIpFilter] = useState('');
   const [actionFilter, setActionFilter] = useState('all');
+  const latestRequest = useRef(0);
 
   const formatDate = (dateString) => {
-    return new Date(dateString).toLocaleString();
+    return parseUtc(dateString).toLocaleString();
   };
 
-  const filteredLogs = logs.filter(log => {
-    const matchesSearch = 
-      log.action.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      log.user.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      log.details.toLowerCase().includes(searchTerm.toLowerCase());
-      
-    const matchesAction = actionFilter === 'all' || log.action === actionFilter;
-    
-    return matchesSearch && matchesAction;
-  });
+  // Query the server once typing in the IP filter pauses
+  useEffect(() => {
+    const timer = setTimeout(() => setIpFilter(ipInput), FILTER_DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [ipInput]);
+
+  // Filtering and paging happen on the server; each page is keyed on the
+  // last entry of the previous one. Only the latest request may update the
+  // list, so a slow response for an old filter cannot overwrite a newer one.
+  const fetchLogs = useCallback(async (cursor = null) => {
+    const requestId = ++latestRequest.current;
+    setLoading(true);
+    try {
+      const params = { limit: PAGE_SIZE };
+      if (actionFilter !== 'all') params.action = actionFilter;
+      if (ipFilter) params.ip_address = ipFilter;
+      if (cursor) params.cursor = cursor;
+
+      const response = await api.get('/api/v1/audit/logs', { params });
+      if (requestId !== latestRequest.current) return;
+      setLogs((previous) => cursor ? [...previous, ...response.data.items] : response.data.items);
+      setNextCursor(response.data.next_cursor);
+    } finally {
+      if (requestId === latestRequest.current) setLoading(false);
+    }
+  }, [actionFilter, ipFilter]);
+
+  useEffect(() => {
+    fetchLogs();
+  }, [fetchLogs]);
 
   return (
     <div className="space-y-6">
@@ -57,9 +75,9 @@ const AuditLog = () => {
           <div className="relative w-64">
             <Search className="absolute left-3 top-3 h-4 w-4 text-gray-400" />
             <Input
-              placeholder="Search logs..."
-              value={searchTerm}
-              onChange={(e) => setSearchTerm(e.target.value)}
+              placeholder="Filter by IP address..."
+              value={ipInput}
+              onChange={(e) => setIpInput(e.target.value.trim())}
               className="pl-10"
             />
           </div>
@@ -69,10 +87,10 @@ const AuditLog = () => {
             </SelectTrigger>
             <SelectContent>
               <SelectItem value="all">All Actions</SelectItem>
-              <SelectItem value="User Login">User Login</SelectItem>
-              <SelectItem value="Contact Created">Contact Created</SelectItem>
-              <SelectItem value="Contact Updated">Contact Updated</SelectItem>
-              <SelectItem value="Contact Deleted">Contact Deleted</SelectItem>
+              <SelectItem value="list_contacts">List Contacts</SelectItem>
+              <SelectItem value="create_contact">Create Contact</SelectItem>
+              <SelectItem value="import_contacts">Import Contacts</SelectItem>
+              <SelectItem value="export_contacts">Export Contacts</SelectItem>
             </SelectContent>
           </Select>
         </div>
@@ -88,22 +106,34 @@ const AuditLog = () => {
               <div>Details</div>
             </div>
             <div className="divide-y">
-              {filteredLogs.map((log) => (
-                <div key={log.id} className="grid grid-cols-4 p-4">
+              {logs.map((log) => (
+                // Segment storage ids are offsets within a day's file, so they repeat
+                <div key={`${log.timestamp}-${log.id}`} className="grid grid-cols-4 p-4">
                   <div className="flex items-center space-x-2">
                     <Clock className="h-4 w-4 text-gray-400" />
                     <span className="font-medium">{log.action}</span>
                   </div>
-                  <div>{log.user}</div>
+                  <div>{log.user_id}</div>
                   <div>{formatDate(log.timestamp)}</div>
                   <div>
                     <div>{log.details}</div>
-                    <div className="text-sm text-gray-500">IP: {log.ip}</div>
+                    <div className="text-sm text-gray-500">IP: {log.ip_address}</div>
                   </div>
                 </div>
               ))}
             </div>
           </div>
+          {nextCursor && (
+            <div className="flex justify-center p-4">
+              <Button
+                variant="outline"
+                disabled={loading}
+                onClick={() => fetchLogs(nextCursor)}
+              >
+                Load more
+              </Button>
+            </div>
+          )}
         </CardContent>
       </Card>
     </div>